@@ -1,10 +1,26 @@
 import click
 
-from torrra._version import __version__
+
+def _print_version(ctx: click.Context, _param: click.Parameter, value: bool) -> None:
+    # resolved on demand: package metadata lookup is the slowest import here
+    if not value or ctx.resilient_parsing:
+        return
+
+    from torrra._version import __version__
+
+    click.echo(f"torrra, version {__version__}")
+    ctx.exit()
 
 
 @click.group(invoke_without_command=True)
-@click.version_option(version=__version__, prog_name="torrra")
+@click.option(
+    "--version",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=_print_version,
+    help="Show the version and exit.",
+)
 @click.option("--no-cache", is_flag=True, help="Disable caching mechanism.")
 @click.pass_context
 def cli(ctx: click.Context, no_cache: bool) -> None:
@@ -71,6 +87,25 @@ def downloads(no_cache: bool) -> None:
     run_without_indexer(no_cache=no_cache, show_downloads=True)
 
 
+# --------------------------------------------------
+# DAEMON
+# --------------------------------------------------
+@cli.command(help="Run the torrent session headless, serving a local RPC API.")
+def daemon() -> None:
+    import asyncio
+
+    from torrra.core.daemon import Daemon
+    from torrra.core.exceptions import DaemonError
+    from torrra.core.rpc import SOCKET_PATH
+
+    try:
+        session = Daemon()
+        click.secho(f"listening on {SOCKET_PATH}", fg="cyan")
+        asyncio.run(session.serve())
+    except DaemonError as e:
+        click.secho(str(e), fg="red", err=True)
+
+
 # --------------------------------------------------
 # INDEXERS
 # --------------------------------------------------
@@ -84,7 +119,6 @@ def jackett(url: str | None, api_key: str | None, no_cache: bool) -> None:
     # run app with jackett indexer
     run_with_indexer(
         name="jackett",
-        indexer_cls_str="torrra.indexers.jackett.JackettIndexer",
         url=url,
         api_key=api_key,
         no_cache=no_cache,
@@ -101,7 +135,6 @@ def prowlarr(url: str | None, api_key: str | None, no_cache: bool):
     # run app with prowlarr indexer
     run_with_indexer(
         name="prowlarr",
-        indexer_cls_str="torrra.indexers.prowlarr.ProwlarrIndexer",
         url=url,
         api_key=api_key,
         no_cache=no_cache,
@@ -1,7 +1,9 @@
 from dataclasses import asdict, dataclass
-from typing import Any, Literal, TypedDict
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Literal, TypedDict
 
-import libtorrent as lt
+if TYPE_CHECKING:  # the native extension is only needed once a session starts
+    import libtorrent as lt
 
 
 # TORRENT TYPES
@@ -17,10 +19,34 @@ class TorrentDict(TypedDict, total=False):
     file_priorities: list[int] | None
 
 
+class TorrentState(Enum):
+    """What a torrent is up to, as shown in the table and sidebar."""
+
+    # label, short label, sidebar group (None: counted in no group)
+    DOWNLOADING = ("Downloading", "DOWN", "Downloading")
+    FETCHING = ("Fetching", "META", "Downloading")
+    STALLED = ("Stalled", "STAL", "Stalled")
+    SEEDING = ("Seeding", "SEED", "Seeding")
+    PAUSED = ("Paused", "PAUS", "Paused")
+    QUEUED = ("Queued", "QUEU", "Paused")
+    COMPLETED = ("Completed", "DONE", "Completed")
+    CHECKING = ("Checking", "CHCK", "Checking")
+    MISSING_FILES = ("Missing Files", "MISS", "Error")
+    ERROR = ("Error", "ERRO", "Error")
+    UNKNOWN = ("N/A", "N/A", None)
+
+    def __init__(self, label: str, short: str, group: str | None) -> None:
+        self.label: str = label
+        self.short: str = short
+        self.group: str | None = group
+
+
 class TorrentStatus(TypedDict, total=False):
     """Torrent status on upload and download."""
 
-    state: lt.torrent_status.states | int
+    state: "lt.torrent_status.states | int"
+    # classified once when the status is built
+    torrent_state: TorrentState
     progress: float
     down_speed: float
     up_speed: float
@@ -15,6 +15,7 @@ from torrra.screens.home import HomeScreen
 from torrra.screens.theme_selector import ThemeSelectorScreen
 from torrra.screens.welcome import GO_TO_DOWNLOADS, WelcomeScreen
 from torrra.utils.fs import get_resource_path
+from torrra.utils.healthcheck import IndexerHealthcheck
 
 
 class TorrraApp(App[None]):
@@ -35,13 +36,19 @@ class TorrraApp(App[None]):
         search_query: str | None,
         direct_download: str | None = None,
         show_downloads: bool = False,
+        indexers: list[Indexer] | None = None,
+        healthcheck: IndexerHealthcheck | None = None,
     ) -> None:
         super().__init__()
         self.indexer: Indexer | None = indexer
+        # every indexer a search fans out to; just `indexer` when unset
+        self.indexers: list[Indexer] | None = indexers
         self.use_cache: bool = use_cache
         self.search_query: str | None = search_query
         self.direct_download: str | None = direct_download
         self.show_downloads: bool = show_downloads
+        # already probing the indexers; searches wait for it
+        self.healthcheck: IndexerHealthcheck | None = healthcheck
 
         # load theme from config file
         theme = get_config().get("general.theme", "textual-dark")
@@ -53,6 +60,9 @@ class TorrraApp(App[None]):
         self.theme = theme
 
     async def on_mount(self) -> None:
+        if self.healthcheck is not None:
+            self._report_healthcheck()
+
         # the welcome screen only exists to collect a search query, so it is
         # reachable solely with a configured indexer and no other entry point
         # (direct download / downloads view / an already-supplied query)
@@ -69,9 +79,27 @@ class TorrraApp(App[None]):
                     use_cache=self.use_cache,
                     direct_download=self.direct_download,
                     show_downloads=self.show_downloads,
+                    indexers=self.indexers,
+                    healthcheck=self.healthcheck,
                 )
             )
 
+    def on_unmount(self) -> None:
+        # write out settings still waiting on their debounce
+        get_config().flush()
+
+    @work(group="healthcheck")
+    async def _report_healthcheck(self) -> None:
+        assert self.healthcheck is not None
+        healthy = await self.healthcheck.wait()
+        for name, error in self.healthcheck.failures.items():
+            self.notify(
+                error,
+                title=f"{name.title()} Unavailable",
+                severity="warning" if healthy else "error",
+                timeout=10,
+            )
+
     def action_switch_theme(self) -> None:
         self.push_screen(ThemeSelectorScreen())
 
@@ -109,5 +137,7 @@ class TorrraApp(App[None]):
                 use_cache=self.use_cache,
                 direct_download=None,
                 show_downloads=not is_search,
+                indexers=self.indexers,
+                healthcheck=self.healthcheck,
             )
         )
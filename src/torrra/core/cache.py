@@ -1,32 +1,160 @@
 import atexit
 import hashlib
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
 from diskcache import Cache as _Cache
 from platformdirs import user_cache_dir
 from typing_extensions import override
 
-from torrra.core.config import get_config
-from torrra.core.constants import DEFAULT_CACHE_TTL
+from torrra.core.constants import (
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_HEALTHCHECK_CACHE_TTL,
+    DEFAULT_TORRENT_CACHE_TTL,
+)
+
+CACHE_DIR = Path(user_cache_dir("torrra"))
+
+# namespaces, each with its own policy; keys are "<namespace>:<digest>"
+SEARCH = "search"
+TORRENT = "torrent"
+HEALTHCHECK = "healthcheck"
+
+_MISS = object()
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long entries count as fresh, and how long they are kept at all."""
+
+    ttl: float
+    # served stale between ttl and max_age; defaults to no stale window
+    max_age: float | None = None
+
+    @property
+    def expire(self) -> float:
+        return max(self.ttl, self.max_age or 0)
+
+
+# for keys outside every configured namespace
+DEFAULT_POLICY = CachePolicy(DEFAULT_CACHE_TTL, DEFAULT_CACHE_MAX_AGE)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+@lru_cache
+def get_cache() -> "Cache":
+    from torrra.core.config import get_config
+
+    config = get_config()
+    return Cache(
+        CACHE_DIR,
+        policies={
+            SEARCH: CachePolicy(
+                config.get("general.cache_ttl", DEFAULT_CACHE_TTL),
+                config.get("general.cache_max_age", DEFAULT_CACHE_MAX_AGE),
+            ),
+            TORRENT: CachePolicy(DEFAULT_TORRENT_CACHE_TTL),
+            HEALTHCHECK: CachePolicy(DEFAULT_HEALTHCHECK_CACHE_TTL),
+        },
+    )
+
+
+@atexit.register
+def _close_cache() -> None:
+    if get_cache.cache_info().currsize:  # never opened, nothing to close
+        cache = get_cache()
+        cache.prune()
+        cache.close()
 
 
 class Cache(_Cache):
+    """diskcache with per-namespace expiry policies and stale-while-revalidate.
+
+    A key's namespace (the part before the first ":") picks its policy, and
+    an explicit `expire` on `set` still wins. Entries are fresh for the
+    policy's ttl, then stale until its max_age, when diskcache drops them;
+    stale entries are still served, so a caller can show them at once and
+    refresh in the background. The store time rides in diskcache's tag
+    column.
+
+    diskcache culls expired and over-limit entries as `set` writes, and
+    `prune()` sweeps the rest; both count what they drop in `evictions`,
+    alongside the per-namespace hits and misses.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        policies: Mapping[str, CachePolicy] | None = None,
+        default: CachePolicy = DEFAULT_POLICY,
+        **settings: Any,
+    ) -> None:
+        super().__init__(None if directory is None else str(directory), **settings)
+        self.policies: dict[str, CachePolicy] = dict(policies or {})
+        self.default_policy: CachePolicy = default
+        self.stats: dict[str, CacheStats] = {}
+        self.evictions: int = 0
+
+    def policy(self, key: str) -> CachePolicy:
+        namespace, _, _ = key.partition(":")
+        return self.policies.get(namespace, self.default_policy)
+
     @override
     def set(
         self,
         key: str,
         value: Any,
-        expire: int | None = None,
+        expire: float | None = None,
         read: bool = False,
         tag: Any = None,
         retry: bool = False,
     ):
-        expire = get_config().get("general.cache_ttl", DEFAULT_CACHE_TTL)
-        return super().set(key, value, expire, read, tag, retry)
+        if expire is None:
+            expire = self.policy(key).expire
+        if tag is None:
+            tag = time.time()
+
+        # a new key adds a row; any fewer than that were culled by the write.
+        # an expired entry counts as gone, so rewriting one counts it too
+        added = key not in self
+        before = len(self)
+        stored = super().set(key, value, expire, read, tag, retry)
+        self.evictions += max(0, before + added - len(self))
+        return stored
+
+    def lookup(self, key: str) -> tuple[Any, bool] | None:
+        """Return `(value, stale)` for a cached entry, or None on a miss."""
+        stats = self.stats.setdefault(key.partition(":")[0], CacheStats())
+        value, stored_at = self.get(key, default=_MISS, tag=True)
+        if value is _MISS:
+            stats.misses += 1
+            return None
 
-    def make_key(self, prefix: str, query: str) -> str:
-        return f"{prefix}:{hashlib.sha256(query.encode()).hexdigest()}"
+        stats.hits += 1
+        # entries written without a store time can't prove they are fresh
+        stale = (
+            not isinstance(stored_at, float)
+            or time.time() - stored_at > self.policy(key).ttl
+        )
+        return value, stale
 
+    def prune(self) -> int:
+        """Drop expired entries, then evict down to the size limit."""
+        removed = self.cull()  # expired entries go first
+        self.evictions += removed
+        return removed
 
-cache = Cache(user_cache_dir("torrra"))
-atexit.register(cache.close)
+    @staticmethod
+    def make_key(namespace: str, *parts: str) -> str:
+        digest = hashlib.sha256("\0".join(parts).encode()).hexdigest()
+        return f"{namespace}:{digest}"
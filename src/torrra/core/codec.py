@@ -0,0 +1,170 @@
+import json
+import struct
+import zlib
+from array import array
+from itertools import accumulate, chain, pairwise
+from typing import Any
+
+from torrra._types import Torrent
+
+# bumped whenever the layout changes; older blobs then read as a cache miss
+MAGIC = b"TRC1"
+_BTIH = "magnet:?xt=urn:btih:"
+_HEX = frozenset("0123456789abcdef")
+_HEADER_LEN = struct.Struct("<I")
+
+
+def _typecode(values: list[Any]) -> str:
+    # exact round trips only: an int size must not come back a float
+    if all(type(v) is int for v in values):
+        return "q"
+    if all(type(v) is float for v in values):
+        return "d"
+    raise TypeError("column is not all ints or all floats")
+
+
+def _split_magnet(uri: str) -> tuple[bytes | None, str]:
+    # the 40 hex chars of a v1 info-hash pack into 20 bytes; anything that
+    # wouldn't rebuild byte for byte is kept as text
+    digest = uri[len(_BTIH) : len(_BTIH) + 40]
+    if uri.startswith(_BTIH) and len(digest) == 40 and _HEX.issuperset(digest):
+        return bytes.fromhex(digest), uri[len(_BTIH) + 40 :]
+    return None, uri
+
+
+def encode_results(torrents: list[Torrent]) -> bytes:
+    """Pack search results column by column into one compressed blob.
+
+    Numbers go into typed arrays, sources are interned, magnet URIs keep
+    their info-hash as raw bytes, and all text shares one string, so both
+    the blob and the work to rebuild it stay small however many results a
+    query returns. Raises TypeError or ValueError for results that can't
+    round-trip exactly, e.g. a non-numeric seeder count.
+
+    Arrays use the machine's byte order; the cache never leaves it.
+    """
+    sources: dict[str, int] = {}
+    source_ids = array("I")
+    flags = array("B")
+    hashes: list[bytes] = []
+    title_lens = array("I")
+    rest_lens = array("I")
+    texts: list[str] = []
+    rests: list[str] = []
+    priorities: dict[str, list[int]] = {}
+
+    for i, t in enumerate(torrents):
+        if not isinstance(t.title, str) or not isinstance(t.source, str):
+            raise TypeError("text column holds a non-string")
+        source_ids.append(sources.setdefault(t.source, len(sources)))
+
+        digest, rest = _split_magnet(t.magnet_uri)
+        flags.append(digest is not None)
+        if digest is not None:
+            hashes.append(digest)
+        rests.append(rest)
+        rest_lens.append(len(rest))
+
+        texts.append(t.title)
+        title_lens.append(len(t.title))
+        if t.file_priorities is not None:
+            priorities[str(i)] = t.file_priorities
+
+    numbers = {
+        name: [getattr(t, name) for t in torrents]
+        for name in ("size", "seeders", "leechers")
+    }
+    types = {name: _typecode(values) for name, values in numbers.items()}
+    header = json.dumps(
+        {
+            "n": len(torrents),
+            "sources": list(sources),
+            "types": types,
+            "priorities": priorities,
+        }
+    ).encode()
+
+    try:
+        packed = [array(types[name], values) for name, values in numbers.items()]
+    except OverflowError as e:
+        raise ValueError(f"column out of range: {e}") from e
+
+    body = b"".join(
+        [
+            _HEADER_LEN.pack(len(header)),
+            header,
+            *(col.tobytes() for col in packed),
+            source_ids.tobytes(),
+            flags.tobytes(),
+            *hashes,
+            title_lens.tobytes(),
+            rest_lens.tobytes(),
+            "".join(texts + rests).encode(),
+        ]
+    )
+    return MAGIC + zlib.compress(body, 1)
+
+
+def decode_results(blob: bytes) -> list[Torrent]:
+    """Rebuild the results `encode_results` packed, in one pass per column.
+
+    Raises ValueError for a blob in any other format.
+    """
+    if not blob.startswith(MAGIC):
+        raise ValueError("not an encoded result set")
+    try:
+        body = memoryview(zlib.decompress(blob[len(MAGIC) :]))
+    except zlib.error as e:
+        raise ValueError(f"damaged result set: {e}") from e
+
+    (header_len,) = _HEADER_LEN.unpack_from(body)
+    pos = _HEADER_LEN.size + header_len
+    header = json.loads(bytes(body[_HEADER_LEN.size : pos]))
+    n: int = header["n"]
+
+    def column(typecode: str) -> "array[Any]":
+        nonlocal pos
+        col = array(typecode)
+        end = pos + n * col.itemsize
+        col.frombytes(body[pos:end])
+        pos = end
+        return col
+
+    sizes, seeders, leechers = (
+        column(header["types"][name]) for name in ("size", "seeders", "leechers")
+    )
+    sources: list[str] = header["sources"]
+    source_ids = column("I")
+    flags = column("B")
+    hash_end = pos + 20 * sum(flags)
+    hashes = body[pos:hash_end]
+    pos = hash_end
+    title_lens = column("I")
+    rest_lens = column("I")
+    text = str(body[pos:], "utf-8")
+
+    # slice every field out of the shared text in bulk; no per-row parsing
+    bounds = accumulate(chain(title_lens, rest_lens), initial=0)
+    texts = [text[a:b] for a, b in pairwise(bounds)]
+    titles, rests = texts[:n], texts[n:]
+
+    hexes = hashes.hex()
+    digests = iter([hexes[i : i + 40] for i in range(0, len(hexes), 40)])
+    magnets = [f"{_BTIH}{next(digests)}{r}" if f else r for f, r in zip(flags, rests)]
+
+    priorities: list[list[int] | None] = [None] * n
+    for i, value in header["priorities"].items():
+        priorities[int(i)] = value
+
+    return list(
+        map(
+            Torrent,
+            magnets,
+            titles,
+            sizes.tolist(),
+            seeders.tolist(),
+            leechers.tolist(),
+            [sources[i] for i in source_ids],
+            priorities,
+        )
+    )
@@ -1,13 +1,18 @@
 import ast
-from contextlib import suppress
+import copy
+import os
+import stat
+import tempfile
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager, suppress
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, ClassVar, cast
 
-import tomli_w
 from platformdirs import user_config_dir, user_downloads_dir
 
 from torrra.core.constants import (
+    DEFAULT_CACHE_MAX_AGE,
     DEFAULT_CACHE_TTL,
     DEFAULT_MAX_RETRIES,
     DEFAULT_MIN_SEEDERS,
@@ -18,6 +23,9 @@ from torrra.core.constants import (
 from torrra.core.exceptions import ConfigError
 from torrra.utils.helpers import get_tomllib
 
+if TYPE_CHECKING:
+    import asyncio
+
 CONFIG_DIR = Path(user_config_dir("torrra"))
 CONFIG_FILE = CONFIG_DIR / "config.toml"
 
@@ -31,13 +39,38 @@ def get_config() -> "Config":
     return Config()
 
 
+@lru_cache(maxsize=256)
+def _split_key_path(key_path: str) -> tuple[str, ...]:
+    # the same handful of keys is read over and over, e.g. on every search
+    return tuple(key_path.split("."))
+
+
+def _parse_value(value: str) -> Any:
+    # handle case-insensitive "true"/"false" for booleans
+    if value.lower() == "true":
+        return True
+    if value.lower() == "false":
+        return False
+    # handle other literals (int, float, etc.)
+    with suppress(ValueError, SyntaxError):  # convert data type silently
+        return ast.literal_eval(value)
+    return value
+
+
 class Config:
+    # how long the tui's writes wait for company before hitting the disk
+    SAVE_DELAY: ClassVar[float] = 1.0
+
     def __init__(self) -> None:
         self.config: dict[str, Any] = {}
+        # set but not yet written to disk
+        self._dirty: bool = False
+        self._batch_depth: int = 0
+        self._save_handle: asyncio.TimerHandle | None = None
         self._load_config()
 
     def get(self, key_path: str, default: Any | None = _sentinel) -> Any:
-        keys = key_path.split(".")
+        keys = _split_key_path(key_path)
         current = self.config
 
         try:
@@ -58,9 +91,71 @@ class Config:
                 raise ConfigError(f"key does not contain a section: {key_path}")
             raise ConfigError(f"key not found: {key_path}")
 
-    def set(self, key_path: str, value: str) -> None:
+    def set(self, key_path: str, value: str, *, debounce: bool = False) -> None:
+        with self.batch(debounce=debounce):
+            self._assign(key_path, value)
+
+    def update(self, values: Mapping[str, str], *, debounce: bool = False) -> None:
+        """Set several keys with a single write, or none if all are unchanged."""
+        with self.batch(debounce=debounce):
+            for key_path, value in values.items():
+                self._assign(key_path, value)
+
+    @contextmanager
+    def batch(self, *, debounce: bool = False) -> Iterator[None]:
+        """Group sets into one write at the end of the outermost batch.
+
+        If the block raises, every change made inside it is rolled back and
+        nothing is written. With `debounce`, the write is put off until no
+        other debounced change has arrived for `SAVE_DELAY` seconds - meant
+        for the tui, where it needs a running event loop; call `flush()`
+        before exiting so a pending write isn't lost.
+        """
+        outermost = self._batch_depth == 0
+        snapshot = copy.deepcopy(self.config) if outermost else self.config
+        was_dirty = self._dirty
+
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            if outermost:
+                self.config, self._dirty = snapshot, was_dirty
+            raise
+        finally:
+            self._batch_depth -= 1
+
+        if outermost and self._dirty:
+            if debounce:
+                self._schedule_save()
+            else:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._dirty:
+            self._save_config()
+            self._dirty = False
+
+    def _schedule_save(self) -> None:
+        import asyncio  # only the tui debounces, and it has loaded it already
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # nothing to defer to
+            self.flush()
+            return
+
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        self._save_handle = loop.call_later(self.SAVE_DELAY, self.flush)
+
+    def _assign(self, key_path: str, value: str) -> None:
         current = self.config
-        keys = key_path.split(".")
+        keys = _split_key_path(key_path)
 
         try:
             for key in keys[:-1]:
@@ -72,19 +167,14 @@ class Config:
                     )
                 current = current[key]
 
-            new_value: Any = value
-            # handle case-insensitive "true"/"false" for booleans
-            if value.lower() == "true":
-                new_value = True
-            elif value.lower() == "false":
-                new_value = False
-            # handle other literals (int, float, etc.)
-            else:  # convert data type silently
-                with suppress(ValueError, SyntaxError):
-                    new_value = ast.literal_eval(value)
+            new_value = _parse_value(value)
+            old_value = current.get(keys[-1], _sentinel)
+            # compare types too: True == 1, but "1" must not be stored as true
+            if type(old_value) is type(new_value) and old_value == new_value:
+                return
 
             current[keys[-1]] = new_value
-            self._save_config()
+            self._dirty = True
 
         except (KeyError, TypeError) as e:
             raise ConfigError(f"failed to set '{key_path}': {e!s}")
@@ -132,6 +222,7 @@ class Config:
                 "max_retries": DEFAULT_MAX_RETRIES,
                 "use_cache": True,
                 "cache_ttl": DEFAULT_CACHE_TTL,
+                "cache_max_age": DEFAULT_CACHE_MAX_AGE,
                 "default_sort": DEFAULT_SORT,
                 "default_sort_order": DEFAULT_SORT_ORDER,
                 "min_seeders": DEFAULT_MIN_SEEDERS,
@@ -139,6 +230,26 @@ class Config:
         }
 
     def _save_config(self) -> None:
+        import tomli_w  # only writers pay for it
+
+        # written beside the target and renamed over it, so a crash or a
+        # full disk can't leave a half-written config behind. the target is
+        # the file a symlinked config points at, so the link survives
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        with open(CONFIG_FILE, "wb") as f:
-            tomli_w.dump(self.config, f)
+        target = CONFIG_FILE.resolve()
+        try:
+            mode = stat.S_IMODE(target.stat().st_mode)
+        except FileNotFoundError:  # new files get the usual umask'd mode
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            os.chmod(tmp, mode)
+            with os.fdopen(fd, "wb") as f:
+                tomli_w.dump(self.config, f)
+            os.replace(tmp, target)
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(tmp)
+            raise
@@ -1,4 +1,7 @@
 DEFAULT_CACHE_TTL = 300  # 5 mins
+DEFAULT_CACHE_MAX_AGE = 86400  # 1 day, served stale while refreshing
+DEFAULT_TORRENT_CACHE_TTL = 604800  # 1 week, a .torrent never changes
+DEFAULT_HEALTHCHECK_CACHE_TTL = 600  # 10 mins
 DEFAULT_TIMEOUT = 10  # 10 sec
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_SORT = "relevance"
@@ -6,3 +9,5 @@ DEFAULT_SORT = "relevance"
 # while seeders reads high-to-low. an explicit "asc"/"desc" overrides that.
 DEFAULT_SORT_ORDER = "auto"
 DEFAULT_MIN_SEEDERS = 0
+DEFAULT_MAX_CONNECTIONS = 10  # pooled connections per indexer
+DEFAULT_KEEPALIVE_EXPIRY = 60  # 1 min idle before a pooled connection is dropped
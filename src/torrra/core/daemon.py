@@ -0,0 +1,349 @@
+import asyncio
+import os
+import signal
+import stat
+from dataclasses import asdict
+from functools import partial
+from pathlib import Path
+from typing import Any, ClassVar
+
+from torrra._types import Torrent, TorrentRecord, TorrentStatus
+from torrra.core import rpc
+from torrra.core.config import get_config
+from torrra.core.constants import DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT
+from torrra.core.download import (
+    DownloadManager,
+    claim_session,
+    get_download_manager,
+)
+from torrra.core.exceptions import DaemonError
+from torrra.core.remote import decode_info, encode_info, encode_status
+from torrra.core.results import ResultView, SortKey
+from torrra.core.torrent import TorrentManager, get_torrent_manager
+from torrra.indexers.base import BaseIndexer
+from torrra.utils.healthcheck import indexer_cls_path
+from torrra.utils.helpers import lazy_import
+from torrra.utils.indexer import configured_indexers
+from torrra.utils.magnet import resolve_torrent
+from torrra.utils.magnet_uri import display_name
+
+
+class Daemon:
+    """The torrent session, kept running with no ui attached.
+
+    It owns this process's DownloadManager and TorrentManager and serves them
+    on a Unix socket, speaking JSON-RPC 2.0 a message per line. A ui started
+    while it runs attaches as a thin client (see `get_daemon_client`), so
+    swarms keep going as uis come and go.
+
+    Scripts get `add`, `remove`, `pause`, `resume`, `status`, `stats` and
+    `search`. The `dm.*` and `tm.*` methods mirror the managers for an
+    attached ui, and `poll` hands each connection the statuses that changed
+    since it last asked.
+    """
+
+    # seconds between session polls: alerts, metadata, resume data
+    TICK: ClassVar[float] = 1.0
+
+    def __init__(self) -> None:
+        if rpc.get_daemon_client() is not None:
+            raise DaemonError(f"a daemon is already running at {rpc.SOCKET_PATH}")
+        if not claim_session():
+            raise DaemonError("torrra is already running a session; close it first")
+        # with no daemon to attach to, these are this process's own
+        self.dm: DownloadManager = get_download_manager()
+        self.tm: TorrentManager = get_torrent_manager()
+
+        self._stopping: asyncio.Event = asyncio.Event()
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._indexers: list[tuple[str, BaseIndexer]] | None = None
+        self.methods: dict[str, rpc.Method] = {
+            "add": self.add,
+            "remove": self.remove,
+            "pause": partial(self._set_paused, is_paused=True),
+            "resume": partial(self._set_paused, is_paused=False),
+            "status": self.status,
+            "stats": self.dm.get_session_stats,
+            "search": self.search,
+            "dm.add_torrent": self._add_torrent,
+            "dm.remove_torrent": self.dm.remove_torrent,
+            "dm.set_file_priorities": self.dm.set_file_priorities,
+            "dm.get_file_priorities": self.dm.get_file_priorities,
+            "dm.get_torrent_info": self._get_torrent_info,
+            "dm.get_torrent_files": self._get_torrent_files,
+            "dm.get_torrent_status": self._get_torrent_status,
+            "dm.toggle_pause": self.dm.toggle_pause,
+            "dm.recheck_torrent": self.dm.recheck_torrent,
+            "dm.get_session_stats": self.dm.get_session_stats,
+            "tm.version": lambda: self.tm.version,
+            "tm.add_torrent": self._save_torrent,
+            "tm.remove_torrent": self.tm.remove_torrent,
+            "tm.update_torrent_paused_state": self.tm.update_torrent_paused_state,
+            "tm.update_torrent_is_notified": self.tm.update_torrent_is_notified,
+            "tm.update_torrent_metadata": self.tm.update_torrent_metadata,
+            "tm.update_torrent_file_priorities": self.tm.update_torrent_file_priorities,
+            "tm.get_torrent": self.tm.get_torrent,
+            "tm.get_all_torrents": self.tm.get_all_torrents,
+        }
+
+    async def serve(self) -> None:
+        """Serve the socket and keep the session going until `stop()`."""
+        if not hasattr(asyncio, "start_unix_server"):
+            raise DaemonError("the daemon needs unix sockets, not available here")
+
+        path = rpc.SOCKET_PATH
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        _check_private(path.parent)
+        path.unlink(missing_ok=True)  # left by a daemon that died; none answered
+
+        # the session is this user's alone to drive, so the socket is born
+        # 0600 rather than chmod-ed after others could have connected. umask
+        # is process-wide: this runs before any torrent starts writing files
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(
+                self._serve_client, path=str(path), limit=rpc.MAX_MESSAGE
+            )
+        finally:
+            os.umask(umask)
+        self.dm.start_torrents(self.tm.get_all_torrents())
+
+        loop = asyncio.get_running_loop()
+        handled: list[signal.Signals] = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+                handled.append(sig)
+            except (NotImplementedError, RuntimeError):  # not the main thread
+                continue
+
+        try:
+            await self._run_session()
+        finally:
+            for sig in handled:
+                loop.remove_signal_handler(sig)
+            # attached clients are hung up on, or closing would wait for them
+            server.close()
+            for writer in self._writers:
+                writer.close()
+            await server.wait_closed()
+            path.unlink(missing_ok=True)
+
+            for _, indexer in self._indexers or []:
+                await indexer.aclose()
+            # keep what was downloaded so the next start needn't recheck it
+            self.dm.save_all_resume_data()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def _run_session(self) -> None:
+        while not self._stopping.is_set():
+            self.dm.check_metadata_updates()
+            self.dm.poll_status_updates()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.TICK)
+            except asyncio.TimeoutError:
+                continue
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # statuses this connection has been sent, for its `poll` to diff against
+        sent: dict[str, TorrentStatus] = {}
+        methods = {**self.methods, "poll": partial(self.poll, sent)}
+        self._writers.add(writer)
+        try:
+            await rpc.serve_connection(reader, writer, methods)
+        finally:
+            self._writers.discard(writer)
+
+    def poll(self, sent: dict[str, TorrentStatus]) -> dict[str, Any]:
+        """The statuses changed since `sent`, and the torrents since removed.
+
+        `statuses` replaces a torrent's dict whenever its status changes, so
+        an identity check per torrent is the whole diff. A connection's first
+        poll is `full`: a client that reconnected drops what it had mirrored.
+        The registry's `version` and the session `stats` ride along, so a ui
+        tick is this one call.
+        """
+        full = not sent
+        statuses = self.dm.statuses
+        removed = [uri for uri in sent if uri not in statuses]
+        for magnet_uri in removed:
+            del sent[magnet_uri]
+
+        changed: dict[str, dict[str, Any]] = {}
+        for magnet_uri, status in statuses.items():
+            if sent.get(magnet_uri) is not status:
+                sent[magnet_uri] = status
+                changed[magnet_uri] = encode_status(status)
+        return {
+            "changed": changed,
+            "removed": removed,
+            "full": full,
+            "version": self.tm.version,
+            "stats": self.dm.get_session_stats(),
+        }
+
+    # scripting api
+    async def add(
+        self,
+        uri: str,
+        paused: bool = False,
+        file_priorities: list[int] | None = None,
+        use_cache: bool = True,
+    ) -> TorrentRecord:
+        """Start a torrent from a magnet URI, .torrent URL or path."""
+        magnet_uri, info = await resolve_torrent(uri, use_cache=use_cache)
+        if not magnet_uri:
+            raise DaemonError(f"could not resolve {uri}")
+
+        torrent = Torrent(
+            magnet_uri=magnet_uri,
+            title=info.name() if info else display_name(magnet_uri) or uri,
+            size=info.total_size() if info else 0,
+            seeders=0,
+            leechers=0,
+            source="RPC",
+        )
+        self.tm.add_torrent(torrent, file_priorities=file_priorities)
+        self.tm.update_torrent_paused_state(magnet_uri, paused)
+        self.dm.add_torrent(
+            magnet_uri,
+            is_paused=paused,
+            file_priorities=file_priorities,
+            torrent_info=info,
+        )
+        return self._record(magnet_uri)
+
+    def remove(self, magnet_uri: str, delete_files: bool = False) -> None:
+        self._record(magnet_uri)
+        self.dm.remove_torrent(magnet_uri, delete_files=delete_files)
+        self.tm.remove_torrent(magnet_uri)
+
+    def _set_paused(self, magnet_uri: str, is_paused: bool) -> None:
+        self._record(magnet_uri)
+        # adding a torrent already in the session only sets its paused state
+        self.dm.add_torrent(magnet_uri, is_paused=is_paused)
+        self.tm.update_torrent_paused_state(magnet_uri, is_paused)
+
+    def status(self, magnet_uri: str | None = None) -> list[dict[str, Any]]:
+        """Saved torrents with their latest status, or just the one asked for."""
+        records = (
+            [self._record(magnet_uri)] if magnet_uri else self.tm.get_all_torrents()
+        )
+        return [
+            {
+                **r,
+                **encode_status(self.dm.statuses.get(r["magnet_uri"], TorrentStatus())),
+            }
+            for r in records
+        ]
+
+    async def search(self, query: str, use_cache: bool = True) -> list[dict[str, Any]]:
+        """Search every indexer the default one names, most seeded first.
+
+        A torrent several indexers list is returned once, as the first one to
+        answer has it. Indexers that fail are skipped; only when all of them
+        do is it an error.
+        """
+        indexers = self._search_indexers()
+        outcomes = await asyncio.gather(
+            *(i.search(query, use_cache=use_cache) for _, i in indexers),
+            return_exceptions=True,
+        )
+
+        # merged and ordered as the ui does: deduped by info-hash, and sorted
+        # on seeders read leniently, since some indexers send them as text
+        view = ResultView()
+        view.set_sort(SortKey.SEEDERS, descending=True)
+        errors: list[str] = []
+        for (name, _), outcome in zip(indexers, outcomes):
+            if isinstance(outcome, Exception):
+                errors.append(f"{name}: {outcome}")
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                view.add_results(outcome or [])
+        if errors and len(errors) == len(indexers):
+            raise DaemonError("; ".join(errors))
+
+        return [t.to_dict() for t in view.visible()]
+
+    def _search_indexers(self) -> list[tuple[str, BaseIndexer]]:
+        # built once, so searches share each indexer's warm connections
+        if self._indexers is None:
+            config = get_config()
+            default = config.get("indexers.default", None)
+            indexers = [i for i in configured_indexers() if default in ("all", i.name)]
+            if not indexers:
+                raise DaemonError("no indexer is configured to search with")
+
+            self._indexers = [
+                (
+                    i.name,
+                    lazy_import(indexer_cls_path(i.name))(
+                        i.url,
+                        i.api_key,
+                        timeout=config.get("general.timeout", DEFAULT_TIMEOUT),
+                        max_retries=config.get(
+                            "general.max_retries", DEFAULT_MAX_RETRIES
+                        ),
+                    ),
+                )
+                for i in indexers
+            ]
+        return self._indexers
+
+    def _record(self, magnet_uri: str) -> TorrentRecord:
+        record = self.tm.get_torrent(magnet_uri)
+        if record is None:
+            raise DaemonError(f"no such torrent: {magnet_uri}")
+        return record
+
+    # the managers' calls that take or give values json can't carry as is
+    def _add_torrent(
+        self,
+        magnet_uri: str,
+        is_paused: bool = False,
+        file_priorities: list[int] | None = None,
+        torrent_info: str | None = None,
+    ) -> None:
+        info = decode_info(torrent_info) if torrent_info is not None else None
+        self.dm.add_torrent(magnet_uri, is_paused, file_priorities, info)
+
+    def _get_torrent_info(self, magnet_uri: str) -> str | None:
+        info = self.dm.get_torrent_info(magnet_uri)
+        return encode_info(info) if info is not None else None
+
+    def _get_torrent_files(self, magnet_uri: str) -> list[dict[str, Any]] | None:
+        files = self.dm.get_torrent_files(magnet_uri)
+        return [asdict(f) for f in files] if files is not None else None
+
+    def _get_torrent_status(self, magnet_uri: str) -> dict[str, Any] | None:
+        status = self.dm.get_torrent_status(magnet_uri)
+        return encode_status(status) if status is not None else None
+
+    def _save_torrent(
+        self, torrent: dict[str, Any], file_priorities: list[int] | None = None
+    ) -> None:
+        self.tm.add_torrent(Torrent(**torrent), file_priorities=file_priorities)
+
+
+def _check_private(directory: Path) -> None:
+    """Refuse a socket directory that someone else owns or can get into.
+
+    `mkdir` leaves an existing directory as it finds it, and anyone who can
+    write to it could swap the socket for their own.
+    """
+    info = directory.lstat()
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise DaemonError(
+            f"{directory} must be a directory of yours that only you can access"
+            " (chmod 700)"
+        )
@@ -1,31 +1,94 @@
 from __future__ import annotations
 
 import os
+import time
+from collections.abc import Iterable
+from contextlib import suppress
 from functools import lru_cache
+from pathlib import Path
 from typing import ClassVar
 
 import libtorrent as lt
 
-from torrra._types import SessionStats, TorrentFileInfo, TorrentStatus
+from torrra._types import (
+    SessionStats,
+    TorrentFileInfo,
+    TorrentRecord,
+    TorrentState,
+    TorrentStatus,
+)
+from torrra.core import db
 from torrra.core.config import get_config
-from torrra.utils.magnet import enhance_magnet_uri, fix_magnet_uri
+from torrra.core.store import BlobStore
+from torrra.utils.magnet import enhance_magnet_uri
+from torrra.utils.magnet_uri import fix_magnet_uri
+
+# libtorrent fast-resume data: which pieces are on disk, so a restart can pick
+# up where it left off instead of re-hashing every file
+resume_store = BlobStore("resume", ".fastresume")
+# the bencoded info dict, so a magnet never has to wait on the swarm twice
+metadata_store = BlobStore("metadata", ".torrent")
 
 
 @lru_cache
 def get_download_manager() -> DownloadManager:
+    from torrra.core.remote import RemoteDownloadManager
+    from torrra.core.rpc import get_daemon_client
+
+    # a running daemon owns the session; attach to it rather than start one
+    if (client := get_daemon_client()) is not None:
+        return RemoteDownloadManager(client)
+    claim_session()  # so a daemon won't start a second session beside this one
     return DownloadManager()
 
 
+# lock file -> its descriptor, held open for as long as this process lives
+_session_locks: dict[Path, int] = {}
+
+
+def claim_session() -> bool:
+    """Take the lock held by whichever process runs the libtorrent session.
+
+    False if another process holds it. Both sessions would listen on the same
+    ports and write the same resume data, so the daemon refuses to start
+    while a ui runs its own. The lock goes when the process does, however it
+    exits. Without flock (Windows, where there is no daemon) it always
+    succeeds.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return True
+
+    path = db.DB_DIR / "session.lock"
+    if path in _session_locks:
+        return True
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    _session_locks[path] = fd
+    return True
+
+
 class DownloadManager:
-    _STATE_MAP: ClassVar[dict[int, tuple[str, str]]] = {
-        lt.torrent_status.states.downloading: ("Downloading", "DOWN"),
-        lt.torrent_status.states.seeding: ("Seeding", "SEED"),
-        lt.torrent_status.states.finished: ("Completed", "DONE"),
-        lt.torrent_status.states.downloading_metadata: ("Fetching", "META"),
-        lt.torrent_status.states.checking_files: ("Checking", "CHCK"),
-        lt.torrent_status.states.checking_resume_data: ("Checking", "CHCK"),
+    _STATE_MAP: ClassVar[dict[int, TorrentState]] = {
+        lt.torrent_status.states.downloading: TorrentState.DOWNLOADING,
+        lt.torrent_status.states.seeding: TorrentState.SEEDING,
+        lt.torrent_status.states.finished: TorrentState.COMPLETED,
+        lt.torrent_status.states.downloading_metadata: TorrentState.FETCHING,
+        lt.torrent_status.states.checking_files: TorrentState.CHECKING,
+        lt.torrent_status.states.checking_resume_data: TorrentState.CHECKING,
     }
 
+    # seconds before a finished torrent's files are looked for on disk again
+    MISSING_FILES_RECHECK: ClassVar[float] = 300.0
+    # seconds between saving resume data for torrents that changed
+    RESUME_SAVE_INTERVAL: ClassVar[float] = 60.0
+
     def __init__(self) -> None:
         settings: lt.settings_pack = {
             "listen_interfaces": "0.0.0.0:6881,[::]:6881,0.0.0.0:0",
@@ -40,7 +103,15 @@ class DownloadManager:
         }
         self.session: lt.session = lt.session(settings)
         self.torrents: dict[str, lt.torrent_handle] = {}
+        # state_update_alert reports handles, so map them back to their uri
+        self._uri_by_handle: dict[lt.torrent_handle, str] = {}
+        # last status delivered for each torrent, kept current from alerts
+        self.statuses: dict[str, TorrentStatus] = {}
+        # uri -> (files missing?, monotonic time checked), oldest check first
+        self._missing_files: dict[str, tuple[bool, float]] = {}
         self._file_priorities: dict[str, list[int]] = {}
+        self._last_resume_save: float = time.monotonic()
+        self._resume_pending: int = 0  # save_resume_data calls not yet answered
         self._metadata_updated: set[str] = (
             set()
         )  # Track torrents whose metadata has been updated
@@ -61,6 +132,7 @@ class DownloadManager:
             if not handle.is_valid():
                 # If handle is invalid, remove it and add the torrent fresh
                 del self.torrents[magnet_uri]
+                self._uri_by_handle.pop(handle, None)
             else:
                 if file_priorities is not None and handle.status().has_metadata:
                     try:
@@ -89,12 +161,21 @@ class DownloadManager:
         try:
             atp = lt.parse_magnet_uri(proper_magnet_uri)
             atp.save_path = get_config().get("general.download_path")
+            # resumed torrents keep the save path and pieces they had
+            resumed = self._read_resume_data(atp)
+            if resumed is not None:
+                atp = resumed
+            if torrent_info is None and atp.ti is None:
+                torrent_info = load_metadata(atp.info_hashes)
             if torrent_info is not None:
                 atp.ti = torrent_info
+                save_metadata(torrent_info)
 
             if is_paused:
-                if torrent_info is not None or (
-                    hasattr(atp, "ti") and atp.ti is not None
+                if (
+                    torrent_info is not None
+                    or resumed is not None
+                    or (hasattr(atp, "ti") and atp.ti is not None)
                 ):
                     atp.flags |= lt.torrent_flags.paused
                     atp.flags &= ~lt.torrent_flags.auto_managed
@@ -109,6 +190,7 @@ class DownloadManager:
             # Add the torrent to the session and start tracking
             handle = self.session.add_torrent(atp)
             self.torrents[magnet_uri] = handle
+            self._uri_by_handle[handle] = magnet_uri
 
             if (
                 file_priorities is not None
@@ -122,19 +204,34 @@ class DownloadManager:
         except (RuntimeError, ValueError):
             return
 
+    def start_torrents(self, records: Iterable[TorrentRecord]) -> None:
+        """Add saved torrents, paused or not as they were left."""
+        for record in records:
+            self.add_torrent(
+                record["magnet_uri"],
+                is_paused=record["is_paused"],
+                file_priorities=record.get("file_priorities"),
+            )
+
     def remove_torrent(self, magnet_uri: str, delete_files: bool = False) -> None:
         handle = self.torrents.get(magnet_uri)
         if handle and handle.is_valid():
+            resume_store.delete(_store_key(handle.info_hashes()))
+            metadata_store.delete(_store_key(handle.info_hashes()))
             if delete_files:
                 self.session.remove_torrent(handle, lt.session.delete_files)
             else:
                 self.session.remove_torrent(handle)
             del self.torrents[magnet_uri]
+            self._uri_by_handle.pop(handle, None)
         self._file_priorities.pop(magnet_uri, None)
+        self.statuses.pop(magnet_uri, None)
+        self._missing_files.pop(magnet_uri, None)
         self._metadata_updated.discard(magnet_uri)
 
     def set_file_priorities(self, magnet_uri: str, priorities: list[int]) -> None:
         self._file_priorities[magnet_uri] = priorities
+        self._missing_files.pop(magnet_uri, None)  # the wanted files changed
         handle = self.torrents.get(magnet_uri)
         if handle and handle.is_valid() and handle.status().has_metadata:
             try:
@@ -151,14 +248,21 @@ class DownloadManager:
                 pass
         return self._file_priorities.get(magnet_uri)
 
-    def get_torrent_files(self, magnet_uri: str) -> list[TorrentFileInfo] | None:
+    def get_torrent_info(self, magnet_uri: str) -> lt.torrent_info | None:
+        """The torrent's metadata, or None until it has been fetched."""
         handle = self.torrents.get(magnet_uri)
         if not handle or not handle.is_valid() or not handle.status().has_metadata:
             return None
         try:
-            info = handle.torrent_file()
-            if not info:
-                return None
+            return handle.torrent_file() or None
+        except (AttributeError, RuntimeError):
+            return None
+
+    def get_torrent_files(self, magnet_uri: str) -> list[TorrentFileInfo] | None:
+        info = self.get_torrent_info(magnet_uri)
+        if info is None:
+            return None
+        try:
             fs = info.files()
             files: list[TorrentFileInfo] = []
             for i in range(fs.num_files()):
@@ -192,18 +296,146 @@ class DownloadManager:
 
     def recheck_torrent(self, magnet_uri: str) -> None:
         handle = self.torrents.get(magnet_uri)
+        self._missing_files.pop(magnet_uri, None)
         if handle and handle.is_valid():
             try:
                 handle.force_recheck()
             except (AttributeError, RuntimeError):
                 pass
 
+    def poll_status_updates(self) -> dict[str, TorrentStatus]:
+        """Statuses of the torrents that changed since the previous poll.
+
+        Rather than a blocking `status()` round-trip into the libtorrent thread
+        for every handle, the session is asked to post one state_update_alert
+        carrying only the torrents that changed. The alert requested here is
+        collected on the next poll, so a tick is one poll behind libtorrent;
+        torrents added since then are queried directly once so they never
+        show up without a status. `statuses` holds the full picture.
+        """
+        changed = self._handle_alerts()
+
+        # idle seeds aren't in any state update, so revalidate their files here
+        now = time.monotonic()
+        due: list[str] = []
+        for magnet_uri, (_, checked_at) in self._missing_files.items():
+            if now - checked_at < self.MISSING_FILES_RECHECK:
+                break  # the rest were checked more recently still
+            due.append(magnet_uri)
+        for magnet_uri in due:
+            self._missing_files.pop(magnet_uri)
+        unseen = self.torrents.keys() - self.statuses.keys()
+        for magnet_uri in (unseen | set(due)) - changed.keys():
+            if status := self.get_torrent_status(magnet_uri):
+                changed[magnet_uri] = status
+
+        self.statuses.update(changed)
+        self.session.post_torrent_updates()
+
+        if now - self._last_resume_save >= self.RESUME_SAVE_INTERVAL:
+            self._request_resume_data()
+        return changed
+
+    def _handle_alerts(self) -> dict[str, TorrentStatus]:
+        """Act on every queued alert, returning the statuses they carried."""
+        changed: dict[str, TorrentStatus] = {}
+
+        for alert in self.session.pop_alerts():
+            if isinstance(alert, lt.state_update_alert):
+                for s in alert.status:
+                    magnet_uri = self._uri_by_handle.get(s.handle)
+                    if magnet_uri is None:  # removed since the update was asked for
+                        continue
+                    changed[magnet_uri] = self._build_status(magnet_uri, s.handle, s)
+            elif isinstance(alert, lt.save_resume_data_alert):
+                self._resume_pending -= 1
+                if alert.handle not in self._uri_by_handle:
+                    continue  # removed while the save was in flight
+                key = _store_key(alert.params.info_hashes)
+                with suppress(OSError):  # saved again next interval
+                    resume_store.put(key, lt.write_resume_data_buf(alert.params))
+            elif isinstance(alert, lt.save_resume_data_failed_alert):
+                self._resume_pending -= 1
+            elif isinstance(alert, lt.file_error_alert) and (
+                magnet_uri := self._uri_by_handle.get(alert.handle)
+            ):
+                # something on disk went away; look again on the next status
+                self._missing_files.pop(magnet_uri, None)
+
+        return changed
+
+    def _request_resume_data(self) -> None:
+        """Ask libtorrent for resume data of every saved torrent that changed.
+
+        The answers arrive as alerts and are written by `_handle_alerts`.
+        """
+        from torrra.core.torrent import get_torrent_manager
+
+        tm = get_torrent_manager()
+        self._last_resume_save = time.monotonic()
+        for magnet_uri, handle in self.torrents.items():
+            if tm.get_torrent(magnet_uri) is None:
+                continue  # a preview, nothing to resume once it's closed
+            try:
+                if handle.is_valid() and handle.need_save_resume_data():
+                    handle.save_resume_data()
+                    self._resume_pending += 1
+            except RuntimeError:
+                continue
+
+    def save_all_resume_data(self, timeout: float = 5.0) -> None:
+        """Save resume data for every changed torrent and wait for it to land.
+
+        Called on shutdown, so the next start goes straight back to
+        downloading or seeding rather than re-checking every file.
+        """
+        self._request_resume_data()
+        deadline = time.monotonic() + timeout
+        while self._resume_pending > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self.session.wait_for_alert(int(remaining * 1000)) is not None:
+                self._handle_alerts()
+        self._resume_pending = 0
+
+    def _read_resume_data(
+        self, atp: lt.add_torrent_params
+    ) -> lt.add_torrent_params | None:
+        data = resume_store.get(_store_key(atp.info_hashes))
+        if data is None:
+            return None
+        try:
+            resumed = lt.read_resume_data(data)
+        except RuntimeError:  # corrupt; fall back to a fresh add
+            return None
+        if not resumed.save_path:
+            resumed.save_path = atp.save_path
+        # the magnet's trackers may include ones added since the save
+        resumed.trackers = list(dict.fromkeys([*resumed.trackers, *atp.trackers]))
+        return resumed
+
+    async def refresh(self) -> tuple[SessionStats, dict[str, TorrentStatus]]:
+        """A ui tick's reads: session stats and the statuses that changed.
+
+        Here the session is in-process and answers at once; the daemon's
+        client overrides this to wait on its socket off the ui's loop.
+        """
+        self.check_metadata_updates()
+        return self.get_session_stats(), self.poll_status_updates()
+
     def get_torrent_status(self, magnet_uri: str) -> TorrentStatus | None:
         handle = self.torrents.get(magnet_uri)
         if not handle or not handle.is_valid():
             return None
 
-        s = handle.status()
+        status = self._build_status(magnet_uri, handle, handle.status())
+        self.statuses[magnet_uri] = status
+        return status
+
+    def _build_status(
+        self, magnet_uri: str, handle: lt.torrent_handle, s: lt.torrent_status
+    ) -> TorrentStatus:
         is_seeding = (
             s.is_seeding
             or s.is_finished
@@ -240,37 +472,14 @@ class DownloadManager:
             and s.has_metadata
             and (is_seeding or s.progress >= 1.0)
         ):
-            try:
-                info = handle.torrent_file()
-                if info:
-                    save_path = s.save_path or get_config().get("general.download_path")
-                    if save_path:
-                        fs = info.files()
-                        priorities = self.get_file_priorities(magnet_uri)
-                        for i in range(fs.num_files()):
-                            if (
-                                priorities is not None
-                                and i < len(priorities)
-                                and priorities[i] == 0
-                            ):
-                                continue
-                            if hasattr(lt.file_storage, "flag_pad_file") and (
-                                fs.file_flags(i) & lt.file_storage.flag_pad_file
-                            ):
-                                continue
-                            file_path = os.path.join(save_path, fs.file_path(i))
-                            if not os.path.exists(file_path):
-                                is_missing_files = True
-                                break
-            except (AttributeError, RuntimeError, OSError):
-                pass
+            is_missing_files = self._has_missing_files(magnet_uri, handle, s)
 
         connected_seeds = s.num_seeds
         total_seeds = max(connected_seeds, getattr(s, "list_seeds", 0))
         connected_peers = getattr(s, "num_peers", 0)
         total_peers = max(connected_peers, getattr(s, "list_peers", 0))
 
-        return TorrentStatus(
+        status = TorrentStatus(
             state=s.state,
             progress=s.progress * 100,
             down_speed=s.download_rate,
@@ -288,11 +497,74 @@ class DownloadManager:
             is_missing_files=is_missing_files,
             is_queued=is_queued,
         )
+        status["torrent_state"] = self.classify_state(status)
+        return status
+
+    def _has_missing_files(
+        self, magnet_uri: str, handle: lt.torrent_handle, s: lt.torrent_status
+    ) -> bool:
+        """Whether a finished torrent's wanted files are gone from disk.
+
+        Stat-ing every file of every seed each tick adds up to hundreds of
+        thousands of syscalls a second on a big seedbox, so the answer is kept
+        and only worked out again once MISSING_FILES_RECHECK has passed, or
+        sooner when libtorrent reports a file error.
+        """
+        cached = self._missing_files.get(magnet_uri)
+        if cached is not None:
+            is_missing, checked_at = cached
+            if time.monotonic() - checked_at < self.MISSING_FILES_RECHECK:
+                return is_missing
+
+        is_missing = self._find_missing_files(magnet_uri, handle, s)
+        # re-insert rather than overwrite so the dict stays in check order
+        self._missing_files.pop(magnet_uri, None)
+        self._missing_files[magnet_uri] = (is_missing, time.monotonic())
+        return is_missing
+
+    def _find_missing_files(
+        self, magnet_uri: str, handle: lt.torrent_handle, s: lt.torrent_status
+    ) -> bool:
+        try:
+            info = handle.torrent_file()
+            if not info:
+                return False
+            save_path = s.save_path or get_config().get("general.download_path")
+            if not save_path:
+                return False
+            fs = info.files()
+            priorities = self.get_file_priorities(magnet_uri)
+            for i in range(fs.num_files()):
+                if (
+                    priorities is not None
+                    and i < len(priorities)
+                    and priorities[i] == 0
+                ):
+                    continue
+                if hasattr(lt.file_storage, "flag_pad_file") and (
+                    fs.file_flags(i) & lt.file_storage.flag_pad_file
+                ):
+                    continue
+                file_path = os.path.join(save_path, fs.file_path(i))
+                if not os.path.exists(file_path):
+                    return True
+        except (AttributeError, RuntimeError, OSError):
+            pass
+        return False
+
+    def get_torrent_state(self, status: TorrentStatus) -> TorrentState:
+        """The state classified when the status was built, else classify now."""
+        return status.get("torrent_state") or self.classify_state(status)
 
     def get_torrent_state_text(self, status: TorrentStatus, short: bool = False) -> str:
+        state = self.get_torrent_state(status)
+        return state.short if short else state.label
+
+    @classmethod
+    def classify_state(cls, status: TorrentStatus) -> TorrentState:
         # Check missing files and errors first
         if status.get("is_missing_files"):
-            return "MISS" if short else "Missing Files"
+            return TorrentState.MISSING_FILES
 
         if error := status.get("error"):
             error_msg = error.lower()
@@ -302,14 +574,14 @@ class DownloadManager:
                 or "not found" in error_msg
                 or "missing" in error_msg
             ):
-                return "MISS" if short else "Missing Files"
-            return "ERRO" if short else "Error"
+                return TorrentState.MISSING_FILES
+            return TorrentState.ERROR
 
         # Check paused and queued states
         if status.get("is_paused"):
             if status.get("is_queued"):
-                return "QUEU" if short else "Queued"
-            return "PAUS" if short else "Paused"
+                return TorrentState.QUEUED
+            return TorrentState.PAUSED
 
         state = status.get("state")
 
@@ -318,18 +590,17 @@ class DownloadManager:
             state == lt.torrent_status.states.downloading
             and status.get("down_speed", 0) == 0
         ):
-            return "STAL" if short else "Stalled"
+            return TorrentState.STALLED
 
         # Seeding fallback when is_seeding is set but state is not finished
         if state != lt.torrent_status.states.finished and status.get("is_seeding"):
-            return "SEED" if short else "Seeding"
+            return TorrentState.SEEDING
 
         # Standard state lookup from _STATE_MAP
-        idx = 1 if short else 0
-        if state is not None and state in self._STATE_MAP:
-            return self._STATE_MAP[state][idx]
+        if state is not None and state in cls._STATE_MAP:
+            return cls._STATE_MAP[state]
 
-        return "N/A"
+        return TorrentState.UNKNOWN
 
     def check_metadata_updates(self) -> None:
         from torrra.core.torrent import get_torrent_manager
@@ -337,9 +608,11 @@ class DownloadManager:
         tm = get_torrent_manager()
 
         for magnet_uri, handle in self.torrents.items():
-            # Only check for metadata if we haven't updated it yet
+            # Only check for metadata if we haven't updated it yet; previews
+            # wait until they're added, so a cancelled one leaves nothing behind
             if (
                 magnet_uri not in self._metadata_updated
+                and tm.get_torrent(magnet_uri) is not None
                 and handle.is_valid()
                 and handle.status().has_metadata
             ):
@@ -354,6 +627,7 @@ class DownloadManager:
                             handle.prioritize_files(self._file_priorities[magnet_uri])
 
                         tm.update_torrent_metadata(magnet_uri, title, size)
+                        save_metadata(torrent_info)
                         self._metadata_updated.add(magnet_uri)
                 except (AttributeError, RuntimeError):
                     continue
@@ -386,3 +660,35 @@ class DownloadManager:
                 upload_rate=up_speed,
                 dht_nodes=0,
             )
+
+
+def _store_key(info_hashes: lt.info_hash_t) -> str:
+    """Hex info-hash naming a torrent's files in the stores."""
+    return str(info_hashes.v1 if info_hashes.has_v1() else info_hashes.v2)
+
+
+def metadata_bytes(info: lt.torrent_info) -> bytes:
+    """The info dict alone, wrapped as the smallest valid .torrent file."""
+    return b"d4:info" + bytes(info.info_section()) + b"e"
+
+
+def save_metadata(info: lt.torrent_info) -> None:
+    key = _store_key(info.info_hashes())
+    if key in metadata_store:
+        return  # content-addressed, so whatever is there is already this
+    with suppress(OSError, RuntimeError):
+        metadata_store.put(key, metadata_bytes(info))
+
+
+def load_metadata(info_hashes: lt.info_hash_t) -> lt.torrent_info | None:
+    """Stored metadata for a torrent, or None if it has never been fetched."""
+    key = _store_key(info_hashes)
+    data = metadata_store.get(key)
+    if data is None:
+        return None
+    try:
+        info = lt.torrent_info(data)
+    except RuntimeError:
+        return None
+    # a blob that doesn't hash to its name is damaged; fetch from the swarm
+    return info if _store_key(info.info_hashes()) == key else None
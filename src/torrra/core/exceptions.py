@@ -4,3 +4,7 @@ class ConfigError(Exception):
 
 class IndexerError(Exception):
     """Indexer error."""
+
+
+class DaemonError(Exception):
+    """Daemon error."""
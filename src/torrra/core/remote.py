@@ -0,0 +1,243 @@
+import asyncio
+import base64
+import binascii
+from collections.abc import Iterable
+from typing import Any, cast
+from weakref import WeakKeyDictionary
+
+import libtorrent as lt
+from typing_extensions import override
+
+from torrra._types import (
+    SessionStats,
+    Torrent,
+    TorrentFileInfo,
+    TorrentRecord,
+    TorrentState,
+    TorrentStatus,
+)
+from torrra.core.download import DownloadManager, metadata_bytes
+from torrra.core.exceptions import DaemonError
+from torrra.core.rpc import DaemonClient
+from torrra.core.torrent import TorrentManager
+
+
+# the managers' values as they cross the daemon's socket
+def encode_status(status: TorrentStatus) -> dict[str, Any]:
+    encoded: dict[str, Any] = dict(status)
+    if "state" in status:
+        encoded["state"] = int(status["state"])
+    if "torrent_state" in status:
+        encoded["torrent_state"] = status["torrent_state"].name
+    return encoded
+
+
+def decode_status(data: dict[str, Any]) -> TorrentStatus:
+    status = cast(TorrentStatus, dict(data))
+    if "state" in data:
+        status["state"] = lt.torrent_status.states(data["state"])
+    if "torrent_state" in data:
+        status["torrent_state"] = TorrentState[data["torrent_state"]]
+    return status
+
+
+# the registry version each connection's last poll carried; gone after a write
+_polled_versions: "WeakKeyDictionary[DaemonClient, int]" = WeakKeyDictionary()
+
+
+def encode_info(info: lt.torrent_info) -> str:
+    return base64.b64encode(metadata_bytes(info)).decode()
+
+
+def decode_info(data: str) -> lt.torrent_info:
+    try:
+        return lt.torrent_info(base64.b64decode(data))
+    except (binascii.Error, RuntimeError) as e:
+        raise DaemonError(f"damaged torrent metadata: {e}") from e
+
+
+class RemoteDownloadManager(DownloadManager):
+    """A DownloadManager whose session lives in the daemon.
+
+    Every call is forwarded over the daemon's socket, so the ui works the
+    same attached or not. `statuses` is mirrored here from `poll`, which
+    carries only what changed since this client last asked.
+    """
+
+    def __init__(self, client: DaemonClient) -> None:
+        # no session of its own; the daemon's is the only one
+        self._client: DaemonClient = client
+        self.torrents = {}
+        self.statuses = {}
+
+    @override
+    def add_torrent(
+        self,
+        magnet_uri: str,
+        is_paused: bool = False,
+        file_priorities: list[int] | None = None,
+        torrent_info: lt.torrent_info | None = None,
+    ) -> None:
+        self._client.call(
+            "dm.add_torrent",
+            magnet_uri=magnet_uri,
+            is_paused=is_paused,
+            file_priorities=file_priorities,
+            torrent_info=encode_info(torrent_info)
+            if torrent_info is not None
+            else None,
+        )
+
+    @override
+    def start_torrents(self, records: Iterable[TorrentRecord]) -> None:
+        pass  # the daemon started them when it came up
+
+    @override
+    def remove_torrent(self, magnet_uri: str, delete_files: bool = False) -> None:
+        self._client.call(
+            "dm.remove_torrent", magnet_uri=magnet_uri, delete_files=delete_files
+        )
+        self.statuses.pop(magnet_uri, None)
+
+    @override
+    def set_file_priorities(self, magnet_uri: str, priorities: list[int]) -> None:
+        self._client.call(
+            "dm.set_file_priorities", magnet_uri=magnet_uri, priorities=priorities
+        )
+
+    @override
+    def get_file_priorities(self, magnet_uri: str) -> list[int] | None:
+        return self._client.call("dm.get_file_priorities", magnet_uri=magnet_uri)
+
+    @override
+    def get_torrent_info(self, magnet_uri: str) -> lt.torrent_info | None:
+        data = self._client.call("dm.get_torrent_info", magnet_uri=magnet_uri)
+        return decode_info(data) if data is not None else None
+
+    @override
+    def get_torrent_files(self, magnet_uri: str) -> list[TorrentFileInfo] | None:
+        files = self._client.call("dm.get_torrent_files", magnet_uri=magnet_uri)
+        return [TorrentFileInfo(**f) for f in files] if files is not None else None
+
+    @override
+    def toggle_pause(self, magnet_uri: str) -> None:
+        self._client.call("dm.toggle_pause", magnet_uri=magnet_uri)
+
+    @override
+    def recheck_torrent(self, magnet_uri: str) -> None:
+        self._client.call("dm.recheck_torrent", magnet_uri=magnet_uri)
+
+    @override
+    def poll_status_updates(self) -> dict[str, TorrentStatus]:
+        return self._apply(self._client.call("poll"))
+
+    @override
+    async def refresh(self) -> tuple[SessionStats, dict[str, TorrentStatus]]:
+        # one round trip, made off the ui's loop: the screen stays live even
+        # while a stuck daemon runs out the client's timeout
+        update = await asyncio.to_thread(self._client.call, "poll")
+        return update["stats"], self._apply(update)
+
+    def _apply(self, update: dict[str, Any]) -> dict[str, TorrentStatus]:
+        _polled_versions[self._client] = update["version"]
+        if update["full"]:
+            self.statuses = {}
+        for magnet_uri in update["removed"]:
+            self.statuses.pop(magnet_uri, None)
+        changed = {uri: decode_status(s) for uri, s in update["changed"].items()}
+        self.statuses.update(changed)
+        return changed
+
+    @override
+    def get_torrent_status(self, magnet_uri: str) -> TorrentStatus | None:
+        data = self._client.call("dm.get_torrent_status", magnet_uri=magnet_uri)
+        if data is None:
+            return None
+        status = decode_status(data)
+        self.statuses[magnet_uri] = status
+        return status
+
+    @override
+    def check_metadata_updates(self) -> None:
+        pass  # the daemon does this on its own tick
+
+    @override
+    def get_session_stats(self) -> SessionStats:
+        return self._client.call("dm.get_session_stats")
+
+    @override
+    def save_all_resume_data(self, timeout: float = 5.0) -> None:
+        pass  # the session outlives the ui; the daemon saves when it stops
+
+
+class RemoteTorrentManager(TorrentManager):
+    """A TorrentManager whose records live in the daemon.
+
+    Nothing is kept here: reads ask the daemon, so its `version` is the only
+    one, and a ui never holds an index that another has since changed. The
+    version itself comes with each `poll`, and is only asked for after a write
+    or before the first poll.
+    """
+
+    def __init__(self, client: DaemonClient) -> None:
+        self._client: DaemonClient = client
+
+    @property
+    @override
+    def version(self) -> int:
+        version = _polled_versions.get(self._client)
+        if version is None:
+            version = self._client.call("tm.version")
+        return version
+
+    def _write(self, method: str, **params: Any) -> None:
+        self._client.call(method, **params)
+        _polled_versions.pop(self._client, None)  # it just went up
+
+    @override
+    def add_torrent(
+        self, torrent: Torrent, file_priorities: list[int] | None = None
+    ) -> None:
+        self._write(
+            "tm.add_torrent",
+            torrent=torrent.to_dict(),
+            file_priorities=file_priorities,
+        )
+
+    @override
+    def remove_torrent(self, magnet_uri: str) -> None:
+        self._write("tm.remove_torrent", magnet_uri=magnet_uri)
+
+    @override
+    def update_torrent_paused_state(self, magnet_uri: str, is_paused: bool) -> None:
+        self._write(
+            "tm.update_torrent_paused_state", magnet_uri=magnet_uri, is_paused=is_paused
+        )
+
+    @override
+    def update_torrent_is_notified(self, magnet_uri: str) -> None:
+        self._write("tm.update_torrent_is_notified", magnet_uri=magnet_uri)
+
+    @override
+    def update_torrent_metadata(self, magnet_uri: str, title: str, size: int) -> None:
+        self._write(
+            "tm.update_torrent_metadata", magnet_uri=magnet_uri, title=title, size=size
+        )
+
+    @override
+    def update_torrent_file_priorities(
+        self, magnet_uri: str, file_priorities: list[int] | None
+    ) -> None:
+        self._write(
+            "tm.update_torrent_file_priorities",
+            magnet_uri=magnet_uri,
+            file_priorities=file_priorities,
+        )
+
+    @override
+    def get_torrent(self, magnet_uri: str) -> TorrentRecord | None:
+        return self._client.call("tm.get_torrent", magnet_uri=magnet_uri)
+
+    @override
+    def get_all_torrents(self) -> list[TorrentRecord]:
+        return self._client.call("tm.get_all_torrents")
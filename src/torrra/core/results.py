@@ -4,6 +4,7 @@ from enum import Enum
 from typing import Any
 
 from torrra._types import Torrent
+from torrra.utils.magnet_uri import info_hash
 
 
 class SortKey(str, Enum):
@@ -133,36 +134,127 @@ class Filters:
     def is_active(self) -> bool:
         return bool(self.min_seeders or self.title_contains or self.source)
 
+    @property
+    def state(self) -> tuple[int, str, str]:
+        """Everything `matches` depends on, normalized; equal states filter alike."""
+        return self.min_seeders, self.title_contains.casefold(), self.source.casefold()
+
     def clear(self) -> None:
         self.min_seeders = 0
         self.title_contains = ""
         self.source = ""
 
 
+def _reverse_runs(order: list[int], keys: list[Any]) -> list[int]:
+    """Descending order from an ascending one, without sorting again.
+
+    Runs of equal keys are reversed as blocks, each keeping its own order,
+    which is exactly what a stable `sorted(..., reverse=True)` returns.
+    """
+    out: list[int] = []
+    end = len(order)
+    while end:
+        start = end - 1
+        key = keys[order[start]]
+        while start and keys[order[start - 1]] == key:
+            start -= 1
+        out.extend(order[start:end])
+        end = start
+    return out
+
+
+def _sort_columns() -> dict[SortKey, list[Any]]:
+    return {key: [] for key in _SORT_FUNCS}
+
+
 @dataclass
 class ResultView:
     """Ordered, filterable view over a single search result set.
 
     Holds the full result list so sorting and filtering never require a re-query,
     and keeps no reference to the UI so it can be tested without a running app.
+
+    Sort keys and filter fields are normalized once per result as it is added,
+    and each ordering is sorted once per result set: re-sorting, flipping the
+    direction or toggling a filter afterwards only re-reads those columns.
     """
 
     sort_key: SortKey = SortKey.RELEVANCE
     descending: bool = False
     filters: Filters = field(default_factory=Filters)
     _all: list[Torrent] = field(default_factory=list)
+    _seen: set[str] = field(default_factory=set)
+    # per result, in `_all` order: sort keys, and the seeder count filters see
+    _keys: dict[SortKey, list[Any]] = field(default_factory=_sort_columns)
+    _seeders: list[float] = field(default_factory=list)
+    _sources: list[str] = field(default_factory=list)
+    # memos, dropped whenever the result set changes
+    _orders: dict[SortKey, list[int]] = field(default_factory=dict)
+    _visible: dict[tuple[Any, ...], list[Torrent]] = field(default_factory=dict)
 
     def set_results(self, results: list[Torrent]) -> None:
-        seen: set[str] = set()
-        deduped: list[Torrent] = []
-
+        self._all = []
+        self._seen = set()
+        self._keys = _sort_columns()
+        self._seeders = []
+        self._sources = []
+        self.add_results(results)
+
+    def add_results(self, results: list[Torrent]) -> int:
+        """Merge another batch into the set, returning how many were new.
+
+        Torrents are matched by info-hash where the URI carries one, so the
+        same release listed by two indexers shows up once. The first listing
+        wins, which keeps whichever backend answered first in charge of the
+        relevance order.
+        """
+        added = 0
         for torrent in results:
-            if torrent.magnet_uri in seen:
+            key = info_hash(torrent.magnet_uri) or torrent.magnet_uri
+            if key in self._seen:
                 continue
-            seen.add(torrent.magnet_uri)
-            deduped.append(torrent)
+            self._seen.add(key)
+            self._all.append(torrent)
+            for sort_key, sort_func in _SORT_FUNCS.items():
+                self._keys[sort_key].append(sort_func(torrent))
+            self._seeders.append(coerce_numeric(torrent.seeders, 0))
+            self._sources.append(_text(torrent.source))
+            added += 1
+
+        self._orders.clear()
+        self._visible.clear()
+        return added
+
+    def replace_results(self, old: list[Torrent], new: list[Torrent]) -> None:
+        """Swap a batch for a newer version of it, in place.
+
+        Used when stale cached results are revalidated: the fresh listing
+        takes the slot the stale one held, so rows from other indexers keep
+        their positions and the relevance order doesn't jump around.
+        """
+        old_ids = {id(t) for t in old}
+        # kept rows ahead of the first old one stay ahead of the new batch
+        slot = next(
+            (i for i, t in enumerate(self._all) if id(t) in old_ids), len(self._all)
+        )
+        kept = [t for t in self._all if id(t) not in old_ids]
+
+        self.set_results(kept[:slot])
+        self.add_results(new)
+        self.add_results(kept[slot:])
 
-        self._all = deduped
+    @property
+    def appends_in_order(self) -> bool:
+        """Whether added results only ever land below the rows already visible.
+
+        So it is in the indexers' own order with no filter set, and a view can
+        add a new batch's rows to the bottom rather than re-render them all.
+        """
+        return (
+            self.sort_key is SortKey.RELEVANCE
+            and not self.descending
+            and not self.filters.is_active
+        )
 
     def set_sort(self, key: SortKey, descending: bool | None = None) -> None:
         self.sort_key = key
@@ -194,13 +286,50 @@ class ResultView:
         return f"{self.sort_key.value} {'↓' if self.descending else '↑'}"
 
     def visible(self) -> list[Torrent]:
-        rows = [t for t in self._all if self.filters.matches(t)]
-
-        sort_func = _SORT_FUNCS.get(self.sort_key)
-        if sort_func is None:  # relevance, i.e. whatever order the indexer returned
-            if self.descending:
-                rows.reverse()
-            return rows
-
+        memo_key = (self.sort_key, self.descending, self.filters.state)
+        rows = self._visible.get(memo_key)
+        if rows is None:
+            rows = self._visible[memo_key] = [self._all[i] for i in self._ordered()]
+        return list(rows)  # callers may mutate their copy
+
+    def _ordered(self) -> list[int]:
+        """Indices of the rows passing the filters, in display order."""
+        order = self._orders.get(self.sort_key)
+        if order is None:
+            order = self._orders[self.sort_key] = self._ascending(self.sort_key)
+
+        mask = self._mask()
+        if mask is not None:
+            order = [i for i in order if mask[i]]
+        if not self.descending:
+            return order
+
+        keys = self._keys.get(self.sort_key)
+        if keys is None:  # relevance: every key is unique
+            return order[::-1]
+        return _reverse_runs(order, keys)
+
+    def _ascending(self, key: SortKey) -> list[int]:
+        indices = range(len(self._all))
+        keys = self._keys.get(key)
+        if keys is None:  # relevance, i.e. whatever order the indexer returned
+            return list(indices)
         # sorted() is stable, so equal keys keep their relevance ranking
-        return sorted(rows, key=sort_func, reverse=self.descending)
+        return sorted(indices, key=keys.__getitem__)
+
+    def _mask(self) -> list[bool] | None:
+        """Which rows pass the filters, or None when they all do.
+
+        Mirrors `Filters.matches`, reading the normalized columns instead.
+        """
+        min_seeders, title, source = self.filters.state
+        if not (min_seeders or title or source):
+            return None
+
+        titles = self._keys[SortKey.TITLE]
+        return [
+            seeders >= min_seeders
+            and title in titles[i]
+            and (not source or source == self._sources[i])
+            for i, seeders in enumerate(self._seeders)
+        ]
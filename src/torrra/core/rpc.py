@@ -0,0 +1,225 @@
+import asyncio
+import inspect
+import json
+import socket
+import threading
+import warnings
+from collections.abc import Callable, Mapping
+from contextlib import suppress
+from functools import lru_cache
+from io import BufferedReader
+from pathlib import Path
+from typing import Any, ClassVar
+
+from platformdirs import user_runtime_dir
+
+from torrra.core.exceptions import DaemonError
+
+with warnings.catch_warnings():
+    # platformdirs warns when it falls back from an unset XDG_RUNTIME_DIR
+    warnings.simplefilter("ignore")
+    SOCKET_PATH = Path(user_runtime_dir("torrra")) / "daemon.sock"
+
+# the largest request is one .torrent file, base64-encoded
+MAX_MESSAGE = 16 * 1024 * 1024
+
+# json-rpc 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+Method = Callable[..., Any]
+
+
+class _Fault(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code: int = code
+
+
+@lru_cache
+def get_daemon_client() -> "DaemonClient | None":
+    """The running daemon to attach to, or None to run the session here."""
+    try:
+        return DaemonClient.connect()
+    except DaemonError:
+        return None
+
+
+class DaemonClient:
+    """Blocking JSON-RPC client for the daemon's socket.
+
+    One request is in flight at a time. A call is a local round trip well
+    under a millisecond, cheap enough for the ui to make from its own loop.
+    A connection that fails is closed and dropped from `get_daemon_client`;
+    the next call dials the daemon again, or raises if it is gone.
+    """
+
+    # seconds to wait on an answer before giving up on the daemon; every call
+    # the ui makes is quick, so a daemon this slow is stuck
+    TIMEOUT: ClassVar[float] = 5.0
+
+    def __init__(self, sock: socket.socket, path: Path | None = None) -> None:
+        self._path: Path = path or SOCKET_PATH
+        self._sock: socket.socket | None = sock
+        self._reader: BufferedReader | None = sock.makefile("rb")
+        self._lock: threading.Lock = threading.Lock()
+        self._next_id: int = 0
+
+    @classmethod
+    def connect(cls, path: Path | None = None) -> "DaemonClient":
+        path = path or SOCKET_PATH
+        return cls(_open(path), path)
+
+    def call(self, method: str, **params: Any) -> Any:
+        with self._lock:
+            if self._sock is None or self._reader is None:
+                self._sock = _open(self._path)
+                self._reader = self._sock.makefile("rb")
+            self._next_id += 1
+            request = {
+                "jsonrpc": "2.0",
+                "id": self._next_id,
+                "method": method,
+                "params": params,
+            }
+            try:
+                self._sock.sendall(_encode(request))
+                line = self._reader.readline()
+            except OSError as e:
+                self._drop()
+                raise DaemonError(f"lost the daemon: {e}") from e
+
+            if not line:
+                self._drop()
+                raise DaemonError("the daemon closed the connection")
+            try:
+                response = json.loads(line)
+            except ValueError:
+                response = None
+            # anything else means the stream is out of step with the requests
+            if not isinstance(response, dict) or response.get("id") != request["id"]:
+                self._drop()
+                raise DaemonError("the daemon answered out of turn")
+
+        if "error" in response:
+            raise DaemonError(response["error"]["message"])
+        return response.get("result")
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop()
+
+    def _drop(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock, self._reader = None, None
+        # whoever asks next gets a fresh connection, or learns it's gone
+        get_daemon_client.cache_clear()
+
+
+def _open(path: Path) -> socket.socket:
+    if not hasattr(socket, "AF_UNIX"):
+        raise DaemonError("unix sockets are not available on this platform")
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(DaemonClient.TIMEOUT)
+        sock.connect(str(path))
+    except OSError as e:
+        sock.close()
+        raise DaemonError(f"no daemon listening at {path}: {e}") from e
+    return sock
+
+
+async def serve_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    methods: Mapping[str, Method],
+) -> None:
+    """Answer one client's requests in order, a message per line."""
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:  # past the reader's limit; can't find the next one
+                writer.write(_error(None, INVALID_REQUEST, "message too large"))
+                break
+            if not line:
+                break
+            response = await handle_request(line, methods)
+            if response is not None:
+                writer.write(response)
+                await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        with suppress(ConnectionError):
+            await writer.wait_closed()
+
+
+async def handle_request(line: bytes, methods: Mapping[str, Method]) -> bytes | None:
+    """The encoded response to one request, or None for a notification."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return _error(None, PARSE_ERROR, "parse error")
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return _error(None, INVALID_REQUEST, "invalid request")
+
+    request_id = request.get("id")
+    try:
+        method = methods.get(request["method"])
+        if method is None:
+            raise _Fault(METHOD_NOT_FOUND, f"no such method: {request['method']}")
+        result = await _call(method, request.get("params", {}))
+        reply = _encode({"jsonrpc": "2.0", "id": request_id, "result": result})
+    except _Fault as e:
+        reply = _error(request_id, e.code, str(e))
+    except DaemonError as e:
+        reply = _error(request_id, SERVER_ERROR, str(e))
+    except (  # what a bad call can raise; it mustn't take the session down
+        AttributeError,
+        LookupError,
+        OSError,
+        RuntimeError,
+        TypeError,
+        ValueError,
+    ) as e:
+        reply = _error(request_id, SERVER_ERROR, f"{type(e).__name__}: {e}")
+    # notifications go unanswered, even when they fail
+    return reply if "id" in request else None
+
+
+async def _call(method: Method, params: Any) -> Any:
+    if isinstance(params, list):
+        args, kwargs = params, {}
+    elif isinstance(params, dict):
+        args, kwargs = [], params
+    else:
+        raise _Fault(INVALID_PARAMS, "params must be an array or an object")
+
+    try:
+        inspect.signature(method).bind(*args, **kwargs)
+    except TypeError as e:
+        raise _Fault(INVALID_PARAMS, str(e)) from e
+
+    result = method(*args, **kwargs)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def _error(request_id: Any, code: int, message: str) -> bytes:
+    error = {"code": code, "message": message}
+    return _encode({"jsonrpc": "2.0", "id": request_id, "error": error})
+
+
+def _encode(message: dict[str, Any]) -> bytes:
+    # compact json never holds a raw newline, so one line is one message
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
@@ -0,0 +1,52 @@
+import os
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+
+from torrra.core import db
+
+
+class BlobStore:
+    """Binary blobs keyed by info-hash, one file each, next to the database.
+
+    The directory is resolved against `db.DB_DIR` on every call so it always
+    follows the database. Writes land in a temp file that is then renamed
+    over the target, so a crash mid-write leaves the old blob intact rather
+    than a truncated one libtorrent would refuse to load.
+    """
+
+    def __init__(self, name: str, suffix: str) -> None:
+        self.name: str = name
+        self.suffix: str = suffix
+
+    @property
+    def path(self) -> Path:
+        return db.DB_DIR / self.name
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}{self.suffix}"
+
+    def __contains__(self, key: str) -> bool:
+        return self._file(key).is_file()
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._file(key).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._file(key))
+        except BaseException:
+            with suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+    def delete(self, key: str) -> None:
+        with suppress(OSError):
+            self._file(key).unlink()
@@ -1,6 +1,7 @@
 import json
 import sqlite3
 from functools import lru_cache
+from typing import Any, cast
 
 from torrra._types import Torrent, TorrentRecord
 from torrra.core.db import get_db_connection, init_db
@@ -8,13 +9,45 @@ from torrra.core.db import get_db_connection, init_db
 
 @lru_cache
 def get_torrent_manager() -> "TorrentManager":
+    from torrra.core.remote import RemoteTorrentManager
+    from torrra.core.rpc import get_daemon_client
+
+    # a running daemon owns the saved torrents along with the session
+    if (client := get_daemon_client()) is not None:
+        return RemoteTorrentManager(client)
     init_db()
     return TorrentManager()
 
 
 class TorrentManager:
+    """Saved torrents, held in memory and written through to SQLite.
+
+    The table is read once; after that every read is served from the
+    in-memory index and every write updates both. `version` goes up whenever
+    a record changes, so a view can tell it is current with one int compare
+    rather than re-reading the table. This assumes the process shares one
+    manager (`get_torrent_manager`) - another instance would not see its
+    writes.
+    """
+
     def __init__(self) -> None:
         init_db()
+        self._records: dict[str, TorrentRecord] = self._load()
+        self._version: int = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @staticmethod
+    def _load() -> dict[str, TorrentRecord]:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM torrents")
+            return {row["magnet_uri"]: _to_record(row) for row in cursor.fetchall()}
+
+    def _changed(self) -> None:
+        self._version += 1
 
     def add_torrent(
         self, torrent: Torrent, file_priorities: list[int] | None = None
@@ -45,12 +78,32 @@ class TorrentManager:
                 )
             conn.commit()
 
+        record = self._records.get(torrent.magnet_uri)
+        if record is None:
+            self._records[torrent.magnet_uri] = TorrentRecord(
+                magnet_uri=torrent.magnet_uri,
+                title=torrent.title,
+                size=torrent.size,
+                source=torrent.source,
+                is_paused=False,
+                is_notified=False,
+                file_priorities=list(prios) if prios is not None else None,
+            )
+        elif prios is not None:
+            record["file_priorities"] = list(prios)
+        else:
+            return
+        self._changed()
+
     def remove_torrent(self, magnet_uri: str) -> None:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM torrents WHERE magnet_uri = ?", (magnet_uri,))
             conn.commit()
 
+        if self._records.pop(magnet_uri, None) is not None:
+            self._changed()
+
     def update_torrent_paused_state(self, magnet_uri: str, is_paused: bool) -> None:
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -60,6 +113,8 @@ class TorrentManager:
             )
             conn.commit()
 
+        self._update(magnet_uri, is_paused=is_paused)
+
     def update_torrent_is_notified(self, magnet_uri: str) -> None:
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -69,6 +124,8 @@ class TorrentManager:
             )
             conn.commit()
 
+        self._update(magnet_uri, is_notified=True)
+
     def update_torrent_metadata(self, magnet_uri: str, title: str, size: int) -> None:
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -78,6 +135,8 @@ class TorrentManager:
             )
             conn.commit()
 
+        self._update(magnet_uri, title=title, size=size)
+
     def update_torrent_file_priorities(
         self, magnet_uri: str, file_priorities: list[int] | None
     ) -> None:
@@ -92,46 +151,46 @@ class TorrentManager:
             )
             conn.commit()
 
+        self._update(
+            magnet_uri,
+            file_priorities=(
+                list(file_priorities) if file_priorities is not None else None
+            ),
+        )
+
+    def _update(self, magnet_uri: str, **fields: Any) -> None:
+        record = self._records.get(magnet_uri)
+        if record is None:
+            return
+        if any(record.get(k) != v for k, v in fields.items()):
+            record.update(cast(TorrentRecord, fields))
+            self._changed()
+
+    # reads hand out copies, so a caller editing its record can't quietly
+    # diverge the index from what is on disk
     def get_torrent(self, magnet_uri: str) -> TorrentRecord | None:
-        with get_db_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM torrents WHERE magnet_uri = ?", (magnet_uri,))
-            row = cursor.fetchone()
-            if not row:
-                return None
-            prio_raw = dict(row).get("file_priorities")
-            file_priorities = json.loads(prio_raw) if prio_raw else None
-            return TorrentRecord(
-                magnet_uri=row["magnet_uri"],
-                title=row["title"],
-                size=row["size"],
-                source=row["source"],
-                is_paused=bool(row["is_paused"]),
-                is_notified=bool(row["is_notified"]),
-                file_priorities=file_priorities,
-            )
+        record = self._records.get(magnet_uri)
+        return _copy(record) if record is not None else None
 
     def get_all_torrents(self) -> list[TorrentRecord]:
-        with get_db_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM torrents")
-            rows = cursor.fetchall()
-
-            result = []
-            for row in rows:
-                prio_raw = dict(row).get("file_priorities")
-                file_priorities = json.loads(prio_raw) if prio_raw else None
-                result.append(
-                    TorrentRecord(
-                        magnet_uri=row["magnet_uri"],
-                        title=row["title"],
-                        size=row["size"],
-                        source=row["source"],
-                        is_paused=bool(row["is_paused"]),
-                        is_notified=bool(row["is_notified"]),
-                        file_priorities=file_priorities,
-                    )
-                )
-            return result
+        return [_copy(r) for r in self._records.values()]
+
+
+def _to_record(row: sqlite3.Row) -> TorrentRecord:
+    prio_raw = row["file_priorities"]
+    return TorrentRecord(
+        magnet_uri=row["magnet_uri"],
+        title=row["title"],
+        size=row["size"],
+        source=row["source"],
+        is_paused=bool(row["is_paused"]),
+        is_notified=bool(row["is_notified"]),
+        file_priorities=json.loads(prio_raw) if prio_raw else None,
+    )
+
+
+def _copy(record: TorrentRecord) -> TorrentRecord:
+    copy = TorrentRecord(**record)
+    if (prios := record.get("file_priorities")) is not None:
+        copy["file_priorities"] = list(prios)
+    return copy
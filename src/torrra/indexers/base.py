@@ -1,11 +1,27 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import AsyncIterator
+from importlib.util import find_spec
+from typing import Any, ClassVar, cast
 
-from torrra._types import Torrent
-from torrra.core.constants import DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT
+import httpx
+
+from torrra._types import Torrent, TorrentDict
+from torrra.core.cache import SEARCH, Cache, get_cache
+from torrra.core.codec import decode_results, encode_results
+from torrra.core.constants import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_TIMEOUT,
+)
+from torrra.utils.json_stream import iter_json_array
 
 
 class BaseIndexer(ABC):
+    # namespaces this indexer's entries in the search cache
+    CACHE_PREFIX: ClassVar[str]
+
     def __init__(
         self,
         url: str,
@@ -17,6 +33,33 @@ class BaseIndexer(ABC):
         self.api_key: str = api_key
         self.timeout: int = timeout
         self.max_retries: int = max_retries
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Long-lived client shared by every request this indexer makes.
+
+        Built on first use so it binds to the event loop that actually runs
+        the searches, then kept so each search reuses a warm keep-alive
+        connection instead of paying a fresh TCP/TLS handshake. HTTP/2 is
+        negotiated only when the optional `h2` package is installed.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=DEFAULT_MAX_CONNECTIONS,
+                    max_keepalive_connections=DEFAULT_MAX_CONNECTIONS,
+                    keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+                ),
+                http2=find_spec("h2") is not None,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     @abstractmethod
     def get_search_url(self) -> str:
@@ -30,6 +73,44 @@ class BaseIndexer(ABC):
     async def search(self, query: str, use_cache: bool = True) -> list[Torrent] | None:
         raise NotImplementedError()
 
+    @abstractmethod
+    def search_stream(
+        self, query: str, use_cache: bool = True, refresh: bool = False
+    ) -> AsyncIterator[list[Torrent]]:
+        """Like `search`, but yields results in batches as they are parsed.
+
+        Only fresh cache entries are served; `refresh` skips the cache read
+        altogether, while still storing what comes back.
+        """
+        raise NotImplementedError()
+
+    def cache_key(self, query: str) -> str:
+        return Cache.make_key(SEARCH, self.CACHE_PREFIX, query)
+
+    def cache_results(self, query: str, torrents: list[Torrent]) -> None:
+        data: bytes | list[dict[str, Any]]
+        try:
+            data = encode_results(torrents)
+        except (TypeError, ValueError):  # values the columns can't hold
+            data = [t.to_dict() for t in torrents]
+        get_cache().set(self.cache_key(query), data)
+
+    def cached_results(self, query: str) -> tuple[list[Torrent], bool] | None:
+        """Cached results for `query` and whether they are stale, or None."""
+        hit = get_cache().lookup(self.cache_key(query))
+        if hit is None:
+            return None
+
+        raw_data, stale = hit
+        if not isinstance(raw_data, bytes):
+            return [
+                Torrent.from_dict(d) for d in cast(list[TorrentDict], raw_data)
+            ], stale
+        try:
+            return decode_results(raw_data), stale
+        except ValueError:  # from an older layout; as good as a miss
+            return None
+
     @abstractmethod
     async def healthcheck(self) -> bool:
         raise NotImplementedError()
@@ -37,3 +118,29 @@ class BaseIndexer(ABC):
     @abstractmethod
     def _normalize_result(self, r: dict[str, Any]) -> Torrent:
         raise NotImplementedError()
+
+    async def _stream_results(
+        self, url: str, params: dict[str, str], results_key: str | None = None
+    ) -> AsyncIterator[list[Torrent]]:
+        """Normalize a JSON result array straight off the response body.
+
+        Nothing waits for the full download, so the first results are usable
+        while the rest is still arriving, and memory stays bounded however
+        large the response. A timeout is retried with exponential backoff, but
+        only until the first batch is out - a retry after that would repeat
+        results the caller already has.
+        """
+        for i in range(self.max_retries):
+            yielded = False
+            try:
+                async with self.client.stream("GET", url, params=params) as resp:
+                    resp.raise_for_status()
+                    async for batch in iter_json_array(resp.aiter_text(), results_key):
+                        yielded = True
+                        yield [self._normalize_result(r) for r in batch]
+                return
+            except httpx.TimeoutException:
+                if not yielded and i < self.max_retries - 1:
+                    await asyncio.sleep(0.5 * 2**i)  # exponential backoff
+                else:  # raise error on final attempt
+                    raise
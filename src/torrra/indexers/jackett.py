@@ -1,16 +1,17 @@
-import asyncio
-from typing import Any, cast
+from collections.abc import AsyncIterator
+from typing import Any, ClassVar
 
 import httpx
 from typing_extensions import override
 
-from torrra._types import Torrent, TorrentDict
-from torrra.core.cache import cache
+from torrra._types import Torrent
 from torrra.core.exceptions import IndexerError
 from torrra.indexers.base import BaseIndexer
 
 
 class JackettIndexer(BaseIndexer):
+    CACHE_PREFIX: ClassVar[str] = "jackett"
+
     @override
     def get_search_url(self) -> str:
         return f"{self.url}/api/v2.0/indexers/all/results"
@@ -21,64 +22,61 @@ class JackettIndexer(BaseIndexer):
 
     @override
     async def search(self, query: str, use_cache: bool = True) -> list[Torrent] | None:
-        key = cache.make_key("jackett", query)
+        stream = self.search_stream(query, use_cache)
+        return [t async for batch in stream for t in batch]
 
-        if use_cache and key in cache:
-            raw_data = cast(list[TorrentDict], cache.get(key))
-            return [Torrent.from_dict(d) for d in raw_data]
+    @override
+    async def search_stream(
+        self, query: str, use_cache: bool = True, refresh: bool = False
+    ) -> AsyncIterator[list[Torrent]]:
+        if use_cache and not refresh:
+            hit = self.cached_results(query)
+            if hit is not None and not hit[1]:  # only fresh entries short-cut
+                yield hit[0]
+                return
 
         url = self.get_search_url()
         params = {"apikey": self.api_key, "query": query}
 
-        for i in range(self.max_retries):
-            try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    resp = await client.get(url, params=params)
-                    resp.raise_for_status()
-
-                torrents = [self._normalize_result(r) for r in resp.json()["Results"]]
-                if use_cache and torrents:
-                    cache.set(key, [t.to_dict() for t in torrents])
+        torrents: list[Torrent] = []
+        async for batch in self._stream_results(url, params, results_key="Results"):
+            torrents.extend(batch)
+            yield batch
 
-                return torrents
-            except httpx.TimeoutException:
-                if i < self.max_retries - 1:
-                    await asyncio.sleep(0.5 * 2**i)  # exponential backoff
-                else:  # raise error on final attempt
-                    raise
+        if use_cache and torrents:
+            self.cache_results(query, torrents)
 
     @override
     async def healthcheck(self) -> bool:
         url = self.get_healthcheck_url()
         params = {"apikey": self.api_key}
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                resp = await client.get(url, params=params)
-                resp.raise_for_status()
-                return True
+        try:
+            resp = await self.client.get(url, params=params)
+            resp.raise_for_status()
+            return True
+
+        except httpx.RequestError:
+            raise IndexerError(
+                "could not connect to jackett server\n"
+                + "please make sure jackett server is running and the url is correct"
+            )
 
-            except httpx.RequestError:
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code
+
+            if status_code == 401:
                 raise IndexerError(
-                    "could not connect to jackett server\n"
-                    + "please make sure jackett server is running and the url is correct"
+                    "invalid jackett server api key\n"
+                    + "double-check the api key you provided"
+                )
+            elif status_code == 500 and "nonexistent_indexer" in e.response.text:
+                return True
+            else:
+                raise IndexerError(
+                    f"jackett server returned http {status_code}\n"
+                    + "unexpected response from jackett server. please verify your setup"
                 )
-
-            except httpx.HTTPStatusError as e:
-                status_code = e.response.status_code
-
-                if status_code == 401:
-                    raise IndexerError(
-                        "invalid jackett server api key\n"
-                        + "double-check the api key you provided"
-                    )
-                elif status_code == 500 and "nonexistent_indexer" in e.response.text:
-                    return True
-                else:
-                    raise IndexerError(
-                        f"jackett server returned http {status_code}\n"
-                        + "unexpected response from jackett server. please verify your setup"
-                    )
 
     @override
     def _normalize_result(self, r: dict[str, Any]) -> Torrent:
@@ -333,37 +333,30 @@ class FileSelectionScreen(ModalScreen[list[int] | None]):
             return
 
         dm = get_download_manager()
-        handle = dm.torrents.get(self.torrent.magnet_uri)
-        if handle and handle.is_valid() and handle.status().has_metadata:
-            try:
-                info = handle.torrent_file()
-                if info:
-                    self._populate_files(info)
-                    return
-            except (AttributeError, RuntimeError):
-                pass
+        info = dm.get_torrent_info(self.torrent.magnet_uri)
+        if info is not None:
+            self._populate_files(info)
+            return
 
         # Metadata not available yet, start fetching in background
         dm.add_torrent(self.torrent.magnet_uri, is_paused=True)
         self._poll_timer = self.set_interval(0.3, self._poll_metadata)
+        # metadata saved from an earlier fetch is there straight away
+        self._poll_metadata()
 
     def _poll_metadata(self) -> None:
         dm = get_download_manager()
-        handle = dm.torrents.get(self.torrent.magnet_uri)
-        if handle and handle.is_valid():
-            status = handle.status()
-            if status.has_metadata:
-                try:
-                    info = handle.torrent_file()
-                    if info:
-                        if self._poll_timer:
-                            self._poll_timer.stop()
-                        self._populate_files(info)
-                        return
-                except (AttributeError, RuntimeError):
-                    pass
+        info = dm.get_torrent_info(self.torrent.magnet_uri)
+        if info is not None:
+            if self._poll_timer:
+                self._poll_timer.stop()
+            self._populate_files(info)
+            return
+
+        status = dm.get_torrent_status(self.torrent.magnet_uri)
+        if status is not None:
             self._loading_status_label.update(
-                f"Fetching torrent metadata...\n[dim](peers: {status.num_peers})[/dim]"
+                f"Fetching torrent metadata...\n[dim](peers: {status.get('peers', 0)})[/dim]"
             )
 
     def _populate_files(self, info: lt.torrent_info) -> None:
@@ -1,12 +1,18 @@
+from typing import ClassVar
+
 from textual.app import ComposeResult
 from textual.containers import Horizontal
 from textual.screen import Screen
+from textual.timer import Timer
 from textual.widgets import ContentSwitcher
 from typing_extensions import override
 
-from torrra._types import Indexer, TorrentStatus
+from torrra._types import Indexer, TorrentState
+from torrra.core.config import get_config
 from torrra.core.download import get_download_manager
+from torrra.core.exceptions import DaemonError
 from torrra.core.torrent import get_torrent_manager
+from torrra.utils.healthcheck import IndexerHealthcheck
 from torrra.widgets.downloads import DownloadsContent
 from torrra.widgets.search import SearchContent
 from torrra.widgets.sidebar import DOWNLOADS_GROUP, Sidebar
@@ -14,6 +20,19 @@ from torrra.widgets.status_bar import StatusBar
 
 
 class HomeScreen(Screen[None]):
+    # seconds between downloads refreshes, picked again after every tick
+    FAST_TICK: ClassVar[float] = 1.0  # transferring, downloads table showing
+    # transferring with only the sidebar counts showing, or idle with the table
+    # showing, so a torrent that starts up shows in it within seconds
+    SLOW_TICK: ClassVar[float] = 5.0
+    IDLE_TICK: ClassVar[float] = 30.0  # everything paused, complete or failed
+
+    # states busy even between bursts of data; seeding and stalled torrents
+    # count only while the session's rates show them moving any
+    ACTIVE_STATES: ClassVar[frozenset[TorrentState]] = frozenset(
+        {TorrentState.DOWNLOADING, TorrentState.FETCHING, TorrentState.CHECKING}
+    )
+
     def __init__(
         self,
         indexer: Indexer | None,
@@ -21,9 +40,13 @@ class HomeScreen(Screen[None]):
         use_cache: bool,
         direct_download: str | None = None,
         show_downloads: bool = False,
+        indexers: list[Indexer] | None = None,
+        healthcheck: IndexerHealthcheck | None = None,
     ):
         super().__init__()
         self.indexer: Indexer | None = indexer
+        self.indexers: list[Indexer] | None = indexers
+        self.healthcheck: IndexerHealthcheck | None = healthcheck
         self.search_query: str = search_query
         self.use_cache: bool = use_cache
         self.direct_download: str | None = direct_download
@@ -33,6 +56,16 @@ class HomeScreen(Screen[None]):
         self._content_switcher: ContentSwitcher
         self._downloads_content: DownloadsContent
         self._status_bar: StatusBar
+        # torrents changed since the downloads table last saw an update
+        self._pending_changes: set[str] = set()
+        self._tick_timer: Timer | None = None
+        # a tick waits on the daemon off the loop; one asked for meanwhile
+        # runs once it's done rather than alongside it
+        self._ticking: bool = False
+        self._tick_again: bool = False
+        self._transferring: bool = True  # until the first tick says otherwise
+        # the refresh rate is a debugging aid, kept off the status bar otherwise
+        self._show_tick: bool = get_config().get("general.debug", False)
 
     @override
     def compose(self) -> ComposeResult:
@@ -53,6 +86,8 @@ class HomeScreen(Screen[None]):
                         indexer=self.indexer,
                         search_query=self.search_query,
                         use_cache=self.use_cache,
+                        indexers=self.indexers,
+                        healthcheck=self.healthcheck,
                     )
         yield StatusBar(id="status_bar")
 
@@ -65,14 +100,7 @@ class HomeScreen(Screen[None]):
         self._status_bar = self.query_one(StatusBar)
 
         # start torrents in background
-        tm, dm = get_torrent_manager(), get_download_manager()
-        torrents = tm.get_all_torrents()
-        for torrent in torrents:
-            dm.add_torrent(
-                torrent["magnet_uri"],
-                is_paused=torrent["is_paused"],
-                file_priorities=torrent.get("file_priorities"),
-            )
+        get_download_manager().start_torrents(get_torrent_manager().get_all_torrents())
 
         if self.show_downloads or self.direct_download or self.indexer is None:
             # When showing downloads or handling direct download, set sidebar active node to downloads
@@ -87,14 +115,18 @@ class HomeScreen(Screen[None]):
 
             asyncio.create_task(handle_direct_download(self, str(self.direct_download)))
 
-        # start timer to update data on both sidebar
-        # and downloads content table
-        self.set_interval(1, self._update_downloads_data)
+        # refresh the sidebar and downloads table, as often as activity needs
+        self._schedule_tick(self.FAST_TICK)
+
+    def on_unmount(self) -> None:
+        # keep what was downloaded so the next start needn't recheck it
+        get_download_manager().save_all_resume_data()
 
     def on_sidebar_item_selected(self, event: Sidebar.ItemSelected) -> None:
         self.query_one(ContentSwitcher).current = event.group_id
         if event.group_id == "downloads_content":
             self._downloads_content.set_group_filter(event.group_type)
+        self.refresh_downloads_now()
 
     def on_search_content_download_requested(self) -> None:
         self.query_one(ContentSwitcher).current = "downloads_content"
@@ -102,51 +134,81 @@ class HomeScreen(Screen[None]):
         self._downloads_content.set_group_filter(None)
 
         self._downloads_content.focus_table()
+        self.refresh_downloads_now()
+
+    def on_downloads_content_torrent_toggled(self) -> None:
+        self.refresh_downloads_now()
+
+    def refresh_downloads_now(self) -> None:
+        """Tick straight away rather than wait out a slow or idle interval."""
+        if self._tick_timer is not None:
+            self._tick_timer.stop()
+            self._tick_timer = None
+        if self._ticking:
+            self._tick_again = True
+            return
+        self.call_later(self._tick)
+
+    async def _tick(self) -> None:
+        self._ticking = True
+        try:
+            await self._update_downloads_data()
+        except DaemonError as e:
+            # the session went with the daemon; stop asking it every tick
+            self._tick_timer = None
+            self.notify(
+                f"{e}. Restart torrra to reconnect.",
+                title="Daemon Unreachable",
+                severity="error",
+            )
+            return
+        finally:
+            self._ticking = False
+        if self._tick_again:
+            self._tick_again = False
+            self.call_later(self._tick)
+            return
+        self._schedule_tick(self._next_tick_interval())
+
+    def _schedule_tick(self, delay: float) -> None:
+        if self._tick_timer is not None:
+            self._tick_timer.stop()
+        self._tick_timer = self.set_timer(delay, self._tick)
+        if self._show_tick:
+            self._status_bar.update_tick(delay)
+
+    def _next_tick_interval(self) -> float:
+        if self._content_switcher.current == "downloads_content":
+            return self.FAST_TICK if self._transferring else self.SLOW_TICK
+        return self.SLOW_TICK if self._transferring else self.IDLE_TICK
 
-    def _update_downloads_data(self) -> None:
+    async def _update_downloads_data(self) -> None:
         dm = get_download_manager()
-
-        # Check for metadata updates
-        dm.check_metadata_updates()
+        stats, changed = await dm.refresh()
 
         # Update status bar stats
-        stats = dm.get_session_stats()
         self._status_bar.update_stats(
             stats.get("download_rate", 0.0),
             stats.get("upload_rate", 0.0),
             stats.get("dht_nodes", 0),
         )
 
-        magnet_uris = list(dm.torrents.keys())
+        self._pending_changes.update(changed)
+        statuses = dm.statuses
 
         counts = {group: 0 for group in DOWNLOADS_GROUP}
-        statuses: dict[str, TorrentStatus | None] = {}
-
-        for uri in magnet_uris:
-            status = dm.get_torrent_status(uri)
-            statuses[uri] = status
-            if not status:
-                continue
-
-            state_text = dm.get_torrent_state_text(status)
-            if state_text in ("Downloading", "Fetching", "Allocating"):
-                counts["Downloading"] += 1
-            elif state_text == "Stalled":
-                counts["Stalled"] += 1
-            elif state_text == "Seeding":
-                counts["Seeding"] += 1
-            elif state_text in ("Paused", "Queued"):
-                counts["Paused"] += 1
-            elif state_text == "Completed":
-                counts["Completed"] += 1
-            elif state_text == "Checking":
-                counts["Checking"] += 1
-            elif state_text in ("Missing Files", "Error"):
-                counts["Error"] += 1
-            elif state_text in counts:
-                counts[state_text] += 1
+        transferring = bool(
+            stats.get("download_rate", 0.0) or stats.get("upload_rate", 0.0)
+        )
+        for status in statuses.values():
+            state = dm.get_torrent_state(status)
+            if state.group is not None:
+                counts[state.group] += 1
+            transferring = transferring or state in self.ACTIVE_STATES
+        self._transferring = transferring
 
         self._sidebar.update_download_counts(counts)
         # only update downloads table if it is visible
         if self._content_switcher.current == "downloads_content":
-            self._downloads_content.update_table_data(statuses)
+            self._downloads_content.update_table_data(statuses, self._pending_changes)
+            self._pending_changes = set()
@@ -54,7 +54,7 @@ class ThemeSelectorScreen(ModalScreen[None]):
     def on_list_view_selected(self) -> None:
         self._cancel_update_worker()
         if self.app.theme != self.original_theme:
-            get_config().set("general.theme", self.app.theme)
+            get_config().set("general.theme", self.app.theme, debounce=True)
         self.app.pop_screen()
 
     def action_close_screen(self) -> None:
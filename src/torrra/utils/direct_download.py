@@ -1,4 +1,3 @@
-import urllib.parse
 from typing import TYPE_CHECKING
 
 from textual.widgets import ContentSwitcher
@@ -8,6 +7,7 @@ from torrra.core.download import get_download_manager
 from torrra.core.torrent import get_torrent_manager
 from torrra.screens.file_selection import FileSelectionScreen
 from torrra.utils.magnet import resolve_torrent
+from torrra.utils.magnet_uri import display_name
 from torrra.widgets.sidebar import Sidebar
 
 if TYPE_CHECKING:
@@ -17,7 +17,9 @@ if TYPE_CHECKING:
 async def handle_direct_download(home_screen: "HomeScreen", input_path: str) -> None:
     dm, tm = get_download_manager(), get_torrent_manager()
 
-    magnet_uri, torrent_info = await resolve_torrent(input_path)
+    magnet_uri, torrent_info = await resolve_torrent(
+        input_path, use_cache=home_screen.use_cache
+    )
     if not magnet_uri:
         home_screen.app.notify(
             "Failed to resolve torrent or magnet URI", severity="error"
@@ -29,12 +31,8 @@ async def handle_direct_download(home_screen: "HomeScreen", input_path: str) ->
     if torrent_info is not None:
         title = torrent_info.name()
         size = torrent_info.total_size()
-    elif magnet_uri.startswith("magnet:"):
-        dn_list = urllib.parse.parse_qs(urllib.parse.urlsplit(magnet_uri).query).get(
-            "dn"
-        )
-        if dn_list and dn_list[0]:
-            title = dn_list[0]
+    elif name := display_name(magnet_uri):
+        title = name
 
     torrent_record = Torrent(
         magnet_uri=magnet_uri,
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from torrra._types import Indexer
+from torrra.core.cache import HEALTHCHECK, Cache, get_cache
+from torrra.core.config import get_config
+from torrra.core.constants import DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT
+from torrra.core.exceptions import IndexerError
+from torrra.utils.helpers import lazy_import
+
+
+def indexer_cls_path(name: str) -> str:
+    return f"torrra.indexers.{name}.{name.title()}Indexer"
+
+
+class IndexerHealthcheck:
+    """Indexer probes started ahead of the app and awaited inside its loop.
+
+    The probes run on a thread with their own event loop, so the network
+    round trips overlap with importing textual and painting the first screen
+    instead of preceding both. Anything that needs a working indexer awaits
+    `wait()`, which resolves once and then answers immediately. A pass is
+    cached for a while, so relaunching against the same server skips it.
+    """
+
+    def __init__(
+        self, indexers: list[Indexer], remember: bool = False, use_cache: bool = True
+    ) -> None:
+        self.indexers: list[Indexer] = indexers
+        # store the url/api key of indexers that pass, e.g. given on the cli
+        self.remember: bool = remember
+        self.healthy: list[Indexer] = []
+        # indexer name -> why it failed
+        self.failures: dict[str, str] = {}
+
+        # read here: the config is not shared across threads
+        config = get_config()
+        self._timeout: int = config.get("general.timeout", DEFAULT_TIMEOUT)
+        self._max_retries: int = config.get("general.max_retries", DEFAULT_MAX_RETRIES)
+        self._cache: Cache | None = get_cache() if use_cache else None
+        self._future: Future[list[str | None]] = Future()
+        self._resolved: bool = False
+
+    def start(self) -> "IndexerHealthcheck":
+        # a running future can't be cancelled, so a superseded waiter can't
+        # take the result away from the others
+        self._future.set_running_or_notify_cancel()
+        threading.Thread(target=self._run, name="healthcheck", daemon=True).start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        return self._resolved
+
+    async def wait(self) -> list[Indexer]:
+        """Wait for the probes and return the indexers that passed."""
+        errors = await asyncio.wrap_future(self._future)
+        if not self._resolved:
+            self._resolved = True
+            for indexer, error in zip(self.indexers, errors):
+                if error is None:
+                    self.healthy.append(indexer)
+                else:
+                    self.failures[indexer.name] = error
+
+            if self.remember:
+                values: dict[str, str] = {}
+                for indexer in self.healthy:
+                    values[f"indexers.{indexer.name}.url"] = indexer.url
+                    values[f"indexers.{indexer.name}.api_key"] = indexer.api_key
+                # one write, skipped on relaunch when nothing changed
+                get_config().update(values, debounce=True)
+        return self.healthy
+
+    def _run(self) -> None:
+        errors: list[str | None] = ["healthcheck did not finish"] * len(self.indexers)
+        try:
+            errors = asyncio.run(self._probe_all())
+        finally:  # never leave the app waiting forever
+            self._future.set_result(errors)
+
+    async def _probe_all(self) -> list[str | None]:
+        return await asyncio.gather(*(self._probe(i) for i in self.indexers))
+
+    async def _probe(self, indexer: Indexer) -> str | None:
+        # the error message, or None if the indexer is usable
+        key = Cache.make_key(HEALTHCHECK, indexer.name, indexer.url, indexer.api_key)
+        if self._cache is not None:
+            hit = self._cache.lookup(key)
+            if hit is not None and not hit[1]:
+                return None
+
+        try:
+            indexer_cls = lazy_import(indexer_cls_path(indexer.name))
+        except ImportError as e:
+            return str(e)
+
+        import httpx  # loaded along with the indexer module anyway
+
+        instance = indexer_cls(
+            indexer.url,
+            indexer.api_key,
+            timeout=self._timeout,
+            max_retries=self._max_retries,
+        )
+        try:
+            if await instance.healthcheck():
+                if self._cache is not None:
+                    self._cache.set(key, True)
+                return None
+            return f"{indexer.name} server did not pass the healthcheck"
+        except (IndexerError, httpx.HTTPError) as e:
+            return str(e)
+        finally:  # the pooled client is bound to this short-lived loop
+            await instance.aclose()
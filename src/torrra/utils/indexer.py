@@ -1,20 +1,34 @@
-import asyncio
-from typing import cast
+from typing import cast, get_args
 
 import click
 
 from torrra._types import Indexer, IndexerName
 from torrra.core.config import get_config
-from torrra.core.constants import DEFAULT_MAX_RETRIES, DEFAULT_TIMEOUT
-from torrra.core.exceptions import ConfigError, IndexerError
-from torrra.indexers.base import BaseIndexer
-from torrra.utils.helpers import lazy_import
+from torrra.core.exceptions import ConfigError
+from torrra.utils.healthcheck import IndexerHealthcheck
+
+
+def _use_cache(no_cache: bool) -> bool:
+    # the --no-cache flag overrides config
+    return not no_cache and get_config().get("general.use_cache", True)
+
+
+def configured_indexers() -> list[Indexer]:
+    """Every indexer given both a url and an api_key in the config."""
+    config = get_config()
+
+    configured: list[Indexer] = []
+    for name in get_args(IndexerName):
+        url = config.get(f"indexers.{name}.url", None)
+        api_key = config.get(f"indexers.{name}.api_key", None)
+        if url and api_key:
+            configured.append(Indexer(name, url, api_key))
+    return configured
 
 
 def run_with_indexer(
     *,
     name: IndexerName,
-    indexer_cls_str: str,
     url: str | None,
     api_key: str | None,
     no_cache: bool,
@@ -49,48 +63,27 @@ def run_with_indexer(
 
     click.secho(f"connecting to {name} server at {url}", fg="cyan")
 
-    # import indexers only when needed
-    indexer_cls = lazy_import(indexer_cls_str)
-
     # type narrowing for pyright
     assert url is not None and api_key is not None
 
-    # async indexer validation
-    async def healthcheck_indexer():
-        try:
-            assert issubclass(indexer_cls, BaseIndexer)
-            timeout = config.get("general.timeout", DEFAULT_TIMEOUT)
-            max_retries = config.get("general.max_retries", DEFAULT_MAX_RETRIES)
-            return await indexer_cls(
-                url, api_key, timeout=timeout, max_retries=max_retries
-            ).healthcheck()
-        except IndexerError as e:
-            click.secho(str(e), fg="red", err=True)
-            return False
-
-    if not asyncio.run(healthcheck_indexer()):
-        return
-
-    # update/store indexers configuration
-    config.set(f"indexers.{name}.url", url)
-    config.set(f"indexers.{name}.api_key", api_key)
+    # probe in the background; the app gates searches on the result, and
+    # stores the url/api key once they pass
+    indexer = Indexer(name, url, api_key)
+    use_cache = _use_cache(no_cache)
+    healthcheck = IndexerHealthcheck([indexer], remember=True, use_cache=use_cache)
+    healthcheck.start()
 
-    # load app only when needed (heavy stuff)
+    # load app only when needed (heavy stuff), overlapping the probe
     from torrra.app import TorrraApp
 
     try:
-        # determine cache settings with CLI override
-        use_cache = config.get("general.use_cache", True)
-        if no_cache:  # --no-cache flag overrides config
-            use_cache = False
-
-        indexer = Indexer(name, url, api_key)
         app = TorrraApp(
             indexer,
             use_cache=use_cache,
             search_query=search_query,
             direct_download=direct_download,
             show_downloads=show_downloads,
+            healthcheck=healthcheck,
         )
         app.run()
     except RuntimeError as e:
@@ -110,19 +103,13 @@ def run_without_indexer(
     configured or health-checked; the app opens straight to the downloads
     view with search disabled.
     """
-    config = get_config()
-
     # load app only when needed (heavy stuff)
     from torrra.app import TorrraApp
 
     try:
-        use_cache = config.get("general.use_cache", True)
-        if no_cache:  # --no-cache flag overrides config
-            use_cache = False
-
         app = TorrraApp(
             indexer=None,
-            use_cache=use_cache,
+            use_cache=_use_cache(no_cache),
             search_query=None,
             direct_download=direct_download,
             show_downloads=show_downloads,
@@ -150,6 +137,16 @@ def run_with_default_indexer(
                 "https://torrra.readthedocs.io/en/latest/configuration.html"
             )
 
+        # "all" names no indexer of its own, so has no url or api key
+        if default_indexer == "all":
+            run_with_all_indexers(
+                no_cache=no_cache,
+                search_query=search_query,
+                direct_download=direct_download,
+                show_downloads=show_downloads,
+            )
+            return
+
         try:
             url = config.get(f"indexers.{default_indexer}.url")
             api_key = config.get(f"indexers.{default_indexer}.api_key")
@@ -163,7 +160,6 @@ def run_with_default_indexer(
 
         run_with_indexer(
             name=cast(IndexerName, default_indexer),
-            indexer_cls_str=f"torrra.indexers.{default_indexer}.{default_indexer.title()}Indexer",
             url=url,
             api_key=api_key,
             no_cache=no_cache,
@@ -175,3 +171,53 @@ def run_with_default_indexer(
         # the specific error message for default indexer is now raised within the try block
         # so, we just print the error message from the exception
         click.secho(str(e), fg="red", err=True)
+
+
+def run_with_all_indexers(
+    *,
+    no_cache: bool,
+    search_query: str | None = None,
+    direct_download: str | None = None,
+    show_downloads: bool = False,
+) -> None:
+    """Launch the app searching every configured indexer at once.
+
+    Selected with `indexers.default = "all"`. Each indexer with both a url and
+    an api_key is health-checked concurrently while the app starts; the ones
+    that fail are skipped with a notification, and searching is unavailable
+    only if none pass.
+    """
+    configured = configured_indexers()
+    if not configured:
+        click.secho(
+            "No indexers are configured. Please set at least one in your configuration file.\n"
+            "For more details, see the documentation: "
+            "https://torrra.readthedocs.io/en/latest/configuration.html",
+            fg="red",
+            err=True,
+        )
+        return
+
+    click.secho(
+        f"connecting to {', '.join(i.name for i in configured)} servers", fg="cyan"
+    )
+
+    use_cache = _use_cache(no_cache)
+    healthcheck = IndexerHealthcheck(configured, use_cache=use_cache).start()
+
+    # load app only when needed (heavy stuff), overlapping the probes
+    from torrra.app import TorrraApp
+
+    try:
+        app = TorrraApp(
+            configured[0],
+            use_cache=use_cache,
+            search_query=search_query,
+            direct_download=direct_download,
+            show_downloads=show_downloads,
+            indexers=configured,
+            healthcheck=healthcheck,
+        )
+        app.run()
+    except RuntimeError as e:
+        click.secho(str(e), fg="red", err=True)
@@ -0,0 +1,238 @@
+import json
+import re
+from collections.abc import AsyncIterator
+from enum import Enum, auto
+from typing import Any
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+# what a container's end is found by, outside and inside its strings
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+# what a value cut off mid-token can still turn out to be
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+_PARTIAL_NUMBER = re.compile(r"-?\d*(?:\.\d*)?(?:[eE][+-]?\d*)?")
+_PARTIAL_ESCAPE = re.compile(r"u[0-9a-fA-F]{0,4}(?:\\(?:u[0-9a-fA-F]{0,4})?)?")
+
+
+class _State(Enum):
+    START = auto()
+    OBJ_KEY = auto()
+    OBJ_COLON = auto()
+    OBJ_VALUE = auto()
+    OBJ_SEP = auto()
+    ARR_ITEM = auto()
+    ARR_SEP = auto()
+    DONE = auto()
+
+
+def _skip_ws(buf: str, pos: int) -> int:
+    while pos < len(buf) and buf[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+class _Pending:
+    """How far a container value cut off at the end of the buffer was scanned.
+
+    Scanning picks up where the last chunk left off, so a large item costs one
+    pass to find its end and one `raw_decode` once it is complete, rather than
+    a decode attempt from its start on every chunk.
+    """
+
+    def __init__(self) -> None:
+        self.offset: int = 0  # chars scanned, from the value's start
+        self.depth: int = 0
+        self.in_string: bool = False
+        # length last checked for malformed text; rechecked once it doubles
+        self.checked: int = 0
+
+    def find_end(self, buf: str, start: int) -> int | None:
+        """The index just past the container at `start`, or None if cut off."""
+        pos = start + self.offset
+        if self.depth == 0 and self.offset:
+            return pos  # found already, waiting on what follows it
+        while True:
+            pattern = _STRING_SPECIAL if self.in_string else _STRUCTURAL
+            match = pattern.search(buf, pos)
+            if match is None:
+                self.offset = len(buf) - start
+                return None
+            char, pos = match.group(), match.end()
+            if char == "\\":
+                if pos >= len(buf):  # the escaped char is in the next chunk
+                    self.offset = pos - 1 - start
+                    return None
+                pos += 1
+            elif char == '"':
+                self.in_string = not self.in_string
+            elif char in "{[":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.offset = pos - start
+                    return pos
+
+
+def _decode_value(buf: str, pos: int, pending: _Pending) -> tuple[Any, int] | None:
+    """Decode one complete value at `pos`, or None if more text is needed.
+
+    A value is only trusted once a non-whitespace character follows it: a
+    number cut off at a chunk boundary ("12" of "1234") decodes cleanly, and
+    only the next separator proves it was actually finished. Text that can't
+    be the start of any value raises ValueError as soon as it is seen.
+    """
+    if buf[pos] in "{[" and pending.find_end(buf, pos) is None:
+        # cut off; every time it doubles, make sure it's not malformed already
+        if len(buf) - pos >= 2 * pending.checked:
+            pending.checked = len(buf) - pos
+            _raise_if_malformed(buf, pos)
+        return None
+
+    try:
+        value, end = _decoder.raw_decode(buf, pos)
+    except json.JSONDecodeError as e:
+        if _is_truncated(buf, e):
+            return None
+        raise
+    if _skip_ws(buf, end) >= len(buf):
+        return None
+    return value, end
+
+
+def _raise_if_malformed(buf: str, pos: int) -> None:
+    try:
+        _decoder.raw_decode(buf, pos)
+    except json.JSONDecodeError as e:
+        if not _is_truncated(buf, e):
+            raise
+
+
+def _is_truncated(buf: str, error: json.JSONDecodeError) -> bool:
+    """Whether `error` is just the text running out, not a mistake in it."""
+    if error.pos >= len(buf) or error.msg.startswith("Unterminated string"):
+        return True
+    rest = buf[error.pos :]
+    if error.msg.startswith("Invalid \\uXXXX escape"):
+        # its hex digits, or a surrogate pair's second half, run off the end
+        return bool(_PARTIAL_ESCAPE.fullmatch(rest))
+    return any(lit.startswith(rest) for lit in _LITERALS) or bool(
+        _PARTIAL_NUMBER.fullmatch(rest)
+    )
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[str], key: str | None = None
+) -> AsyncIterator[list[Any]]:
+    """Yield the items of a JSON array in batches as its text arrives.
+
+    `key` names the top-level member holding the array, e.g. jackett's
+    "Results"; without it the document itself must be the array, as prowlarr
+    sends. Each batch holds the items completed by one chunk, and consumed
+    text is dropped as parsing moves on, so memory stays bounded by the
+    largest single item rather than by the whole response.
+
+    Raises KeyError if `key` is absent and ValueError on malformed JSON,
+    matching what indexing into `json.loads()` output would raise.
+    """
+    buf = ""
+    pos = 0
+    state = _State.START
+    first = True  # no member/item seen yet in the current container
+    member = ""
+    pending = _Pending()
+
+    async for chunk in chunks:
+        if state is _State.DONE:
+            continue  # read the source to the end rather than abandon it
+
+        if pos:
+            buf = buf[pos:]
+            pos = 0
+        buf += chunk
+        batch: list[Any] = []
+
+        while state is not _State.DONE:
+            pos = _skip_ws(buf, pos)
+            if pos >= len(buf):
+                break
+            char = buf[pos]
+
+            if state is _State.START:
+                expected = "[" if key is None else "{"
+                if char != expected:
+                    raise ValueError(f"expected '{expected}' at start of document")
+                pos += 1
+                state = _State.ARR_ITEM if key is None else _State.OBJ_KEY
+                first = True
+
+            elif state is _State.OBJ_KEY:
+                if char == "}" and first:
+                    raise KeyError(key)
+                decoded = _decode_value(buf, pos, pending)
+                if decoded is None:
+                    break
+                pending = _Pending()
+                member, pos = decoded
+                if not isinstance(member, str):
+                    raise ValueError("expected an object key")
+                state = _State.OBJ_COLON
+
+            elif state is _State.OBJ_COLON:
+                if char != ":":
+                    raise ValueError("expected ':' after object key")
+                pos += 1
+                state = _State.OBJ_VALUE
+
+            elif state is _State.OBJ_VALUE:
+                if member == key:
+                    if char != "[":
+                        raise ValueError(f"expected '{key}' to hold an array")
+                    pos += 1
+                    state = _State.ARR_ITEM
+                    first = True
+                    continue
+                decoded = _decode_value(buf, pos, pending)
+                if decoded is None:
+                    break
+                pending = _Pending()
+                _, pos = decoded  # some other member, skipped
+                state = _State.OBJ_SEP
+
+            elif state is _State.OBJ_SEP:
+                if char == "}":
+                    raise KeyError(key)
+                if char != ",":
+                    raise ValueError("expected ',' or '}' between members")
+                pos += 1
+                state = _State.OBJ_KEY
+                first = False
+
+            elif state is _State.ARR_ITEM:
+                if char == "]" and first:
+                    state = _State.DONE
+                    continue
+                decoded = _decode_value(buf, pos, pending)
+                if decoded is None:
+                    break
+                pending = _Pending()
+                item, pos = decoded
+                batch.append(item)
+                state = _State.ARR_SEP
+
+            elif state is _State.ARR_SEP:
+                if char == "]":
+                    state = _State.DONE
+                    continue
+                if char != ",":
+                    raise ValueError("expected ',' or ']' between items")
+                pos += 1
+                state = _State.ARR_ITEM
+                first = False
+
+        if batch:
+            yield batch
+
+    if state is not _State.DONE:
+        raise ValueError("unexpected end of JSON document")
@@ -1,10 +1,14 @@
 import os
+import re
 import urllib.parse
 from typing import Any
 
 import httpx
 import libtorrent as lt
 
+from torrra.core.cache import TORRENT, Cache, get_cache
+from torrra.utils.magnet_uri import fix_magnet_uri, info_hash
+
 DEFAULT_TRACKERS: list[str] = [
     "udp://tracker.opentrackr.org:1337/announce",
     "udp://open.stealth.si:80/announce",
@@ -16,14 +20,12 @@ DEFAULT_TRACKERS: list[str] = [
 ]
 
 
-def fix_magnet_uri(uri: str) -> str:
-    if not uri.startswith("magnet:"):
-        return uri
-    uri = uri.replace("?btih:", "?xt=urn:btih:")
-    uri = uri.replace("&btih:", "&xt=urn:btih:")
-    uri = uri.replace("?btmh:", "?xt=urn:btmh:")
-    uri = uri.replace("&btmh:", "&xt=urn:btmh:")
-    return uri
+# .torrent files run to a few hundred KiB; bigger bodies are something else
+MAX_TORRENT_SIZE = 8 * 1024 * 1024
+MAX_REDIRECTS = 5
+_REDIRECT_CODES = frozenset({301, 302, 303, 307, 308})
+# a bencoded dict opens with "d" and its first key's length
+_BENCODE_DICT = re.compile(rb"d(?:\d|$)")
 
 
 def enhance_magnet_uri(uri: str) -> str:
@@ -52,9 +54,24 @@ async def resolve_magnet_uri(input_uri: str) -> str | None:
 
 async def resolve_torrent(
     input_uri: str,
+    client: httpx.AsyncClient | None = None,
+    use_cache: bool = True,
 ) -> tuple[str | None, Any | None]:
+    """Resolve a magnet URI, .torrent path or URL to `(magnet_uri, info)`.
+
+    URLs are resolved once: the magnet URI and raw .torrent bytes are cached
+    by URL and by info-hash, so selecting the same result again, or a magnet
+    for a torrent already fetched, needs no request. With `use_cache` off
+    the cache is neither read nor written. Pass `client` to share one
+    connection pool across many resolutions.
+    """
     if input_uri.startswith("magnet:"):
-        return fix_magnet_uri(input_uri), None
+        magnet_uri = fix_magnet_uri(input_uri)
+        if not use_cache:
+            return magnet_uri, None
+        # a .torrent fetched earlier for the same hash still lists the files
+        hit = _cache_lookup(_hash_key(magnet_uri))
+        return magnet_uri, (_torrent_info(hit[1]) if hit else None)
 
     if os.path.isfile(input_uri) and input_uri.endswith(".torrent"):
         try:
@@ -64,33 +81,107 @@ async def resolve_torrent(
         except (RuntimeError, OSError, ValueError):
             return None, None
 
+    url_key = _url_key(input_uri)
+    hit = _cache_lookup(url_key) if use_cache else None
+    if hit is None:
+        if client is None:
+            async with new_client() as own_client:
+                magnet_uri, data = await _fetch_torrent(own_client, input_uri)
+        else:
+            magnet_uri, data = await _fetch_torrent(client, input_uri)
+        if magnet_uri is None:
+            return None, None  # failures are retried next time
+
+        if use_cache:
+            cache = get_cache()
+            cache.set(url_key, (magnet_uri, data))
+            if data is not None:
+                cache.set(_hash_key(magnet_uri), (magnet_uri, data))
+        hit = magnet_uri, data
+
+    magnet_uri, data = hit
+    return magnet_uri, _torrent_info(data)
+
+
+def cached_torrent(input_uri: str) -> tuple[str, bytes | None] | None:
+    """The magnet URI and .torrent bytes a link resolved to, if cached."""
+    return _cache_lookup(_url_key(input_uri))
+
+
+def _url_key(input_uri: str) -> str:
+    return Cache.make_key(TORRENT, "url", input_uri)
+
+
+def _hash_key(magnet_uri: str) -> str:
+    return Cache.make_key(TORRENT, "btih", info_hash(magnet_uri) or magnet_uri)
+
+
+def _cache_lookup(key: str) -> tuple[str, bytes | None] | None:
+    # (magnet uri, raw .torrent bytes or None)
+    hit = get_cache().lookup(key)
+    return None if hit is None else hit[0]
+
+
+def _torrent_info(data: bytes | None) -> Any | None:
+    if data is None:
+        return None
+    try:
+        return lt.torrent_info(data)
+    except (RuntimeError, ValueError):
+        return None
+
+
+def new_client() -> httpx.AsyncClient:
+    """A client for `resolve_torrent`; redirects are followed by hand."""
+    return httpx.AsyncClient(follow_redirects=False, timeout=10.0)
+
+
+async def _fetch_torrent(
+    client: httpx.AsyncClient, url: str
+) -> tuple[str | None, bytes | None]:
+    """Follow `url` to a magnet URI or a .torrent, reading at most a few MiB.
+
+    The body is streamed: anything that doesn't open like a bencoded dict,
+    or grows past `MAX_TORRENT_SIZE`, is dropped before the rest arrives.
+    """
     try:
-        async with httpx.AsyncClient(follow_redirects=False, timeout=10.0) as client:
-            resp = await client.get(input_uri)
-
-        # Check for 301/302/redirect location header
-        if resp.status_code in (301, 302, 303, 307, 308):
-            location = resp.headers.get("location")
-            if location:
-                return await resolve_torrent(location)
-
-        content_type = resp.headers.get("content-type", "")
-        # Check if content is a torrent file
-        if (
-            "application/x-bittorrent" in content_type
-            or input_uri.endswith(".torrent")
-            or resp.content.startswith(b"d8:announce")
-            or resp.content.startswith(b"d10:created")
-            or resp.content.startswith(b"d13:announce-list")
-            or (resp.content.startswith(b"d") and b"4:info" in resp.content)
-        ):
+        for _ in range(MAX_REDIRECTS + 1):
+            async with client.stream("GET", url) as resp:
+                location = resp.headers.get("location")
+                if resp.status_code in _REDIRECT_CODES and location:
+                    if location.startswith("magnet:"):
+                        return fix_magnet_uri(location), None
+                    url = str(resp.url.join(location))
+                    continue
+
+                data = await _read_torrent(resp, url)
+            if data is None:
+                return None, None
             try:
-                info = lt.torrent_info(resp.content)
-                magnet_uri = fix_magnet_uri(lt.make_magnet_uri(info))
-                return magnet_uri, info
+                info = lt.torrent_info(data)
             except (RuntimeError, ValueError):
-                pass
+                return None, None
+            return fix_magnet_uri(lt.make_magnet_uri(info)), data
     except (httpx.HTTPError, OSError, RuntimeError, ValueError):
         pass
 
-    return None, None
+    return None, None  # an error, or too many redirects
+
+
+async def _read_torrent(resp: httpx.Response, url: str) -> bytes | None:
+    """The body if it can be a .torrent and fits, else None."""
+    length = resp.headers.get("content-length", "")
+    if length.isdigit() and int(length) > MAX_TORRENT_SIZE:
+        return None
+
+    declared = "application/x-bittorrent" in resp.headers.get(
+        "content-type", ""
+    ) or urllib.parse.urlsplit(url).path.endswith(".torrent")
+    body = bytearray()
+    async for chunk in resp.aiter_bytes():
+        if not body and not declared and not _BENCODE_DICT.match(chunk):
+            return None  # an html page or the like; don't read the rest
+        body += chunk
+        if len(body) > MAX_TORRENT_SIZE:
+            return None
+    return bytes(body) or None
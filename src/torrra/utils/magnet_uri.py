@@ -0,0 +1,51 @@
+import base64
+import binascii
+import re
+import urllib.parse
+
+# magnet uris read as plain text, so results and the cli can use them without
+# loading libtorrent or httpx; resolving them lives in torrra.utils.magnet
+_HEX_BTIH = re.compile(r"[0-9a-fA-F]{40}")
+_BASE32_BTIH = re.compile(r"[A-Za-z2-7]{32}")
+
+
+def fix_magnet_uri(uri: str) -> str:
+    if not uri.startswith("magnet:"):
+        return uri
+    uri = uri.replace("?btih:", "?xt=urn:btih:")
+    uri = uri.replace("&btih:", "&xt=urn:btih:")
+    uri = uri.replace("?btmh:", "?xt=urn:btmh:")
+    uri = uri.replace("&btmh:", "&xt=urn:btmh:")
+    return uri
+
+
+def info_hash(uri: str) -> str | None:
+    """Lowercase hex v1 info-hash a magnet URI names, or None if it names none.
+
+    Indexers disagree on the encoding - some send base32, some hex in either
+    case - so two listings of one torrent only compare equal once normalized.
+    """
+    if not uri.startswith("magnet:"):
+        return None
+
+    query = urllib.parse.urlsplit(fix_magnet_uri(uri)).query
+    for xt in urllib.parse.parse_qs(query).get("xt", []):
+        if not xt.lower().startswith("urn:btih:"):
+            continue
+        digest = xt[len("urn:btih:") :]
+        if _HEX_BTIH.fullmatch(digest):
+            return digest.lower()
+        if _BASE32_BTIH.fullmatch(digest):
+            try:
+                return base64.b32decode(digest.upper()).hex()
+            except (binascii.Error, ValueError):
+                return None
+    return None
+
+
+def display_name(uri: str) -> str | None:
+    """The name a magnet URI gives its torrent (`dn`), or None if it gives none."""
+    if not uri.startswith("magnet:"):
+        return None
+    names = urllib.parse.parse_qs(urllib.parse.urlsplit(uri).query).get("dn")
+    return names[0] if names and names[0] else None
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import Any, ClassVar
+
+import httpx
+
+from torrra.utils.magnet import cached_torrent, new_client, resolve_torrent
+
+
+class TorrentPrefetcher:
+    """Resolves the results a user is likely to pick before they pick them.
+
+    `want()` names the rows worth having, most likely first; `run()` works
+    through them a few at a time, so by the time one is selected its
+    .torrent is already in the resolution cache. Only links need fetching:
+    magnets and links resolved before are skipped.
+
+    It stays out of the way of real traffic: at most `MAX_CONCURRENCY`
+    fetches at once, averaged below `RATE_LIMIT` bytes a second, and none at
+    all while `is_busy()` says downloads are moving data. With `use_cache`
+    off there is nowhere to keep what it fetches, so it fetches nothing
+    ahead and `resolve()` goes straight to the link.
+    """
+
+    MAX_CONCURRENCY: ClassVar[int] = 2
+    RATE_LIMIT: ClassVar[float] = 256 * 1024
+    # seconds between checks while downloads are busy
+    BUSY_POLL: ClassVar[float] = 1.0
+
+    def __init__(
+        self, is_busy: Callable[[], bool] | None = None, use_cache: bool = True
+    ) -> None:
+        self.is_busy: Callable[[], bool] = is_busy or (lambda: False)
+        self.use_cache: bool = use_cache
+        self._queue: deque[str] = deque()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        # shared by every fetch while running
+        self._client: httpx.AsyncClient | None = None
+        self._inflight: dict[str, asyncio.Task[tuple[str | None, Any | None]]] = {}
+        # monotonic time the byte budget allows the next fetch to start
+        self._ready_at: float = 0.0
+
+    def want(self, uris: Iterable[str], urgent: bool = False) -> None:
+        """Queue links to resolve; `urgent` ones jump ahead of the rest.
+
+        Without `urgent` the queue is replaced, so rows scrolled past or
+        from an earlier search are never fetched.
+        """
+        if not self.use_cache:
+            return
+        links = [u for u in uris if u.startswith(("http://", "https://"))]
+        if urgent:
+            for uri in reversed(links):
+                self._queue.appendleft(uri)
+        else:
+            self._queue = deque(links)
+        if self._queue:
+            self._wakeup.set()
+
+    async def resolve(self, uri: str) -> tuple[str | None, Any | None]:
+        """`resolve_torrent`, joining a prefetch of the same link in flight."""
+        task = self._inflight.get(uri)
+        if task is not None:
+            return await asyncio.shield(task)
+        return await resolve_torrent(uri, self._client, use_cache=self.use_cache)
+
+    async def run(self) -> None:
+        async with new_client() as self._client:
+            try:
+                workers = (self._worker() for _ in range(self.MAX_CONCURRENCY))
+                await asyncio.gather(*workers)
+            finally:
+                self._client = None
+
+    async def _worker(self) -> None:
+        while True:
+            uri = await self._next()
+            if uri in self._inflight or cached_torrent(uri) is not None:
+                continue
+
+            task = asyncio.create_task(resolve_torrent(uri, self._client))
+            self._inflight[uri] = task
+            try:
+                await asyncio.shield(task)
+            finally:
+                del self._inflight[uri]
+
+            hit = cached_torrent(uri)
+            size = len(hit[1] or b"") if hit else 0
+            self._ready_at = max(self._ready_at, time.monotonic())
+            self._ready_at += size / self.RATE_LIMIT
+
+    async def _next(self) -> str:
+        while True:
+            while not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            # the budget and busy downloads hold every worker back, then the
+            # queue is read afresh: what's wanted may have changed meanwhile
+            delay = self._ready_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif self.is_busy():
+                await asyncio.sleep(self.BUSY_POLL)
+            elif self._queue:
+                return self._queue.popleft()
@@ -1,11 +1,14 @@
 import time
+from collections import Counter
 from typing import Any, ClassVar, TypeVar
 
+from rich.text import TextType
 from textual.binding import Binding, BindingType
 from textual.reactive import reactive
 from textual.render import measure
 from textual.widgets import DataTable
-from textual.widgets.data_table import ColumnKey
+from textual.widgets.data_table import CellType, ColumnKey, RowKey
+from typing_extensions import Self, override
 
 T = TypeVar("T")
 
@@ -22,11 +25,17 @@ class AutoResizingDataTable(DataTable[T]):
         Binding("l", "select_cursor"),
     ]
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    def __init__(self, *args: Any, fit_to_content: bool = False, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self._last_g_press: float = 0
         # width each column was declared with, kept as a floor by fit_columns
         self._min_col_widths: dict[ColumnKey, int] = {}
+        # only tables that call fit_columns pay to measure their cells
+        self._fit_to_content: bool = fit_to_content
+        # how many cells of each width every column holds, kept up to date as
+        # cells come and go so fit_columns never has to rescan the whole table
+        self._content_widths: dict[ColumnKey, Counter[int]] = {}
+        self._cell_widths: dict[RowKey, dict[ColumnKey, int]] = {}
 
     def key_g(self) -> None:
         current_time = time.time()
@@ -36,6 +45,67 @@ class AutoResizingDataTable(DataTable[T]):
         else:  # save for next event
             self._last_g_press = current_time
 
+    @override
+    def add_row(
+        self,
+        *cells: CellType,
+        height: int | None = 1,
+        key: str | None = None,
+        label: TextType | None = None,
+    ) -> RowKey:
+        row_key = super().add_row(*cells, height=height, key=key, label=label)
+        if self._fit_to_content:
+            widths = self._cell_widths[row_key] = {}
+            for column, cell in zip(self.ordered_columns, cells):
+                if self._is_measured(column.key):
+                    widths[column.key] = self._count_width(column.key, cell)
+        return row_key
+
+    @override
+    def update_cell(
+        self,
+        row_key: RowKey | str,
+        column_key: ColumnKey | str,
+        value: CellType,
+        *,
+        update_width: bool = False,
+    ) -> None:
+        super().update_cell(row_key, column_key, value, update_width=update_width)
+        widths = self._cell_widths.get(_row_key(row_key))
+        column_key = (
+            ColumnKey(column_key) if isinstance(column_key, str) else column_key
+        )
+        if widths is not None and column_key in widths:
+            self._uncount_width(column_key, widths[column_key])
+            widths[column_key] = self._count_width(column_key, value)
+
+    @override
+    def remove_row(self, row_key: RowKey | str) -> None:
+        super().remove_row(row_key)
+        for column_key, width in self._cell_widths.pop(_row_key(row_key), {}).items():
+            self._uncount_width(column_key, width)
+
+    @override
+    def clear(self, columns: bool = False) -> Self:
+        self._content_widths.clear()
+        self._cell_widths.clear()
+        return super().clear(columns)
+
+    def _is_measured(self, column_key: ColumnKey) -> bool:
+        # the expanding column is never fitted, so never measured
+        return column_key != ColumnKey(self.expand_col or "")
+
+    def _count_width(self, column_key: ColumnKey, cell: CellType) -> int:
+        width = measure(self.app.console, str(cell), 1)
+        self._content_widths.setdefault(column_key, Counter())[width] += 1
+        return width
+
+    def _uncount_width(self, column_key: ColumnKey, width: int) -> None:
+        counts = self._content_widths[column_key]
+        counts[width] -= 1
+        if not counts[width]:
+            del counts[width]
+
     def on_resize(self) -> None:
         self._resize_columns()
         self.refresh(layout=True)
@@ -48,11 +118,15 @@ class AutoResizingDataTable(DataTable[T]):
         past row 99 the `No` column renders 1204 as "12", and a large swarm
         renders 1882:8877 as "1882:8". Declared widths act as a floor, so
         columns only ever grow, and the expanding column absorbs the difference.
+
+        Content widths come from the per-width cell counts kept as cells are
+        added, updated and removed, so this is cheap enough to call after every
+        chunk of a progressive render. Only tables built with `fit_to_content`
+        measure their cells; on any other this leaves the widths as declared.
         """
         if not self.columns:
             return
 
-        console = self.app.console
         expand_col_key = ColumnKey(self.expand_col) if self.expand_col else None
         resized = False
 
@@ -61,12 +135,7 @@ class AutoResizingDataTable(DataTable[T]):
                 continue
 
             minimum = self._min_col_widths.setdefault(key, col.width)
-            content_width = max(
-                (measure(console, str(cell), 1) for cell in self.get_column(key)),
-                default=0,
-            )
-
-            width = max(minimum, content_width)
+            width = max(minimum, max(self._content_widths.get(key) or [0]))
             if width != col.width:
                 col.width = width
                 resized = True
@@ -96,3 +165,7 @@ class AutoResizingDataTable(DataTable[T]):
         minimum = self._min_col_widths.setdefault(expand_col_key, expand_col.width)
         if expand_col_width > 0:
             expand_col.width = max(minimum, expand_col_width)
+
+
+def _row_key(key: RowKey | str) -> RowKey:
+    return RowKey(key) if isinstance(key, str) else key
@@ -1,17 +1,26 @@
+from collections.abc import Collection, Mapping
 from typing import ClassVar, cast
 
 from textual.app import ComposeResult
 from textual.containers import Vertical
+from textual.message import Message
 from typing_extensions import override
 
 from torrra._types import Torrent, TorrentRecord, TorrentStatus
 from torrra.core.download import DownloadManager, get_download_manager
+from torrra.core.exceptions import DaemonError
 from torrra.core.torrent import TorrentManager, get_torrent_manager
 from torrra.screens.file_selection import FileSelectionScreen
 from torrra.utils.helpers import human_readable_eta, human_readable_size
 from torrra.widgets.data_table import AutoResizingDataTable
 from torrra.widgets.details_panel import DetailsPanel
 
+# the columns a status tick rewrites, in table order
+_STATUS_COLS = ("status", "done_percent", "up_speed", "down_speed")
+_NO_STATUS = ("N/A", "0%", "0 B/s", "0 B/s")
+# shown until a row is first scrolled into view
+_UNFORMATTED = ("", "", "", "")
+
 
 class DownloadsContent(Vertical):
     COLS: ClassVar[list[tuple[str, str, int]]] = [
@@ -29,12 +38,23 @@ class DownloadsContent(Vertical):
         ("f", "select_files"),
     ]
 
+    class TorrentToggled(Message):
+        """A torrent was paused or resumed, so activity may have changed."""
+
     def __init__(self) -> None:
         super().__init__(id="downloads_content")
-        self._torrents: list[TorrentRecord] = []
-        self._selected_torrent: TorrentRecord | None = None
+        # magnet uri -> record, in registry order; rows and the details panel
+        # are both fed from here
+        self._torrents: dict[str, TorrentRecord] = {}
+        self._selected_uri: str | None = None
         self._group_filter: str | None = None
-        self._statuses: dict[str, TorrentStatus | None] = {}
+        self._statuses: Mapping[str, TorrentStatus | None] = {}
+        self._seen_version: int = -1  # registry version self._torrents reflects
+        # status cells as last written to the table, and rows whose status
+        # changed since; only rows in view are formatted and written
+        self._cells: dict[str, tuple[str, ...]] = {}
+        self._dirty: set[str] = set()
+        self._row_uris: list[str] = []  # table order
 
         self._dm: DownloadManager = get_download_manager()
         self._tm: TorrentManager = get_torrent_manager()
@@ -47,6 +67,12 @@ class DownloadsContent(Vertical):
         yield AutoResizingDataTable(cursor_type="row")
         yield DetailsPanel(show_progress_bar=True)
 
+    @property
+    def _selected_torrent(self) -> TorrentRecord | None:
+        if self._selected_uri is None:
+            return None
+        return self._torrents.get(self._selected_uri)
+
     def on_mount(self) -> None:
         self._table = self.query_one(AutoResizingDataTable)
         self._table.expand_col = "title"
@@ -55,6 +81,10 @@ class DownloadsContent(Vertical):
         # setup table
         for label, key, width in self.COLS:
             self._table.add_column(label, width=width, key=key)
+        self.watch(self._table, "scroll_y", self._flush_visible, init=False)
+
+    def on_resize(self) -> None:
+        self._flush_visible()  # more rows may fit, or the first layout landed
 
     def on_show(self) -> None:
         self.refresh_torrents()
@@ -69,82 +99,89 @@ class DownloadsContent(Vertical):
             return True
         if not status:
             return False
-        state_text = self._dm.get_torrent_state_text(status)
-        if self._group_filter == "Downloading":
-            return state_text in ("Downloading", "Fetching", "Allocating")
-        if self._group_filter == "Stalled":
-            return state_text == "Stalled"
-        if self._group_filter == "Seeding":
-            return state_text == "Seeding"
-        if self._group_filter == "Paused":
-            return state_text in ("Paused", "Queued")
-        if self._group_filter == "Completed":
-            return state_text == "Completed"
-        if self._group_filter == "Checking":
-            return state_text == "Checking"
-        if self._group_filter == "Error":
-            return state_text in ("Missing Files", "Error")
-        return state_text == self._group_filter
+        return self._dm.get_torrent_state(status).group == self._group_filter
 
     def _filter_table(self) -> None:
+        """Bring the rows in line with the torrents the filter lets through.
+
+        Rows that still match stay as they are; only the ones that stopped
+        matching are removed and the newcomers added, then the numbering and
+        order are put right. When most rows go (the group switched) the table
+        is rebuilt instead, as every removal re-indexes the rows after it.
+        """
         if not hasattr(self, "_table") or not self._table.columns:
             return
 
-        self._table.clear()
-        matching_torrents = [
-            t
-            for t in self._torrents
-            if self._matches_filter(self._statuses.get(t["magnet_uri"]))
-        ]
+        uris = self._matching_uris()
+        position = {uri: idx for idx, uri in enumerate(uris)}
+        kept = [uri for uri in self._row_uris if uri in position]
+        if len(kept) < len(self._row_uris) - len(kept):
+            self._table.clear()
+            kept = []
+        else:
+            for uri in self._row_uris:
+                if uri not in position:
+                    self._table.remove_row(uri)
+
+        # renumber the rows that stay, then add the rest after them
+        previous = {uri: idx for idx, uri in enumerate(self._row_uris)}
+        for uri in kept:
+            if previous[uri] != position[uri]:
+                self._table.update_cell(uri, "no_col", str(position[uri] + 1))
+        kept_set = set(kept)
+        added = [uri for uri in uris if uri not in kept_set]
+        for uri in added:
+            title = self._torrents[uri]["title"]
+            cells = self._first_cells(uri)
+            self._table.add_row(str(position[uri] + 1), title, *cells, key=uri)
+        if kept + added != uris:  # a newcomer belongs above a kept row
+            self._table.sort("no_col", key=int)
+
+        self._row_uris = uris
         title_prefix = (
             "all" if self._group_filter is None else self._group_filter.lower()
         )
-        self._table.border_title = f"{title_prefix} ({len(matching_torrents)})"
-
-        for idx, torrent in enumerate(matching_torrents):
-            status = self._statuses.get(torrent["magnet_uri"])
-            state_text = (
-                self._dm.get_torrent_state_text(status, short=True) if status else "N/A"
-            )
-            progress_text = f"{int(status['progress'])}%" if status else "0%"
-            up_text = (
-                f"{human_readable_size(status['up_speed'], short=True)}/s"
-                if status
-                else "0 B/s"
-            )
-            down_text = (
-                f"{human_readable_size(status['down_speed'], short=True)}/s"
-                if status
-                else "0 B/s"
-            )
-
-            self._table.add_row(
-                str(idx + 1),
-                torrent["title"],
-                state_text,
-                progress_text,
-                up_text,
-                down_text,
-                key=torrent["magnet_uri"],
-            )
-
-        if self._selected_torrent and self._selected_torrent["magnet_uri"] not in [
-            t["magnet_uri"] for t in matching_torrents
-        ]:
+        self._table.border_title = f"{title_prefix} ({len(uris)})"
+        self._flush_visible()
+
+        if self._selected_uri is not None and self._selected_uri not in position:
             self._details_panel.add_class("hidden")
-            self._selected_torrent = None
+            self._selected_uri = None
+
+    def _first_cells(self, uri: str) -> tuple[str, ...]:
+        if self._statuses.get(uri):
+            # last known text for now; the rows in view are redone on flush
+            self._dirty.add(uri)
+            return self._cells.setdefault(uri, _UNFORMATTED)
+        cells = self._cells[uri] = _NO_STATUS
+        return cells
+
+    def _matching_uris(self) -> list[str]:
+        return [
+            uri
+            for uri in self._torrents
+            if self._matches_filter(self._statuses.get(uri))
+        ]
 
     def refresh_torrents(self) -> None:
-        self._torrents = self._tm.get_all_torrents()
+        self._seen_version = self._tm.version
+        previous = self._torrents
+        self._torrents = {t["magnet_uri"]: t for t in self._tm.get_all_torrents()}
+        self._cells = {
+            uri: c for uri, c in self._cells.items() if uri in self._torrents
+        }
+        self._dirty &= self._torrents.keys()
 
-        for torrent in self._torrents:
-            self._dm.add_torrent(
-                torrent["magnet_uri"],
-                is_paused=torrent["is_paused"],
-                file_priorities=torrent.get("file_priorities"),
-            )
+        self._dm.start_torrents(self._torrents.values())
 
         self._filter_table()
+        # rows kept by the filter still show the title they were added with
+        for uri, torrent in self._torrents.items():
+            if uri in previous and previous[uri]["title"] != torrent["title"]:
+                try:
+                    self._table.update_cell(uri, "title", torrent["title"])
+                except KeyError:
+                    pass
 
     def key_p(self) -> None:
         if not self._selected_torrent:
@@ -152,17 +189,22 @@ class DownloadsContent(Vertical):
 
         magnet_uri = self._selected_torrent["magnet_uri"]
 
-        status = self._dm.get_torrent_status(magnet_uri)
-        if not status:
-            return
+        try:
+            status = self._dm.get_torrent_status(magnet_uri)
+            if not status:
+                return
 
-        target_paused = not status["is_paused"]
+            target_paused = not status["is_paused"]
 
-        self._dm.toggle_pause(magnet_uri)
-        self._tm.update_torrent_paused_state(magnet_uri, target_paused)
+            self._dm.toggle_pause(magnet_uri)
+            self._tm.update_torrent_paused_state(magnet_uri, target_paused)
+        except DaemonError as e:
+            self._notify_daemon_error(e)
+            return
 
         if self._selected_torrent:
             self._selected_torrent["is_paused"] = target_paused
+        self.post_message(self.TorrentToggled())
 
     def action_delete_torrent(self) -> None:
         self._remove_selected_torrent()
@@ -175,9 +217,13 @@ class DownloadsContent(Vertical):
             return
 
         magnet_uri = self._selected_torrent["magnet_uri"]
-        current_priorities = self._dm.get_file_priorities(
-            magnet_uri
-        ) or self._selected_torrent.get("file_priorities")
+        try:
+            current_priorities = self._dm.get_file_priorities(
+                magnet_uri
+            ) or self._selected_torrent.get("file_priorities")
+        except DaemonError as e:
+            self._notify_daemon_error(e)
+            return
 
         self.app.push_screen(
             FileSelectionScreen(
@@ -201,10 +247,14 @@ class DownloadsContent(Vertical):
             return
 
         magnet_uri = self._selected_torrent["magnet_uri"]
-        self._selected_torrent["file_priorities"] = priorities
 
-        self._dm.set_file_priorities(magnet_uri, priorities)
-        self._tm.update_torrent_file_priorities(magnet_uri, priorities)
+        try:
+            self._dm.set_file_priorities(magnet_uri, priorities)
+            self._tm.update_torrent_file_priorities(magnet_uri, priorities)
+        except DaemonError as e:
+            self._notify_daemon_error(e)
+            return
+        self._selected_torrent["file_priorities"] = priorities
 
     def _remove_selected_torrent(self, delete_files: bool = False) -> None:
         if not self._selected_torrent:
@@ -212,31 +262,37 @@ class DownloadsContent(Vertical):
 
         magnet_uri = self._selected_torrent["magnet_uri"]
 
-        self._dm.remove_torrent(magnet_uri, delete_files=delete_files)
-        self._tm.remove_torrent(magnet_uri)
+        try:
+            self._dm.remove_torrent(magnet_uri, delete_files=delete_files)
+            self._tm.remove_torrent(magnet_uri)
+        except DaemonError as e:
+            self._notify_daemon_error(e)
+            return
 
-        self._torrents = [t for t in self._torrents if t["magnet_uri"] != magnet_uri]
-        self._statuses.pop(magnet_uri, None)
-        self._selected_torrent = None
+        del self._torrents[magnet_uri]
+        self._cells.pop(magnet_uri, None)
+        self._dirty.discard(magnet_uri)
+        self._selected_uri = None
         self._details_panel.add_class("hidden")
         self._filter_table()
 
     def on_details_panel_closed(self):
-        self._selected_torrent = None
+        self._selected_uri = None
 
     def on_data_table_row_selected(
         self, event: AutoResizingDataTable.RowSelected
     ) -> None:
         row_key = cast(str, event.row_key.value)
-        self._selected_torrent = next(
-            (d for d in self._torrents if d["magnet_uri"] == row_key), None
-        )
+        self._selected_uri = row_key if row_key in self._torrents else None
 
         if self._selected_torrent:
             self._details_panel.border_title = self._selected_torrent["title"]
-            if status := self._dm.get_torrent_status(
-                self._selected_torrent["magnet_uri"]
-            ):
+            try:
+                status = self._dm.get_torrent_status(row_key)
+            except DaemonError as e:
+                self._notify_daemon_error(e)
+                status = None
+            if status:
                 self._update_details_panel(status)
             self._details_panel.remove_class("hidden")
             self._details_panel.focus()
@@ -246,84 +302,73 @@ class DownloadsContent(Vertical):
     def focus_table(self) -> None:
         self._table.focus()
 
-    def update_table_data(self, statuses: dict[str, TorrentStatus | None]) -> None:
-        self._statuses = statuses
+    def _notify_daemon_error(self, error: DaemonError) -> None:
+        # only an attached ui raises these: its session lives in the daemon
+        self.notify(str(error), title="Daemon Unreachable", severity="error")
 
-        # First, update the torrent list from the database to catch new or updated torrents
+    def _sync_records(self) -> None:
+        """Catch up with torrents added, removed or renamed in the registry."""
         updated_torrents = self._tm.get_all_torrents()
-        current_uris = [t["magnet_uri"] for t in self._torrents]
         updated_uris = [t["magnet_uri"] for t in updated_torrents]
-        if current_uris != updated_uris:
+        if list(self._torrents) != updated_uris:
             self.refresh_torrents()
             return
+        self._seen_version = self._tm.version
+
+        for db_torrent in updated_torrents:
+            torrent = self._torrents[db_torrent["magnet_uri"]]
+            # Update the local record if title or size changed
+            if (
+                torrent["title"] != db_torrent["title"]
+                or torrent["size"] != db_torrent["size"]
+            ):
+                torrent.update(
+                    {"title": db_torrent["title"], "size": db_torrent["size"]}
+                )
+                try:
+                    self._table.update_cell(
+                        torrent["magnet_uri"], "title", db_torrent["title"]
+                    )
+                except KeyError:
+                    pass
+
+    def update_table_data(
+        self,
+        statuses: Mapping[str, TorrentStatus | None],
+        changed: Collection[str] | None = None,
+    ) -> None:
+        """Apply a status tick, touching only the rows in `changed`.
+
+        `statuses` is the full picture (used for filtering and rebuilds);
+        `changed` defaults to every torrent in it.
+        """
+        self._statuses = statuses
+        if changed is None:
+            changed = statuses.keys()
+
+        # the registry's version tells whether any saved torrent was added,
+        # removed or edited, so an idle tick costs one compare, not a table read
+        records_changed = self._tm.version != self._seen_version
+        if records_changed:
+            self._sync_records()
 
         if not self._torrents:
             return
 
-        torrent_map = {t["magnet_uri"]: t for t in updated_torrents}
-
-        for torrent in self._torrents:
-            # Update the local torrent record if it was updated in the database
-            if torrent["magnet_uri"] in torrent_map:
-                db_torrent = torrent_map[torrent["magnet_uri"]]
-                # Update the local record if title or size changed
-                if (
-                    torrent["title"] != db_torrent["title"]
-                    or torrent["size"] != db_torrent["size"]
-                ):
-                    torrent.update(
-                        {"title": db_torrent["title"], "size": db_torrent["size"]}
-                    )
-                    try:
-                        self._table.update_cell(
-                            torrent["magnet_uri"], "title", db_torrent["title"]
-                        )
-                    except KeyError:
-                        pass
-
         # If a filter is active, check if visible row set needs updating
-        if self._group_filter is not None:
-            matching_uris = [
-                t["magnet_uri"]
-                for t in self._torrents
-                if self._matches_filter(self._statuses.get(t["magnet_uri"]))
-            ]
-            table_uris = [str(k.value) for k in self._table.rows]
-            if matching_uris != table_uris:
-                self._filter_table()
-                return
-
-        for torrent in self._torrents:
-            if not self._matches_filter(statuses.get(torrent["magnet_uri"])):
-                continue
+        if (
+            self._group_filter is not None
+            and (changed or records_changed)
+            and self._matching_uris() != self._row_uris
+        ):
+            self._filter_table()
 
-            status = statuses.get(torrent["magnet_uri"])
-            if not status:
+        for uri in changed:
+            torrent = self._torrents.get(uri)
+            status = statuses.get(uri)
+            if torrent is None or not status or not self._matches_filter(status):
                 continue
-
-            try:
-                self._table.update_cell(
-                    torrent["magnet_uri"],
-                    "status",
-                    self._dm.get_torrent_state_text(status, short=True),
-                )
-                self._table.update_cell(
-                    torrent["magnet_uri"],
-                    "done_percent",
-                    f"{int(status['progress'])}%",
-                )
-                self._table.update_cell(
-                    torrent["magnet_uri"],
-                    "up_speed",
-                    f"{human_readable_size(status['up_speed'], short=True)}/s",
-                )
-                self._table.update_cell(
-                    torrent["magnet_uri"],
-                    "down_speed",
-                    f"{human_readable_size(status['down_speed'], short=True)}/s",
-                )
-            except KeyError:
-                pass
+            self._dirty.add(uri)  # formatted once in view
 
             # check if torrent is already downloaded/notified
             # if not, send notification and update record
@@ -334,33 +379,63 @@ class DownloadsContent(Vertical):
                     f"Finished downloading [b]{short_title}[/b]",
                     title="Download Finished",
                 )
-                self._tm.update_torrent_is_notified(torrent["magnet_uri"])
+                self._tm.update_torrent_is_notified(uri)
                 torrent["is_notified"] = True
 
-            if (
-                self._selected_torrent
-                and self._selected_torrent["magnet_uri"] == torrent["magnet_uri"]
-            ):
+            if uri == self._selected_uri:
                 # update the details panel if its open and
                 # showing this torrent data
                 self._update_details_panel(status)
 
-    def _update_details_panel(self, status: TorrentStatus) -> None:
-        if not self._selected_torrent:
+        self._flush_visible()
+
+    def _flush_visible(self) -> None:
+        """Write the changed status cells of the rows currently in view.
+
+        Rows out of view stay dirty until scrolled to, so a tick costs the
+        same for a library of thousands as for a screenful, and a cell is
+        only written when its text actually changed.
+        """
+        if not self._dirty or not self._row_uris:
             return
 
-        # Get the most up-to-date torrent info from the database
-        updated_torrents = self._tm.get_all_torrents()
-        current_torrent = next(
-            (
-                t
-                for t in updated_torrents
-                if t["magnet_uri"] == self._selected_torrent["magnet_uri"]
-            ),
-            self._selected_torrent,
+        table = self._table
+        # the header stays put above the rows; the border is outside the region
+        height = table.scrollable_content_region.height
+        if table.show_header:
+            height -= table.header_height
+        top = int(table.scroll_y)
+        for uri in self._row_uris[top : top + height]:
+            if uri not in self._dirty:
+                continue
+            self._dirty.discard(uri)
+
+            status = self._statuses.get(uri)
+            cells = self._format_cells(status) if status else _NO_STATUS
+            last = self._cells.get(uri, _UNFORMATTED)
+            for column, text, old in zip(_STATUS_COLS, cells, last):
+                if text != old:
+                    try:
+                        self._table.update_cell(uri, column, text)
+                    except KeyError:
+                        break
+            self._cells[uri] = cells
+
+    def _format_cells(self, status: TorrentStatus) -> tuple[str, ...]:
+        return (
+            self._dm.get_torrent_state(status).short,
+            f"{int(status['progress'])}%",
+            f"{human_readable_size(status['up_speed'], short=True)}/s",
+            f"{human_readable_size(status['down_speed'], short=True)}/s",
         )
 
-        state_text = self._dm.get_torrent_state_text(status)
+    def _update_details_panel(self, status: TorrentStatus) -> None:
+        # kept current with the registry by _sync_records
+        current_torrent = self._selected_torrent
+        if not current_torrent:
+            return
+
+        state_text = self._dm.get_torrent_state(status).label
         size = human_readable_size(float(current_torrent["size"]))
         up_speed = f"{human_readable_size(status['up_speed'])}/s"
         down_speed = f"{human_readable_size(status['down_speed'])}/s"
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import suppress
 from typing import Any, ClassVar, cast
 
 import httpx
@@ -9,7 +11,9 @@ from textual.app import ComposeResult
 from textual.binding import Binding, BindingType
 from textual.containers import Vertical
 from textual.message import Message
+from textual.timer import Timer
 from textual.widgets import Input, Static
+from textual.widgets.data_table import RowDoesNotExist
 from typing_extensions import override
 
 from torrra._types import Indexer, Torrent
@@ -34,13 +38,24 @@ from torrra.core.torrent import get_torrent_manager
 from torrra.indexers.base import BaseIndexer
 from torrra.screens.file_selection import FileSelectionScreen
 from torrra.screens.sort_selector import SortSelectorScreen
+from torrra.utils.healthcheck import IndexerHealthcheck, indexer_cls_path
 from torrra.utils.helpers import human_readable_size, lazy_import
-from torrra.utils.magnet import resolve_torrent
+from torrra.utils.prefetch import TorrentPrefetcher
 from torrra.widgets.data_table import AutoResizingDataTable
 from torrra.widgets.details_panel import DetailsPanel
 from torrra.widgets.search_input import SearchInput
 from torrra.widgets.spinner import Spinner
 
+# what a failing backend raises mid-search; it costs that backend alone
+SEARCH_ERRORS = (
+    IndexerError,
+    ConfigError,
+    httpx.HTTPError,
+    ValueError,
+    KeyError,
+    RuntimeError,
+)
+
 
 class SearchContent(Vertical):
     COLS: ClassVar[list[tuple[str, str, int]]] = [
@@ -69,15 +84,39 @@ class SearchContent(Vertical):
 
     HINTS = "s sort · S order · f seeded · x reset"
 
+    # rows rendered synchronously (comfortably more than a screenful), then
+    # how many more are added per event loop turn
+    FIRST_CHUNK: ClassVar[int] = 100
+    CHUNK_SIZE: ClassVar[int] = 500
+    # later batches of a streaming search are merged into one re-render per
+    # interval rather than rebuilding the table for every parsed chunk
+    MERGE_INTERVAL: ClassVar[float] = 0.2
+    # top rows resolved in the background, besides the one under the cursor
+    PREFETCH_TOP: ClassVar[int] = 5
+
     class DownloadRequested(Message):
         def __init__(self, torrent: Torrent) -> None:
             self.torrent: Torrent = torrent
             super().__init__()
 
     class SearchResults(Message):
-        def __init__(self, results: list[Torrent], query: str) -> None:
+        """One batch of results; `final` marks the end of the search.
+
+        `replaces` is an earlier batch these results supersede, e.g. stale
+        cached results once their refresh lands.
+        """
+
+        def __init__(
+            self,
+            results: list[Torrent],
+            query: str,
+            final: bool = True,
+            replaces: list[Torrent] | None = None,
+        ) -> None:
             self.results: list[Torrent] = results
             self.query: str = query
+            self.final: bool = final
+            self.replaces: list[Torrent] | None = replaces
             super().__init__()
 
     def __init__(
@@ -85,19 +124,35 @@ class SearchContent(Vertical):
         indexer: Indexer,
         search_query: str,
         use_cache: bool = True,
+        indexers: list[Indexer] | None = None,
+        healthcheck: IndexerHealthcheck | None = None,
         *args: Any,
         **kwargs: Any,
     ) -> None:
         super().__init__(*args, id="search_content", **kwargs)
         self.indexer: Indexer = indexer
+        # every backend a search fans out to, primary first
+        self.indexers: list[Indexer] = indexers or [indexer]
+        # searches queue behind it, then run against the indexers that passed
+        self.healthcheck: IndexerHealthcheck | None = healthcheck
         self.search_query: str = search_query
         self.use_cache: bool = use_cache
         self._indexer_instance_cache: BaseIndexer | None = None
+        self._extra_indexer_instances: list[BaseIndexer] | None = None
 
         # application states
+        self._active_query: str | None = None
         self._search_results_map: dict[str, Torrent] = {}
+        self._render_generation: int = 0
+        # the rows the table is being filled with, and the next one to add
+        self._rows: list[Torrent] = []
+        self._next_row: int = 0
+        self._merge_timer: Timer | None = None
         self._selected_torrent: Torrent | None = None
         self._current_torrent_info: lt.torrent_info | None = None
+        self._prefetcher: TorrentPrefetcher = TorrentPrefetcher(
+            self._downloads_busy, use_cache=use_cache
+        )
         # ordering/filtering survives across searches in a session
         self._view: ResultView = self._build_view()
 
@@ -142,7 +197,9 @@ class SearchContent(Vertical):
     @override
     def compose(self) -> ComposeResult:
         yield SearchInput(placeholder="Search...", value=self.search_query)
-        yield AutoResizingDataTable(cursor_type="row", classes="hidden")
+        yield AutoResizingDataTable(
+            cursor_type="row", classes="hidden", fit_to_content=True
+        )
         yield DetailsPanel()
         with Vertical(id="loader"):
             yield Static()
@@ -163,9 +220,22 @@ class SearchContent(Vertical):
         # setup table
         for label, key, width in self.COLS:
             self._table.add_column(label, width=width, key=key)
+        self._run_prefetcher()
         # send initial search
         self.post_message(Input.Submitted(self._search_input, self.search_query))
 
+    async def on_unmount(self) -> None:
+        # release the indexers' pooled connections on app shutdown
+        instances = [
+            self._indexer_instance_cache,
+            *(self._extra_indexer_instances or []),
+        ]
+        for instance in instances:
+            if instance:
+                await instance.aclose()
+        self._indexer_instance_cache = None
+        self._extra_indexer_instances = None
+
     async def on_data_table_row_selected(
         self, event: AutoResizingDataTable.RowSelected
     ) -> None:
@@ -180,7 +250,10 @@ class SearchContent(Vertical):
             return
 
         raw_magnet_uri = self._selected_torrent.magnet_uri
-        resolved_magnet_uri, torrent_info = await resolve_torrent(raw_magnet_uri)
+        # usually prefetched already, or joins the prefetch still in flight
+        resolved_magnet_uri, torrent_info = await self._prefetcher.resolve(
+            raw_magnet_uri
+        )
 
         if resolved_magnet_uri is None:
             self._is_selecting_files = False
@@ -229,8 +302,28 @@ class SearchContent(Vertical):
 
         self.post_message(self.DownloadRequested(self._selected_torrent))
 
+    @on(AutoResizingDataTable.RowHighlighted)
+    def on_row_highlighted(self, event: AutoResizingDataTable.RowHighlighted) -> None:
+        # the row under the cursor is the likeliest pick of all
+        if event.row_key.value is not None:
+            self._prefetcher.want([event.row_key.value], urgent=True)
+
+    @work(group="prefetch")
+    async def _run_prefetcher(self) -> None:
+        await self._prefetcher.run()
+
+    @staticmethod
+    def _downloads_busy() -> bool:
+        # from the statuses the last tick brought, not a call to the session
+        statuses = get_download_manager().statuses.values()
+        return any(s.get("down_speed", 0.0) > 0 for s in statuses)
+
     def on_input_submitted(self, event: Input.Submitted) -> None:
         query = event.value
+        self._active_query = query
+        self._render_generation += 1  # drop chunks still queued for old rows
+        self._cancel_merge()
+        self._prefetcher.want([])  # the old results are no longer on offer
         if not query or not query.strip():
             self._table.add_class("hidden")
             self._table.clear()
@@ -259,70 +352,232 @@ class SearchContent(Vertical):
 
     @work(exclusive=True)
     async def _perform_search(self, query: str) -> None:
+        """Query every indexer at once, posting each backend's results as they land.
+
+        Total latency is the slowest backend rather than the sum of them, and a
+        backend that is slow or fails never holds back results already in.
+        """
+        if self.healthcheck is not None:
+            await self._wait_for_healthcheck()
+
         try:
-            indexer = self._get_indexer_instance()
-            results = await indexer.search(query, use_cache=self.use_cache)
-            self.post_message(self.SearchResults(results or [], query))
-        except (
-            IndexerError,
-            ConfigError,
-            httpx.HTTPError,
-            ValueError,
-            KeyError,
-            RuntimeError,
-        ):
+            instances = self._get_indexer_instances() if self.indexers else []
+        except (ImportError, ConfigError):
+            instances = []
+
+        tasks = [
+            asyncio.create_task(self._search_one(indexer.name, instance, query))
+            for indexer, instance in zip(self.indexers, instances)
+        ]
+        failed: list[str] = [] if tasks else [i.name for i in self.indexers]
+
+        try:
+            for pending in asyncio.as_completed(tasks):
+                name, ok = await pending
+                if not ok:
+                    failed.append(name)
+        finally:  # a superseded search must not leave backends running
+            for task in tasks:
+                task.cancel()
+
+        if len(failed) == len(self.indexers):  # also true with none healthy
             self.notify(
                 "Search failed, check indexer settings",
                 title="Search Failed",
                 severity="error",
-            )  # post empty results just to stop spinners
-            self.post_message(self.SearchResults([], query))
+            )
+        elif failed:
+            self.notify(
+                f"No results from {', '.join(failed)}",
+                title="Indexer Failed",
+                severity="warning",
+            )
+        # the final (possibly empty) batch stops the spinner
+        self.post_message(self.SearchResults([], query))
+
+    async def _wait_for_healthcheck(self) -> None:
+        # only the first search actually waits; instances are built afterwards,
+        # so dropping the failed indexers here is all it takes to skip them
+        assert self.healthcheck is not None
+        if not self.healthcheck.done:
+            cast(Static, self._loader.children[0]).update("Connecting to indexer...")
+
+        healthy = await self.healthcheck.wait()
+        self.healthcheck = None
+        self.indexers = [i for i in self.indexers if i in healthy]
+        if self.indexers:
+            self.indexer = self.indexers[0]
+
+        if self._active_query:  # restore the label the wait replaced
+            cast(Static, self._loader.children[0]).update(
+                f"Searching for [b]{self._active_query}[/b]..."
+            )
+
+    async def _search_one(
+        self, name: str, instance: BaseIndexer, query: str
+    ) -> tuple[str, bool]:
+        """Stream one backend's results as batches, reporting whether it worked.
+
+        A backend that fails part-way keeps the batches it already delivered.
+        Cached results paint straight away; stale ones are then refreshed in
+        the background and swapped in place once the fresh set is in.
+        """
+        hit = instance.cached_results(query) if self.use_cache else None
+        if hit is not None:
+            cached, stale = hit
+            self.post_message(self.SearchResults(cached, query, final=False))
+            if stale:
+                await self._revalidate(instance, query, cached)
+            return name, True
+
+        try:
+            # the cache was just read above; the stream needn't read it again
+            stream = instance.search_stream(
+                query, use_cache=self.use_cache, refresh=True
+            )
+            async for batch in stream:
+                if batch:
+                    self.post_message(self.SearchResults(batch, query, final=False))
+            return name, True
+        except SEARCH_ERRORS:
+            return name, False
+
+    async def _revalidate(
+        self, instance: BaseIndexer, query: str, stale: list[Torrent]
+    ) -> None:
+        # the stale rows stay up if the refresh fails; that is what they're for
+        with suppress(*SEARCH_ERRORS):
+            stream = instance.search_stream(query, refresh=True)
+            fresh = [t async for batch in stream for t in batch]
+            if fresh:
+                self.post_message(
+                    self.SearchResults(fresh, query, final=False, replaces=stale)
+                )
 
     @on(SearchResults)
     def on_search_results(self, message: SearchResults) -> None:
-        if not message.results:
+        # a superseded search may still have batches in flight
+        if message.query != self._active_query:
+            return
+
+        if message.replaces is not None:
+            self._view.replace_results(message.replaces, message.results)
+            self._rerender_in_place()
+        elif message.results:
+            first_batch = not self._view.total
+            self._view.add_results(message.results)
+
+            if first_batch:
+                self._loader.add_class("hidden")
+                self._table.remove_class("hidden")
+                self._render_rows()
+                self._table.focus()  # initial focus table
+            elif self._merge_timer is None:
+                self._merge_timer = self.set_timer(
+                    self.MERGE_INTERVAL, self._merge_pending
+                )
+
+        if message.final and self._merge_timer is not None:
+            self._merge_pending()  # no reason to sit on the last batches
+
+        if message.final and not self._view.total:
             cast(Spinner, self._loader.children[1]).pause()
             cast(Static, self._loader.children[0]).update(
                 f"Nothing Found for [b]{message.query}[/b]"
             )  # show loader and exit
-            return
 
-        self._view.set_results(message.results)
+    def _merge_pending(self) -> None:
+        """Render batches that arrived since the last render."""
+        if self._view.appends_in_order:
+            self._append_rows()  # the rows already shown stay as they are
+        else:
+            self._rerender_in_place()
+
+    def _append_rows(self) -> None:
+        """Add the rows that landed below everything already rendered."""
+        self._cancel_merge()
+        rows = self._view.visible()
+        # a chunk still queued carries on into the new rows by itself
+        chunk_queued = self._next_row < len(self._rows)
+        for torrent in rows[len(self._rows) :]:
+            self._search_results_map[torrent.magnet_uri] = torrent
+        self._rows = rows
+        self._update_border_title()
+
+        if not chunk_queued:
+            self._add_row_chunk(self.CHUNK_SIZE, self._render_generation)
 
-        self._loader.add_class("hidden")
-        self._table.remove_class("hidden")
-        self._table.focus()  # initial focus table
+    def _rerender_in_place(self) -> None:
+        """Render the view afresh, keeping the cursor on the row it was on."""
+        cursor_key = self._cursor_key()
         self._render_rows()
+        if cursor_key is not None:
+            # later batches must not yank the cursor off the user's row
+            with suppress(RowDoesNotExist):  # not rendered yet
+                self._table.move_cursor(row=self._table.get_row_index(cursor_key))
+
+    def _cancel_merge(self) -> None:
+        if self._merge_timer is not None:
+            self._merge_timer.stop()
+            self._merge_timer = None
+
+    def _cursor_key(self) -> str | None:
+        if not self._table.row_count:
+            return None
+        row_key, _ = self._table.coordinate_to_cell_key(self._table.cursor_coordinate)
+        return cast(str, row_key.value)
 
     def _render_rows(self) -> None:
         """Single path from the view model to the table.
 
         Every state change - new search, sort, filter - funnels through here so
-        row numbering and the lookup map can never drift out of sync.
+        row numbering and the lookup map can never drift out of sync. Only the
+        first screenful is added straight away; the rest follows in chunks
+        between event loop turns so a broad search never freezes the UI.
         """
         rows = self._view.visible()
+        # any chunks still queued from a previous render are now stale, and
+        # batches waiting to be merged are covered by this render
+        self._render_generation += 1
+        self._cancel_merge()
 
         self._table.clear()
-        self._search_results_map.clear()
+        self._search_results_map = {t.magnet_uri: t for t in rows}
+        self._rows, self._next_row = rows, 0
+        self._update_border_title()
 
-        for idx, torrent in enumerate(rows, start=1):
-            self._search_results_map[torrent.magnet_uri] = torrent
+        self._add_row_chunk(self.FIRST_CHUNK, self._render_generation)
+        self._prefetcher.want(t.magnet_uri for t in rows[: self.PREFETCH_TOP])
+
+    def _update_border_title(self) -> None:
+        shown, total = len(self._rows), self._view.total
+        count = f"{shown}/{total}" if shown != total else str(total)
+        self._table.border_title = f"results ({count}) · {self._view.sort_label}"
+        self._table.border_subtitle = self.HINTS
+
+    def _add_row_chunk(self, size: int, generation: int) -> None:
+        if generation != self._render_generation:
+            return
+
+        rows, start = self._rows, self._next_row
+        end = min(start + size, len(rows))
+        for idx in range(start, end):
+            torrent = rows[idx]
             self._table.add_row(
-                str(idx),
+                str(idx + 1),
                 torrent.title,
                 human_readable_size(torrent.size),
                 f"{torrent.seeders!s}:{torrent.leechers!s}",
                 key=torrent.magnet_uri,
             )
-
-        shown, total = len(rows), self._view.total
-        count = f"{shown}/{total}" if shown != total else str(total)
-        self._table.border_title = f"results ({count}) · {self._view.sort_label}"
-        self._table.border_subtitle = self.HINTS
         # row numbers and swarm counts both outgrow the widths their columns
         # are declared with once a search returns a few hundred results
+        self._next_row = end
         self._table.fit_columns()
 
+        if end < len(rows):
+            self.call_later(self._add_row_chunk, self.CHUNK_SIZE, generation)
+
     def _refresh_view(self) -> None:
         """Re-render after a sort/filter change, unless nothing is loaded yet."""
         if not self._view.total:
@@ -381,17 +636,24 @@ class SearchContent(Vertical):
         if self._indexer_instance_cache:
             return self._indexer_instance_cache
 
-        name = self.indexer.name
-        indexer_cls_str = f"torrra.indexers.{name}.{name.title()}Indexer"
+        self._indexer_instance_cache = self._build_indexer_instance(self.indexer)
+        return self._indexer_instance_cache
 
-        indexer_cls = lazy_import(indexer_cls_str)
+    def _get_indexer_instances(self) -> list[BaseIndexer]:
+        """Instances for every backend, in the same order as `self.indexers`."""
+        if self._extra_indexer_instances is None:
+            self._extra_indexer_instances = [
+                self._build_indexer_instance(indexer) for indexer in self.indexers[1:]
+            ]
+        return [self._get_indexer_instance(), *self._extra_indexer_instances]
+
+    @staticmethod
+    def _build_indexer_instance(indexer: Indexer) -> BaseIndexer:
+        indexer_cls = lazy_import(indexer_cls_path(indexer.name))
         assert issubclass(indexer_cls, BaseIndexer)
-        indexer_instance = indexer_cls(
-            url=self.indexer.url,
-            api_key=self.indexer.api_key,
+        return indexer_cls(
+            url=indexer.url,
+            api_key=indexer.api_key,
             timeout=get_config().get("general.timeout", DEFAULT_TIMEOUT),
             max_retries=get_config().get("general.max_retries", DEFAULT_MAX_RETRIES),
         )
-
-        self._indexer_instance_cache = indexer_instance
-        return indexer_instance
@@ -13,6 +13,8 @@ class StatusBar(Horizontal):
         super().__init__(id=id)
         self._shortcuts_widget = Static("? for shortcuts", id="shortcuts")
         self._stats_widget = Static("", id="stats")
+        self._stats: str = ""
+        self._tick: str = ""
         self.update_stats(0.0, 0.0, 0)
 
     @override
@@ -29,6 +31,12 @@ class StatusBar(Horizontal):
         nodes_str = "1 node" if dht_nodes == 1 else f"{dht_nodes} nodes"
         # fmt: on
 
-        self._stats_widget.update(
+        self._stats = (
             f"[b]↓[/b] {down_speed} · [b]↑[/b] {up_speed} · [b]DHT:[/b] {nodes_str}"
         )
+        self._stats_widget.update(self._stats + self._tick)
+
+    def update_tick(self, seconds: float) -> None:
+        """Show how often downloads refresh; the rate follows activity."""
+        self._tick = f" · [b]tick:[/b] {seconds:g}s"
+        self._stats_widget.update(self._stats + self._tick)
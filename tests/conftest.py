@@ -1,4 +1,7 @@
 import asyncio
+import os
+import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
@@ -7,8 +10,11 @@ import pytest
 
 from torrra._types import Indexer
 from torrra.app import TorrraApp
+from torrra.core import cache as cache_module
 from torrra.core import config as config_module
 from torrra.core import db as db_module
+from torrra.core import download as download_module
+from torrra.core import rpc as rpc_module
 from torrra.core.config import Config
 from torrra.core.download import get_download_manager
 from torrra.core.torrent import get_torrent_manager
@@ -30,8 +36,42 @@ def isolated_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
 
     yield temp_db_file
 
+    db_module.close_db()
     get_torrent_manager.cache_clear()
     get_download_manager.cache_clear()
+    # the session lock lives in the db dir; it goes with the test's
+    for fd in download_module._session_locks.values():
+        os.close(fd)
+    download_module._session_locks.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # the shared cache lives in a temp dir, so cached searches and
+    # healthchecks never leak between tests or into the user's cache
+    monkeypatch.setattr(cache_module, "CACHE_DIR", tmp_path / "torrra_cache")
+    cache_module.get_cache.cache_clear()
+
+    yield
+
+    if cache_module.get_cache.cache_info().currsize:
+        cache_module.get_cache().close()
+    cache_module.get_cache.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_daemon(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # a daemon the developer has running must not be attached to by tests
+    monkeypatch.setattr(rpc_module, "SOCKET_PATH", tmp_path / "daemon.sock")
+    get_daemon_client = rpc_module.get_daemon_client  # tests may patch it
+    get_daemon_client.cache_clear()
+
+    yield
+
+    attached = get_daemon_client.cache_info().currsize and get_daemon_client()
+    if attached:
+        attached.close()
+    get_daemon_client.cache_clear()
 
 
 @pytest.fixture
@@ -60,10 +100,38 @@ def app_factory():
     return _create_app
 
 
+@pytest.fixture
+def best_ms():
+    # returns a function timing the fastest of a few runs, in ms, for the
+    # benchmarks to print; never asserted on, wall-clock time is too noisy
+    def _best_ms(func: Callable[[], object], rounds: int = 5) -> float:
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
+
+    return _best_ms
+
+
+def _stream_from_search(mock: MagicMock):
+    # the ui consumes search_stream; serve whatever `search` is set up to
+    # return as a single batch so tests only have to configure one method
+    async def _search_stream(query: str, use_cache: bool = True, refresh: bool = False):
+        results = await mock.search(query, use_cache=use_cache)
+        if results:
+            yield results
+
+    return _search_stream
+
+
 @pytest.fixture
 def mock_indexer(monkeypatch: pytest.MonkeyPatch):
     mock_indexer_instance = MagicMock()
     mock_indexer_instance.search = AsyncMock(return_value=[])
+    mock_indexer_instance.search_stream = _stream_from_search(mock_indexer_instance)
+    mock_indexer_instance.cached_results = MagicMock(return_value=None)
 
     # patch the method that creates the indexer to return mock instance
     def _mock_get_indexer_instance(self: Any):  # pyright: ignore[reportUnusedParameter]
@@ -1,12 +1,31 @@
+from unittest.mock import MagicMock
+
+import libtorrent as lt
+import pytest
 from textual.widgets import ContentSwitcher
 
+from torrra._types import Torrent, TorrentRecord, TorrentStatus
 from torrra.app import TorrraApp
+from torrra.core.exceptions import DaemonError
 from torrra.screens.file_selection import FileSelectionScreen
 from torrra.screens.home import HomeScreen
 from torrra.widgets.downloads import DownloadsContent
 from torrra.widgets.search import SearchContent
 from torrra.widgets.sidebar import Sidebar
 
+MAGNET = "magnet:?xt=urn:btih:0123456789abcdef0123456789abcdef01234567"
+
+
+def _torrent(magnet: str = MAGNET) -> Torrent:
+    return Torrent(
+        magnet_uri=magnet,
+        title="Arch Linux ISO",
+        size=840_499_200,
+        seeders=5,
+        leechers=1,
+        source="Mock",
+    )
+
 
 def _sidebar_group_ids(sidebar: Sidebar) -> list[str | None]:
     return [
@@ -90,3 +109,172 @@ async def test_downloads_content_is_interactive_without_indexer():
 
         downloads = app.screen.query_one(DownloadsContent)
         assert downloads._table.has_focus
+
+
+def test_idle_tick_does_not_read_the_registry(monkeypatch: pytest.MonkeyPatch):
+    content = DownloadsContent()
+    content._table = MagicMock()
+    content._tm.add_torrent(_torrent())
+    content.refresh_torrents()
+
+    reads = MagicMock(wraps=content._tm.get_all_torrents)
+    monkeypatch.setattr(content._tm, "get_all_torrents", reads)
+
+    content.update_table_data({}, changed=set())
+    assert not reads.called
+
+    content._tm.update_torrent_metadata(MAGNET, "renamed", 1)
+    content.update_table_data({}, changed=set())
+    assert reads.call_count == 1
+    content._table.update_cell.assert_called_with(MAGNET, "title", "renamed")
+
+
+def _library(n: int) -> tuple[list[TorrentRecord], dict[str, TorrentStatus]]:
+    records: list[TorrentRecord] = []
+    statuses: dict[str, TorrentStatus] = {}
+    for i in range(n):
+        magnet = f"magnet:?xt=urn:btih:{i:040x}"
+        records.append(
+            {
+                "magnet_uri": magnet,
+                "title": f"torrent {i}",
+                "is_paused": False,
+                "is_notified": False,
+            }
+        )
+        statuses[magnet] = {
+            "state": lt.torrent_status.states.downloading,
+            "progress": 50.0,
+            "down_speed": 1024.0,
+            "up_speed": 0.0,
+        }
+    return records, statuses
+
+
+def _table(rows_in_view: int) -> MagicMock:
+    table = MagicMock(scroll_y=0, show_header=True, header_height=1)
+    # the region inside the border, header row included
+    table.scrollable_content_region.height = rows_in_view + 1
+    return table
+
+
+def test_tick_writes_only_changed_cells_of_rows_in_view(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    records, statuses = _library(2000)
+    content = DownloadsContent()
+    content._table = _table(rows_in_view=30)
+    monkeypatch.setattr(content._dm, "add_torrent", MagicMock())
+    monkeypatch.setattr(content._tm, "get_all_torrents", lambda: records)
+    content.refresh_torrents()
+    update_cell = content._table.update_cell
+
+    content.update_table_data(statuses)  # every torrent changed
+    # only the 30 rows in view are formatted, four cells each
+    assert update_cell.call_count == 30 * 4
+
+    update_cell.reset_mock()
+    content.update_table_data(statuses)  # changed, but renders the same
+    assert not update_cell.called
+
+    first, far = records[0]["magnet_uri"], records[1000]["magnet_uri"]
+    statuses[first] = {**statuses[first], "progress": 75.0}
+    statuses[far] = {**statuses[far], "progress": 75.0}
+    content.update_table_data(statuses, changed={first, far})
+    update_cell.assert_called_once_with(first, "done_percent", "75%")
+
+    # rows scrolled into view catch up on what they missed
+    update_cell.reset_mock()
+    content._table.scroll_y = 990
+    content._flush_visible()
+    assert update_cell.call_count == 30 * 4
+    update_cell.assert_any_call(far, "done_percent", "75%")
+
+
+def test_details_panel_is_fed_from_the_index(monkeypatch: pytest.MonkeyPatch):
+    content = DownloadsContent()
+    content._table = MagicMock()
+    content._details_panel = MagicMock()
+    content._tm.add_torrent(_torrent())
+    content.refresh_torrents()
+
+    lookups = MagicMock(wraps=content._tm.get_torrent)
+    monkeypatch.setattr(content._tm, "get_torrent", lookups)
+    content.on_data_table_row_selected(MagicMock(row_key=MagicMock(value=MAGNET)))
+    assert content._selected_torrent is not None
+
+    # a rename reaches the open panel through the index, not a registry read
+    content._tm.update_torrent_metadata(MAGNET, "renamed", 1)
+    status: TorrentStatus = {
+        "state": lt.torrent_status.states.downloading,
+        "progress": 50.0,
+        "down_speed": 1024.0,
+        "up_speed": 0.0,
+        "eta": None,
+        "is_seeding": False,
+    }
+    content.update_table_data({MAGNET: status}, changed={MAGNET})
+    assert content._details_panel.border_title == "renamed"
+    assert not lookups.called
+
+    # a row key that is no longer in the index selects nothing
+    content.on_data_table_row_selected(MagicMock(row_key=MagicMock(value="gone")))
+    assert content._selected_torrent is None
+
+
+def test_actions_report_a_lost_daemon(monkeypatch: pytest.MonkeyPatch):
+    content = DownloadsContent()
+    content._table = MagicMock()
+    content._details_panel = MagicMock()
+    content._tm.add_torrent(_torrent())
+    content.refresh_torrents()
+    content._selected_uri = MAGNET
+    notify = MagicMock()
+    monkeypatch.setattr(content, "notify", notify)
+
+    lost = MagicMock(side_effect=DaemonError("the daemon closed the connection"))
+    monkeypatch.setattr(content._dm, "get_torrent_status", lost)
+    monkeypatch.setattr(content._dm, "remove_torrent", lost)
+    content.key_p()
+    content.action_delete_torrent()
+
+    assert notify.call_count == 2
+    # nothing is dropped from the table that the daemon still has
+    assert MAGNET in content._torrents
+
+
+def test_filter_changes_touch_only_the_rows_that_came_or_went(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    records, statuses = _library(4)
+    uris = [r["magnet_uri"] for r in records]
+    content = DownloadsContent()
+    content._table = table = _table(rows_in_view=30)
+    monkeypatch.setattr(content._dm, "add_torrent", MagicMock())
+    monkeypatch.setattr(content._tm, "get_all_torrents", lambda: records)
+    content.update_table_data(statuses)
+    content.refresh_torrents()
+    content.set_group_filter("Downloading")
+    table.reset_mock()
+
+    stalled = {**statuses[uris[1]], "down_speed": 0.0}
+    content.update_table_data({**statuses, uris[1]: stalled}, changed={uris[1]})
+    table.remove_row.assert_called_once_with(uris[1])
+    assert not table.clear.called and not table.add_row.called
+    # the rows below it move up a place
+    table.update_cell.assert_any_call(uris[2], "no_col", "2")
+    table.update_cell.assert_any_call(uris[3], "no_col", "3")
+
+    table.reset_mock()
+    content.update_table_data(statuses, changed={uris[1]})
+    assert not table.remove_row.called and not table.clear.called
+    args = table.add_row.call_args
+    assert args.args[:2] == ("2", "torrent 1") and args.kwargs == {"key": uris[1]}
+    table.sort.assert_called_once_with("no_col", key=int)
+    assert content._row_uris == uris
+
+    # switching to a group most rows are not in starts the table over
+    table.reset_mock()
+    content.set_group_filter("Seeding")
+    table.clear.assert_called_once()
+    assert not table.remove_row.called
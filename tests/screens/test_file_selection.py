@@ -629,7 +629,7 @@ async def test_downloads_content_action_select_files(
         await pilot.pause()
         downloads_content = app.screen.query_one(DownloadsContent)
         # Select first row
-        downloads_content._selected_torrent = tm.get_all_torrents()[0]
+        downloads_content._selected_uri = tm.get_all_torrents()[0]["magnet_uri"]
 
         # Trigger select files action
         downloads_content.action_select_files()
@@ -1,19 +1,28 @@
-from typing import cast
-from unittest.mock import MagicMock
+import asyncio
+import threading
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock
 
+import httpx
+import libtorrent as lt
 import pytest
 from textual.coordinate import Coordinate
 from textual.geometry import Offset, Region
 from textual.pilot import Pilot
-from textual.widgets import DataTable, ListView, Static
+from textual.widgets import ContentSwitcher, DataTable, ListView, Static
 from textual.widgets.data_table import ColumnKey
 
 from torrra._types import Indexer, Torrent
 from torrra.app import TorrraApp
 from torrra.core.config import Config
+from torrra.core.download import get_download_manager
+from torrra.core.exceptions import DaemonError
 from torrra.core.results import SortKey
 from torrra.screens.home import HomeScreen
 from torrra.screens.sort_selector import SortSelectorScreen
+from torrra.utils.healthcheck import IndexerHealthcheck
+from torrra.widgets.data_table import AutoResizingDataTable
+from torrra.widgets.downloads import DownloadsContent
 from torrra.widgets.search import SearchContent
 from torrra.widgets.status_bar import StatusBar
 
@@ -92,6 +101,151 @@ async def test_home_screen_search_empty_query(mock_indexer: MagicMock):
         assert not mock_indexer.search.called
 
 
+ARCH_HASH = "0123456789abcdef0123456789abcdef01234567"
+
+
+@pytest.fixture
+def federated(monkeypatch: pytest.MonkeyPatch, mock_config: Config):
+    """A jackett + prowlarr app where prowlarr only answers once released."""
+    release = asyncio.Event()
+    fast, slow = MagicMock(), MagicMock()
+    fast.search = AsyncMock(
+        return_value=[
+            Torrent(
+                magnet_uri=f"magnet:?xt=urn:btih:{ARCH_HASH}",
+                title="Arch Linux ISO",
+                size=840_499_200,
+                seeders=523,
+                leechers=17,
+                source="Jackett",
+            )
+        ]
+    )
+
+    async def slow_search(query: str, use_cache: bool = True) -> list[Torrent]:
+        await release.wait()
+        return [
+            # the same torrent again, hex upper-cased and with a display name
+            Torrent(
+                magnet_uri=f"magnet:?xt=urn:btih:{ARCH_HASH.upper()}&dn=arch",
+                title="arch linux (prowlarr)",
+                size=840_499_200,
+                seeders=400,
+                leechers=10,
+                source="Prowlarr",
+            ),
+            Torrent(
+                magnet_uri="magnet:?xt=urn:btih:fedora",
+                title="Fedora 40",
+                size=2_000_000_000,
+                seeders=250,
+                leechers=5,
+                source="Prowlarr",
+            ),
+        ]
+
+    slow.search = AsyncMock(side_effect=slow_search)
+
+    def as_stream(mock: MagicMock):
+        async def search_stream(
+            query: str, use_cache: bool = True, refresh: bool = False
+        ):
+            yield await mock.search(query, use_cache=use_cache)
+
+        return search_stream
+
+    fast.search_stream = as_stream(fast)
+    slow.search_stream = as_stream(slow)
+
+    def _mock_get_indexer_instances(self: Any):  # pyright: ignore[reportUnusedParameter]
+        return [fast, slow]
+
+    monkeypatch.setattr(
+        "torrra.widgets.search.SearchContent._get_indexer_instances",
+        _mock_get_indexer_instances,
+    )
+
+    jackett = Indexer(name="jackett", url="http://jackett.url", api_key="key")
+    prowlarr = Indexer(name="prowlarr", url="http://prowlarr.url", api_key="key")
+    app = TorrraApp(
+        indexer=jackett,
+        indexers=[jackett, prowlarr],
+        use_cache=False,
+        search_query="arch",
+    )
+    return app, slow, release
+
+
+async def test_federated_search_shows_fast_results_before_slow_ones(
+    federated: tuple[TorrraApp, MagicMock, asyncio.Event],
+):
+    app, _, release = federated
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        table = _table_of(app)
+        # jackett is in while prowlarr is still pending
+        assert _titles(table) == ["Arch Linux ISO"]
+
+        release.set()
+        await pilot.pause()
+        await pilot.pause()
+        # the duplicate is matched by info-hash; the first listing wins
+        assert _titles(table) == ["Arch Linux ISO", "Fedora 40"]
+
+
+async def test_later_batches_are_appended_rather_than_re_rendered(
+    federated: tuple[TorrraApp, MagicMock, asyncio.Event],
+):
+    app, _, release = federated
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        table = _table_of(app)
+        clear = MagicMock(wraps=table.clear)
+        table.clear = clear
+
+        release.set()
+        await pilot.pause()
+        await pilot.pause()
+        # in relevance order the new rows simply go below the old ones
+        assert not clear.called
+        assert _numbers(table) == ["1", "2"]
+        assert "results (2)" in str(table.border_title)
+
+
+async def test_sorted_views_re_render_when_batches_arrive(
+    federated: tuple[TorrraApp, MagicMock, asyncio.Event],
+):
+    app, _, release = federated
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        search = app.screen.query_one(SearchContent)
+        search._view.set_sort(SortKey.SIZE)
+        table = _table_of(app)
+        clear = MagicMock(wraps=table.clear)
+        table.clear = clear
+
+        release.set()
+        await pilot.pause()
+        await pilot.pause()
+        # fedora is bigger, so it has to go above the row already shown
+        assert clear.called
+        assert _titles(table) == ["Fedora 40", "Arch Linux ISO"]
+
+
+async def test_federated_search_keeps_results_when_a_backend_fails(
+    federated: tuple[TorrraApp, MagicMock, asyncio.Event],
+):
+    app, slow, _ = federated
+    slow.search.side_effect = httpx.ConnectError("prowlarr is down")
+
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        await pilot.pause()
+        table = _table_of(app)
+        assert not table.has_class("hidden")
+        assert _titles(table) == ["Arch Linux ISO"]
+
+
 # indexer order is deliberately NOT sorted by any column, so a passing
 # ordering assertion can only come from the sort actually being applied
 SORT_FIXTURE = [
@@ -683,6 +837,31 @@ async def test_filtering_out_the_widest_row_gives_the_width_back(
         )
 
 
+async def test_widths_follow_cells_as_they_are_updated_and_removed(
+    wide_unseeded_app: TorrraApp,
+):
+    async with wide_unseeded_app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        table = cast(AutoResizingDataTable[str], _table_of(wide_unseeded_app))
+        busy, calm = "magnet:?xt=urn:btih:busy", "magnet:?xt=urn:btih:calm"
+
+        table.update_cell(calm, "seeders_leechers_col", "12:345678901")
+        table.fit_columns()
+        assert _col_width(table, "seeders_leechers_col") == len("12:345678901")
+
+        table.update_cell(calm, "seeders_leechers_col", "12:34")
+        table.remove_row(busy)
+        table.fit_columns()
+        assert _col_width(table, "seeders_leechers_col") == 6
+
+
+async def test_tables_not_fitted_to_content_measure_nothing(app: TorrraApp):
+    async with app.run_test():
+        table = app.screen.query_one(DownloadsContent)._table
+        table.add_row("1", "title", "DOWN", "5%", "0 B/s", "0 B/s", key="k")
+        assert not table._content_widths
+
+
 async def test_title_column_keeps_a_usable_width_in_a_narrow_terminal(
     wide_value_app: TorrraApp,
 ):
@@ -703,6 +882,80 @@ async def test_home_screen_contains_status_bar(app: TorrraApp):
         assert "DHT:" in str(status_bar._stats_widget.content)
 
 
+async def test_downloads_refresh_rate_follows_activity(
+    app: TorrraApp, mock_config: Config
+):
+    mock_config.set("general.debug", "true")
+    async with app.run_test() as pilot:
+        screen = cast(HomeScreen, app.screen)
+        status_bar = screen.query_one(StatusBar)
+
+        # no torrents at all: barely any work, and the status bar says so
+        screen.refresh_downloads_now()
+        await pilot.pause()
+        assert "[b]tick:[/b] 30s" in str(status_bar._stats_widget.content)
+
+        # a seeding torrent nobody is downloading from is idle too
+        dm = get_download_manager()
+        dm.statuses["magnet:?xt=urn:btih:seed"] = {
+            "state": lt.torrent_status.states.seeding,
+            "is_seeding": True,
+            "down_speed": 0.0,
+            "up_speed": 0.0,
+        }
+        await screen._update_downloads_data()
+        assert not screen._transferring
+
+        screen._transferring = True
+        assert screen._next_tick_interval() == HomeScreen.SLOW_TICK  # on search
+        screen.query_one(ContentSwitcher).current = "downloads_content"
+        assert screen._next_tick_interval() == HomeScreen.FAST_TICK
+
+        # an idle table still picks up a torrent starting within seconds
+        screen._transferring = False
+        assert screen._next_tick_interval() == HomeScreen.SLOW_TICK
+
+
+async def test_ticks_stop_when_the_daemon_goes_away(
+    app: TorrraApp, monkeypatch: pytest.MonkeyPatch
+):
+    async with app.run_test() as pilot:
+        screen = cast(HomeScreen, app.screen)
+        await pilot.pause()
+
+        lost = MagicMock(side_effect=DaemonError("the daemon closed the connection"))
+        monkeypatch.setattr(get_download_manager(), "get_session_stats", lost)
+        screen.refresh_downloads_now()
+        await pilot.pause()
+
+        assert "Daemon Unreachable" in [n.title for n in app._notifications]
+        assert screen._tick_timer is None
+
+
+async def test_a_refresh_asked_for_mid_tick_runs_after_it(app: TorrraApp):
+    async with app.run_test() as pilot:
+        screen = cast(HomeScreen, app.screen)
+        await pilot.pause()
+
+        screen._ticking = True  # waiting on the session
+        screen.refresh_downloads_now()
+        assert screen._tick_again and screen._tick_timer is None
+
+        screen._ticking = False
+        await screen._tick()
+        await pilot.pause()
+        assert not screen._tick_again and screen._tick_timer is not None
+
+
+async def test_refresh_rate_stays_off_the_status_bar_by_default(app: TorrraApp):
+    async with app.run_test() as pilot:
+        screen = cast(HomeScreen, app.screen)
+        screen.refresh_downloads_now()
+        await pilot.pause()
+        content = str(screen.query_one(StatusBar)._stats_widget.content)
+        assert "tick:" not in content
+
+
 def test_status_bar_formatting():
     sb = StatusBar()
     assert "? for shortcuts" in str(sb._shortcuts_widget.content)
@@ -724,3 +977,172 @@ def test_status_bar_formatting():
         str(sb._stats_widget.content)
         == "[b]↓[/b] 2.00 MB/s · [b]↑[/b] 1.00 KB/s · [b]DHT:[/b] 42 nodes"
     )
+
+
+@pytest.fixture
+def broad_search_app(app: TorrraApp, mock_indexer: MagicMock, mock_config: Config):
+    mock_indexer.search.return_value = [
+        Torrent(
+            magnet_uri=f"magnet:?xt=urn:btih:broad{i}",
+            title=f"Broad Release {i}",
+            size=1_000_000 + i,
+            seeders=i,
+            leechers=i,
+            source="MockIndexer",
+        )
+        for i in range(1200)
+    ]
+    return app
+
+
+async def test_broad_results_render_the_first_screenful_synchronously(
+    broad_search_app: TorrraApp,
+):
+    async with broad_search_app.run_test() as pilot:
+        await pilot.pause()
+        search = broad_search_app.screen.query_one(SearchContent)
+        table = _table_of(broad_search_app)
+
+        search._render_rows()
+        # only the first chunk exists before control returns to the loop...
+        assert table.row_count == SearchContent.FIRST_CHUNK
+        assert "results (1200)" in str(table.border_title)
+
+        await pilot.pause()
+        # ...and the rest streams in without losing numbering
+        assert table.row_count == 1200
+        assert _numbers(table)[-1] == "1200"
+        assert _col_width(table, "no_col") >= len("1200")
+
+
+async def test_a_new_render_drops_chunks_queued_by_the_last_one(
+    broad_search_app: TorrraApp,
+):
+    async with broad_search_app.run_test() as pilot:
+        await pilot.pause()
+        search = broad_search_app.screen.query_one(SearchContent)
+
+        search._render_rows()
+        await pilot.press("f")  # re-renders before the old chunks drain
+        await pilot.pause()
+
+        # broad0 has no seeders, so exactly one row is filtered out and no
+        # leftover chunk from the unfiltered render sneaks back in
+        assert _table_of(broad_search_app).row_count == 1199
+
+
+def _gated_healthcheck(
+    monkeypatch: pytest.MonkeyPatch, error: str | None
+) -> tuple[IndexerHealthcheck, threading.Event]:
+    # a probe that answers `error` once released, like a slow server would
+    release = threading.Event()
+
+    async def _probe(self: IndexerHealthcheck, indexer: Indexer) -> str | None:
+        await asyncio.to_thread(release.wait)
+        return error
+
+    monkeypatch.setattr(IndexerHealthcheck, "_probe", _probe)
+    indexer = Indexer(name="jackett", url="http://mock.indexer.url", api_key="key")
+    return IndexerHealthcheck([indexer]).start(), release
+
+
+async def test_search_waits_for_healthcheck(
+    monkeypatch: pytest.MonkeyPatch, mock_indexer: MagicMock
+):
+    mock_indexer.search.return_value = list(SORT_FIXTURE)
+    healthcheck, release = _gated_healthcheck(monkeypatch, None)
+    app = TorrraApp(
+        indexer=healthcheck.indexers[0],
+        use_cache=False,
+        search_query="arch",
+        healthcheck=healthcheck,
+    )
+
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        # the app is up and the search is queued behind the probe
+        assert isinstance(app.screen, HomeScreen)
+        mock_indexer.search.assert_not_awaited()
+
+        release.set()
+        await healthcheck.wait()
+        await pilot.pause()
+        await pilot.pause()
+        assert _titles(_table_of(app)) == [t.title for t in SORT_FIXTURE]
+
+
+async def test_failed_healthcheck_notifies_and_skips_search(
+    monkeypatch: pytest.MonkeyPatch, mock_indexer: MagicMock
+):
+    healthcheck, release = _gated_healthcheck(monkeypatch, "could not connect")
+    release.set()
+    app = TorrraApp(
+        indexer=healthcheck.indexers[0],
+        use_cache=False,
+        search_query="arch",
+        healthcheck=healthcheck,
+    )
+
+    async with app.run_test() as pilot:
+        await healthcheck.wait()
+        await pilot.pause()
+        await pilot.pause()
+
+        titles = [n.title for n in app._notifications]
+        assert "Jackett Unavailable" in titles
+        assert "Search Failed" in titles
+        mock_indexer.search.assert_not_awaited()
+        assert _table_of(app).has_class("hidden")
+
+
+async def test_a_cache_miss_reads_the_cache_once(mock_indexer: MagicMock):
+    calls: list[bool] = []
+
+    async def _stream(query: str, use_cache: bool = True, refresh: bool = False):
+        calls.append(refresh)
+        yield SORT_FIXTURE[:1]
+
+    mock_indexer.search_stream = _stream
+    app = TorrraApp(
+        indexer=Indexer(name="jackett", url="http://mock.indexer.url", api_key="k"),
+        use_cache=True,
+        search_query="linux",
+    )
+
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        assert mock_indexer.cached_results.call_count == 1
+        # the stream skips the read the widget just made, yet still stores
+        assert calls == [True]
+
+
+async def test_stale_cache_paints_then_refreshes_in_place(mock_indexer: MagicMock):
+    stale = SORT_FIXTURE[:2]
+    mock_indexer.cached_results.return_value = (stale, True)
+    release = asyncio.Event()
+
+    async def _fresh(query: str, use_cache: bool = True, refresh: bool = False):
+        assert refresh  # a revalidation never reads the cache
+        await release.wait()
+        yield [SORT_FIXTURE[1], SORT_FIXTURE[3]]
+
+    mock_indexer.search_stream = _fresh
+    app = TorrraApp(
+        indexer=Indexer(name="jackett", url="http://mock.indexer.url", api_key="k"),
+        use_cache=True,
+        search_query="linux",
+    )
+
+    async with app.run_test() as pilot:
+        await pilot.pause()
+        table = _table_of(app)
+        # the cached rows are up before the indexer has answered
+        assert _titles(table) == ["Ubuntu 24.04", "Arch Linux ISO"]
+        table.move_cursor(row=1)
+
+        release.set()
+        await pilot.pause()
+        await pilot.pause()
+        assert _titles(table) == ["Arch Linux ISO", "Fedora 40"]
+        # the cursor follows its row through the refresh
+        assert table.cursor_row == 0
@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -30,6 +33,31 @@ def test_search_command_calls_runner(monkeypatch: pytest.MonkeyPatch):
     mock_run_func.assert_called_once_with(no_cache=True, search_query="arch linux iso")
 
 
+def test_default_indexer_all_searches_every_configured_indexer(
+    monkeypatch: pytest.MonkeyPatch, mock_config: Config
+):
+    # "all" has no url/api key of its own; it must reach the fan-out runner
+    mock_config.update(
+        {
+            "indexers.default": "all",
+            "indexers.jackett.url": "http://jackett.url",
+            "indexers.jackett.api_key": "key",
+        }
+    )
+    mock_app = MagicMock()
+    monkeypatch.setattr("torrra.app.TorrraApp", mock_app)
+    monkeypatch.setattr("torrra.utils.indexer.IndexerHealthcheck", MagicMock())
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["search", "arch linux iso"])
+
+    assert result.exit_code == 0
+    assert "not configured" not in result.output
+    [jackett] = mock_app.call_args.kwargs["indexers"]
+    assert jackett.name == "jackett"
+    mock_app.return_value.run.assert_called_once()
+
+
 def test_prowlarr_command_calls_runner_with_cache(monkeypatch: pytest.MonkeyPatch):
     # tests that the "prowlarr" command calls the correct underlying function
     mock_run_func = MagicMock()
@@ -51,13 +79,25 @@ def test_prowlarr_command_calls_runner_with_cache(monkeypatch: pytest.MonkeyPatc
     assert result.exit_code == 0
     mock_run_func.assert_called_once_with(
         name="prowlarr",
-        indexer_cls_str="torrra.indexers.prowlarr.ProwlarrIndexer",
         url="http://mock.indexer.url",
         api_key="mock_api_key",
         no_cache=True,
     )
 
 
+def test_daemon_command_refuses_to_start_a_second_daemon(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # a client connecting means a daemon already owns the session
+    monkeypatch.setattr("torrra.core.rpc.get_daemon_client", lambda: MagicMock())
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["daemon"])
+
+    assert result.exit_code == 0
+    assert "already running" in result.output
+
+
 @pytest.mark.usefixtures("mock_config")
 def test_config_commands_flow():
     # tests the full get/set/list flow for the config command
@@ -227,3 +267,71 @@ def test_downloads_command_calls_runner_without_indexer(
 
     assert result.exit_code == 0
     mock_run_func.assert_called_once_with(no_cache=True, show_downloads=True)
+
+
+# --------------------------------------------------
+# IMPORT BUDGET
+# --------------------------------------------------
+HEAVY_MODULES = ("libtorrent", "textual", "httpx")
+# generous enough for slow CI runners; the cheap paths sit around 10-20ms today
+IMPORT_BUDGET_US = 100_000
+
+
+def _import_times(args: list[str], env: dict[str, str]) -> dict[str, int]:
+    # module -> self time in microseconds, as reported by -X importtime
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--version"],
+        ["--help"],
+        ["config", "get", "general.theme"],
+        ["config", "list"],
+        pytest.param(
+            ["config", "set", "general.theme", "textual-dark"],
+            # the config dir there is a known folder, not read from the env
+            marks=pytest.mark.skipif(sys.platform == "win32", reason="writes ~"),
+        ),
+        *([name, "--help"] for name in cli.commands),
+        *(["config", name, "--help"] for name in cli.commands["config"].commands),  # type: ignore[attr-defined]
+    ],
+    ids=" ".join,
+)
+def test_cli_import_budget(args: list[str], tmp_path: Path):
+    # cheap paths must not pay for the TUI, the HTTP client or the session
+    # the config dir under tmp_path on linux and macos, so `config set` writes there
+    home = {"HOME": str(tmp_path), "XDG_CONFIG_HOME": str(tmp_path)}
+    env = {**os.environ, **home, "NO_COLOR": "1"}
+    baseline = _import_times(["-c", "pass"], env)
+    times = _import_times(["-m", "torrra", *args], env)
+
+    loaded = [m for m in times if m.split(".")[0] in HEAVY_MODULES]
+    assert not loaded
+
+    spent = sum(us for name, us in times.items() if name not in baseline)
+    assert spent < IMPORT_BUDGET_US, f"imports took {spent}us"
+
+
+def test_launcher_modules_import_light(tmp_path: Path):
+    # the launcher and shared types load before the healthcheck decides whether
+    # the app runs at all, so they must defer the heavy packages too
+    env = {**os.environ, "XDG_CONFIG_HOME": str(tmp_path)}
+    code = "import torrra._types, torrra.core.cache, torrra.core.results, torrra.utils.indexer"
+    times = _import_times(["-c", code], env)
+
+    assert not [m for m in times if m.split(".")[0] in HEAVY_MODULES]
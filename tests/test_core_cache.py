@@ -1,8 +1,10 @@
+import time
 from pathlib import Path
 
 import pytest
 
-from torrra.core.cache import Cache
+from torrra.core.cache import HEALTHCHECK, SEARCH, Cache, CachePolicy
+from torrra.core.constants import DEFAULT_CACHE_MAX_AGE, DEFAULT_CACHE_TTL
 
 
 @pytest.fixture
@@ -30,3 +32,75 @@ def test_make_key_uniqueness(cache: Cache):
     assert key1 != key2
     assert key1 != key3
     assert key2 != key3
+
+
+@pytest.mark.usefixtures("mock_config")
+def test_lookup_tells_fresh_from_stale(cache: Cache):
+    cache.set("fresh", [1])
+    cache.set("stale", [2], tag=time.time() - DEFAULT_CACHE_TTL - 1)
+
+    assert cache.lookup("fresh") == ([1], False)
+    assert cache.lookup("stale") == ([2], True)
+    assert cache.lookup("missing") is None
+
+
+@pytest.mark.usefixtures("mock_config")
+def test_entries_outlive_the_ttl_until_max_age(cache: Cache):
+    cache.set("key", [1])
+    _, expire_time = cache.get("key", expire_time=True)
+
+    # still around to be served stale once the ttl has passed
+    assert expire_time - time.time() > DEFAULT_CACHE_TTL
+    assert expire_time - time.time() <= DEFAULT_CACHE_MAX_AGE
+
+
+def test_namespace_picks_the_policy(tmp_path: Path):
+    cache = Cache(
+        tmp_path / "ns",
+        policies={SEARCH: CachePolicy(10, 100), HEALTHCHECK: CachePolicy(5)},
+    )
+    try:
+        cache.set(cache.make_key(SEARCH, "q"), 1)
+        cache.set(cache.make_key(HEALTHCHECK, "h"), 2)
+        cache.set("other", 3, expire=50)  # an explicit expire still wins
+
+        def ttl(key: str) -> float:
+            _, expire_time = cache.get(key, expire_time=True)
+            return expire_time - time.time()
+
+        assert 99 < ttl(cache.make_key(SEARCH, "q")) <= 100
+        assert 4 < ttl(cache.make_key(HEALTHCHECK, "h")) <= 5
+        assert 49 < ttl("other") <= 50
+    finally:
+        cache.close()
+
+
+def test_counts_hits_misses_and_evictions(cache: Cache):
+    key = cache.make_key(SEARCH, "q")
+    cache.set(key, 1)
+    cache.set(cache.make_key(SEARCH, "gone"), 2, expire=0.01)
+    cache.lookup(key)
+    cache.lookup(cache.make_key(SEARCH, "missing"))
+    cache.lookup(cache.make_key(HEALTHCHECK, "missing"))
+
+    assert (cache.stats[SEARCH].hits, cache.stats[SEARCH].misses) == (1, 1)
+    assert cache.stats[HEALTHCHECK].misses == 1
+
+    time.sleep(0.05)
+    assert cache.prune() == 1
+    assert cache.evictions == 1
+    assert len(cache) == 1
+
+
+def test_set_culls_expired_entries_and_counts_them(cache: Cache):
+    for i in range(3):
+        cache.set(f"gone{i}", i, expire=0.01)
+    cache.set("kept", 0)
+    time.sleep(0.05)
+
+    # the write itself makes room; nothing waits for a prune
+    cache.set("new", 1)
+    cache.set("kept", 2)
+
+    assert cache.evictions == 3
+    assert sorted(cache) == ["kept", "new"]
@@ -0,0 +1,93 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from diskcache import Cache as _Cache
+
+from torrra._types import Torrent
+from torrra.core.cache import Cache
+from torrra.core.codec import decode_results, encode_results
+
+TRACKERS = "&tr=udp%3A%2F%2Ftracker.opentrackr.org%3A1337&tr=udp%3A%2F%2Fopen.demonii.com%3A1337"
+
+
+def _results(n: int) -> list[Torrent]:
+    return [
+        Torrent(
+            magnet_uri=f"magnet:?xt=urn:btih:{i:040x}&dn=release.{i}{TRACKERS}",
+            title=f"Some Linux Distro {i % 40}.{i % 12} x86_64 DVD ISO",
+            size=700_000_000 + i * 1024,
+            seeders=i % 977,
+            leechers=i % 131,
+            source=("1337x", "ThePirateBay", "Nyaa", "RuTracker")[i % 4],
+        )
+        for i in range(n)
+    ]
+
+
+def test_round_trip_is_exact():
+    torrents = [
+        Torrent(f"magnet:?xt=urn:btih:{'ab' * 20}&dn=x", "Tïtle ✓", 15, 3, 4, "a"),
+        # uppercase hex and base32 can't be rebuilt from bytes; kept as text
+        Torrent(f"magnet:?xt=urn:btih:{'AB' * 20}", "", 0, 0, 0, "a"),
+        Torrent(
+            "magnet:?xt=urn:btih:MFRGGZDFMZTWQ2LKNNWG23TPOBYXE43U", "b", 2, 1, 1, "b"
+        ),
+        Torrent("http://indexer/dl/1", "c", 10, 5, 0, "b", file_priorities=[1, 0]),
+    ]
+
+    decoded = decode_results(encode_results(torrents))
+
+    assert decoded == torrents
+    assert decode_results(encode_results([])) == []
+
+    floats = [Torrent("magnet:?xt=urn:btih:x", "t", 1.5, 0, 0, "s")]
+    assert type(decode_results(encode_results(floats))[0].size) is float
+
+
+def test_unencodable_values_are_refused():
+    odd = Torrent("magnet:?xt=urn:btih:x", "t", 1, "many", 0, "s")  # pyright: ignore[reportArgumentType]
+    with pytest.raises(TypeError):
+        encode_results([odd])
+    # a column mixing ints and floats couldn't come back exactly either
+    mixed = [Torrent("m", "t", 1, 0, 0, "s"), Torrent("m", "t", 1.5, 0, 0, "s")]
+    with pytest.raises(TypeError):
+        encode_results(mixed)
+
+    with pytest.raises(ValueError):
+        decode_results(b"not a result set")
+
+
+def test_benchmark_cache_hit_latency_and_size(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    best_ms: Callable[[Callable[[], object]], float],
+):
+    """Benchmark: the columnar blob vs the pickled list of dicts it replaced."""
+    torrents = _results(5000)
+    before = Cache(tmp_path / "dicts")
+    after = Cache(tmp_path / "columns")
+    empty = before.volume()
+    # plain diskcache set: these caches aren't bound to a config
+    _Cache.set(before, "key", [t.to_dict() for t in torrents])
+    _Cache.set(after, "key", encode_results(torrents))
+
+    def _hit_before() -> list[Torrent]:
+        return [Torrent.from_dict(d) for d in before.get("key")]
+
+    def _hit_after() -> list[Torrent]:
+        return decode_results(after.get("key"))
+
+    assert _hit_before() == _hit_after() == torrents
+    before_ms, after_ms = best_ms(_hit_before), best_ms(_hit_after)
+    before_kb = (before.volume() - empty) / 1024
+    after_kb = (after.volume() - empty) / 1024
+    before.close()
+    after.close()
+
+    with capsys.disabled():
+        print(
+            f"\n{len(torrents)} results: dicts {before_ms:.1f}ms/{before_kb:,.0f}KiB, "
+            f"columns {after_ms:.1f}ms/{after_kb:,.0f}KiB "
+            f"({before_ms / after_ms:.1f}x faster, {before_kb / after_kb:.1f}x smaller)"
+        )
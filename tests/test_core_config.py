@@ -1,3 +1,7 @@
+import asyncio
+import stat
+from pathlib import Path
+
 import pytest
 
 from torrra.core import config as config_module
@@ -67,3 +71,101 @@ def test_config_list_flattens_correctly(mock_config: Config):
     assert "new.section.bool=true" in config_list
     # check a default value is also present
     assert "general.download_in_external_client=false" in config_list
+
+
+@pytest.fixture
+def saves(mock_config: Config, monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    # counts writes to disk
+    calls: list[int] = []
+    original = mock_config._save_config
+
+    def _counting_save() -> None:
+        calls.append(1)
+        original()
+
+    monkeypatch.setattr(mock_config, "_save_config", _counting_save)
+    return calls
+
+
+def test_config_update_writes_once(mock_config: Config, saves: list[int]):
+    mock_config.update(
+        {"indexers.jackett.url": "http://x", "indexers.jackett.api_key": "k"}
+    )
+
+    assert len(saves) == 1
+    assert Config().get("indexers.jackett.api_key") == "k"
+
+
+def test_config_set_skips_unchanged_values(mock_config: Config, saves: list[int]):
+    mock_config.set("general.theme", "textual-dark")
+    assert saves == []
+
+    # equal but of another type is still a change
+    mock_config.set("general.max_retries", str(mock_config.get("general.max_retries")))
+    mock_config.set("general.use_cache", "1")
+    assert len(saves) == 1
+    assert mock_config.get("general.use_cache") == 1
+
+
+def test_config_batch_rolls_back_on_error(mock_config: Config, saves: list[int]):
+    with pytest.raises(ConfigError), mock_config.batch():
+        mock_config.set("general.theme", "dracula")
+        mock_config.set("general.theme.nested", "boom")
+
+    assert saves == []
+    assert mock_config.get("general.theme") == "textual-dark"
+
+
+def test_config_failed_write_keeps_previous_file(
+    mock_config: Config, monkeypatch: pytest.MonkeyPatch
+):
+    def _broken_dump(*_: object) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr("tomli_w.dump", _broken_dump)
+    with pytest.raises(OSError, match="disk full"):
+        mock_config.set("general.theme", "dracula")
+
+    assert Config().get("general.theme") == "textual-dark"
+    assert list(config_module.CONFIG_DIR.iterdir()) == [config_module.CONFIG_FILE]
+
+
+def test_config_write_keeps_a_symlinked_file_and_its_mode(
+    mock_config: Config, tmp_path: Path
+):
+    # dotfile managers link config.toml in from a repo elsewhere
+    dotfile = tmp_path / "dotfiles" / "config.toml"
+    dotfile.parent.mkdir()
+    config_module.CONFIG_FILE.rename(dotfile)
+    dotfile.chmod(0o640)
+    config_module.CONFIG_FILE.symlink_to(dotfile)
+
+    mock_config.set("general.theme", "dracula")
+
+    assert config_module.CONFIG_FILE.is_symlink()
+    assert stat.S_IMODE(dotfile.stat().st_mode) == 0o640
+    assert Config().get("general.theme") == "dracula"
+
+
+async def test_config_debounced_sets_share_one_write(
+    mock_config: Config, saves: list[int], monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(Config, "SAVE_DELAY", 0.05)
+    for theme in ("dracula", "nord", "gruvbox"):
+        mock_config.set("general.theme", theme, debounce=True)
+    assert saves == []
+
+    await asyncio.sleep(0.1)
+    assert len(saves) == 1
+    assert Config().get("general.theme") == "gruvbox"
+
+
+async def test_config_flush_writes_pending_changes(
+    mock_config: Config, saves: list[int]
+):
+    mock_config.set("general.theme", "nord", debounce=True)
+    mock_config.flush()
+
+    assert len(saves) == 1
+    mock_config.flush()  # nothing left to write
+    assert len(saves) == 1
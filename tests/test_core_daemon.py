@@ -0,0 +1,331 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from torrra._types import Torrent, TorrentState, TorrentStatus
+from torrra.core import db as db_module
+from torrra.core import rpc as rpc_module
+from torrra.core.config import Config
+from torrra.core.daemon import Daemon
+from torrra.core.download import get_download_manager
+from torrra.core.exceptions import DaemonError, IndexerError
+from torrra.core.remote import RemoteDownloadManager, RemoteTorrentManager
+from torrra.core.rpc import DaemonClient
+
+MAGNET = "magnet:?xt=urn:btih:" + "ab" * 20 + "&dn=daemon+test"
+
+
+@pytest.fixture
+def socket_path(monkeypatch: pytest.MonkeyPatch):
+    # tmp_path runs past the ~100 bytes a unix socket path may have
+    short_dir = Path(tempfile.mkdtemp(prefix="torrra-"))
+    monkeypatch.setattr(rpc_module, "SOCKET_PATH", short_dir / "daemon.sock")
+    yield rpc_module.SOCKET_PATH
+    shutil.rmtree(short_dir, ignore_errors=True)
+
+
+@asynccontextmanager
+async def running_daemon() -> AsyncIterator[Daemon]:
+    daemon = Daemon()
+    task = asyncio.create_task(daemon.serve())
+    while not rpc_module.SOCKET_PATH.exists():
+        await asyncio.sleep(0.01)
+    try:
+        yield daemon
+    finally:
+        daemon.stop()
+        await task
+
+
+async def call(client: DaemonClient, method: str, **params: Any) -> Any:
+    # the client blocks, and the daemon answers on this very loop
+    return await asyncio.to_thread(client.call, method, **params)
+
+
+@pytest.mark.usefixtures("socket_path")
+async def test_scripts_add_pause_and_remove_torrents():
+    async with running_daemon():
+        client = DaemonClient.connect()
+
+        record = await call(client, "add", uri=MAGNET, paused=True)
+        assert record["title"] == "daemon test"
+        assert record["is_paused"]
+
+        await call(client, "resume", magnet_uri=MAGNET)
+        [listed] = await call(client, "status")
+        assert listed["magnet_uri"] == MAGNET
+        assert not listed["is_paused"]
+
+        await call(client, "remove", magnet_uri=MAGNET)
+        assert await call(client, "status") == []
+        client.close()
+
+
+@pytest.mark.usefixtures("socket_path")
+async def test_bad_calls_are_answered_with_errors():
+    async with running_daemon():
+        client = DaemonClient.connect()
+
+        with pytest.raises(DaemonError, match="no such method"):
+            await call(client, "nope")
+        with pytest.raises(DaemonError, match="unexpected keyword"):
+            await call(client, "status", bogus=1)
+        with pytest.raises(DaemonError, match="no such torrent"):
+            await call(client, "pause", magnet_uri=MAGNET)
+
+        # a line that isn't json gets a parse error, and the connection lives on
+        raw = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        await asyncio.to_thread(raw.connect, str(rpc_module.SOCKET_PATH))
+        reader = raw.makefile("rb")
+        raw.sendall(b"{not json\n")
+        reply = json.loads(await asyncio.to_thread(reader.readline))
+        assert reply["error"]["code"] == rpc_module.PARSE_ERROR
+        raw.sendall(b'{"jsonrpc": "2.0", "id": 7, "method": "status"}\n')
+        reply = json.loads(await asyncio.to_thread(reader.readline))
+        assert reply == {"jsonrpc": "2.0", "id": 7, "result": []}
+        reader.close()
+        raw.close()
+
+        assert await call(client, "status") == []
+        client.close()
+
+
+@pytest.mark.usefixtures("socket_path")
+async def test_ui_attaches_to_a_running_daemon():
+    async with running_daemon():
+        # what the ui's getter hands out once a daemon answers
+        rpc_module.get_daemon_client.cache_clear()
+        get_download_manager.cache_clear()
+        assert isinstance(get_download_manager(), RemoteDownloadManager)
+        with pytest.raises(DaemonError, match="already running"):
+            Daemon()
+
+        client = DaemonClient.connect()
+        dm, tm = RemoteDownloadManager(client), RemoteTorrentManager(client)
+        torrent = Torrent(MAGNET, "attached", 0, 0, 0, "test")
+
+        version = await asyncio.to_thread(lambda: tm.version)
+        await asyncio.to_thread(tm.add_torrent, torrent, [4, 0])
+        await asyncio.to_thread(dm.add_torrent, MAGNET, True)
+        assert await asyncio.to_thread(lambda: tm.version) > version
+        [record] = await asyncio.to_thread(tm.get_all_torrents)
+        assert record["title"] == "attached"
+        assert record["file_priorities"] == [4, 0]
+
+        status = await asyncio.to_thread(dm.get_torrent_status, MAGNET)
+        assert status is not None
+        assert isinstance(status["torrent_state"], TorrentState)
+        assert dm.statuses[MAGNET] == status
+
+        await asyncio.to_thread(dm.remove_torrent, MAGNET)
+        await asyncio.to_thread(tm.remove_torrent, MAGNET)
+        assert await asyncio.to_thread(tm.get_torrent, MAGNET) is None
+        assert MAGNET not in dm.statuses
+        client.close()
+
+
+@pytest.mark.usefixtures("socket_path")
+def test_no_daemon_starts_beside_a_ui_running_its_own_session():
+    fcntl = pytest.importorskip("fcntl")
+    # what a standalone ui in another process holds
+    db_module.DB_DIR.mkdir(parents=True, exist_ok=True)
+    lock = db_module.DB_DIR / "session.lock"
+    fd = os.open(lock, os.O_RDWR | os.O_CREAT)
+    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    try:
+        with pytest.raises(DaemonError, match="already running a session"):
+            Daemon()
+    finally:
+        os.close(fd)
+
+    Daemon()  # the ui is gone, so the session is free to take
+    fd = os.open(lock, os.O_RDWR)
+    with pytest.raises(OSError):  # and now a ui can't take it from the daemon
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    os.close(fd)
+
+
+async def test_the_socket_is_private_to_its_user(socket_path: Path):
+    async with running_daemon():
+        assert socket_path.stat().st_mode & 0o777 == 0o600
+
+    # a directory others can get into could have the socket swapped under us
+    socket_path.parent.chmod(0o755)
+    with pytest.raises(DaemonError, match="only you can access"):
+        await Daemon().serve()
+    assert not socket_path.exists()
+
+
+@pytest.mark.usefixtures("socket_path")
+async def test_poll_sends_each_connection_only_what_changed():
+    daemon = Daemon()
+    first = TorrentStatus(progress=10.0, torrent_state=TorrentState.DOWNLOADING)
+    second = TorrentStatus(progress=0.0, torrent_state=TorrentState.PAUSED)
+    daemon.dm.statuses = {"a": first, "b": second}
+    sent: dict[str, TorrentStatus] = {}
+
+    update = daemon.poll(sent)
+    assert set(update["changed"]) == {"a", "b"}
+    assert update["changed"]["a"]["torrent_state"] == "DOWNLOADING"
+    assert update["full"]
+    assert daemon.poll(sent) == {
+        "changed": {},
+        "removed": [],
+        "full": False,
+        "version": daemon.tm.version,
+        "stats": daemon.dm.get_session_stats(),
+    }
+
+    daemon.dm.statuses["a"] = TorrentStatus(first, progress=20.0)
+    del daemon.dm.statuses["b"]
+    update = daemon.poll(sent)
+    assert list(update["changed"]) == ["a"]
+    assert update["removed"] == ["b"]
+    # another connection starts from nothing
+    assert list(daemon.poll({})["changed"]) == ["a"]
+
+
+@pytest.mark.usefixtures("socket_path")
+async def test_the_registry_version_comes_with_each_poll(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    async with running_daemon():
+        client = DaemonClient.connect()
+        dm, tm = RemoteDownloadManager(client), RemoteTorrentManager(client)
+        await asyncio.to_thread(dm.poll_status_updates)
+
+        calls: list[str] = []
+        real_call = client.call
+
+        def counting(method: str, **params: Any) -> Any:
+            calls.append(method)
+            return real_call(method, **params)
+
+        monkeypatch.setattr(client, "call", counting)
+        version = tm.version
+        assert tm.version == version and calls == []  # ticks ask nothing more
+
+        # a write makes the next read ask, until a poll brings it again
+        torrent = Torrent(MAGNET, "polled", 0, 0, 0, "test")
+        await asyncio.to_thread(tm.add_torrent, torrent)
+        assert await asyncio.to_thread(lambda: tm.version) > version
+        await asyncio.to_thread(dm.poll_status_updates)
+        calls.clear()
+        assert tm.version > version and calls == []
+        client.close()
+
+
+@pytest.mark.usefixtures("socket_path")
+async def test_a_ui_tick_waits_on_the_daemon_off_the_loop():
+    async with running_daemon() as daemon:
+        daemon.dm.statuses = {MAGNET: TorrentStatus(progress=10.0)}
+        client = DaemonClient.connect()
+        dm = RemoteDownloadManager(client)
+
+        # the daemon answers on this very loop, so a blocking call would hang
+        stats, changed = await asyncio.wait_for(dm.refresh(), 5)
+        assert "download_rate" in stats
+        assert changed[MAGNET]["progress"] == 10.0
+        assert dm.statuses == changed
+        client.close()
+
+
+@pytest.mark.usefixtures("socket_path")
+async def test_a_lost_connection_is_dropped_and_dialled_again():
+    async with running_daemon() as daemon:
+        rpc_module.get_daemon_client.cache_clear()  # Daemon() found none
+        client = rpc_module.get_daemon_client()
+        assert client is not None
+        dm = RemoteDownloadManager(client)
+        dm.statuses = {"stale": TorrentStatus(progress=1.0)}
+
+        # the daemon hangs up on its clients, as it does when it restarts
+        while not daemon._writers:
+            await asyncio.sleep(0.01)
+        for writer in list(daemon._writers):
+            writer.close()
+        with pytest.raises(DaemonError):
+            await call(client, "status")
+        assert rpc_module.get_daemon_client.cache_info().currsize == 0
+
+        # the next call reconnects, and the first poll replaces the mirror
+        await asyncio.to_thread(dm.poll_status_updates)
+        assert "stale" not in dm.statuses
+    # once it's gone, the dead connection fails and the next dial says so
+    with pytest.raises(DaemonError):
+        await call(client, "status")
+    with pytest.raises(DaemonError, match="no daemon listening"):
+        await call(client, "status")
+    client.close()
+
+
+async def test_an_answer_out_of_turn_drops_the_connection():
+    ours, theirs = socket.socketpair()
+    client = DaemonClient(ours)
+    theirs.sendall(b'{"jsonrpc": "2.0", "id": 99, "result": []}\n')
+
+    with pytest.raises(DaemonError, match="out of turn"):
+        await asyncio.to_thread(client.call, "status")
+    assert client._sock is None
+    theirs.close()
+
+
+@pytest.mark.usefixtures("socket_path")
+async def test_search_merges_indexers_and_skips_failures(
+    monkeypatch: pytest.MonkeyPatch, mock_config: Config
+):
+    mock_config.update(
+        {
+            "indexers.default": "all",
+            "indexers.jackett.url": "http://jackett.url",
+            "indexers.jackett.api_key": "key",
+            "indexers.prowlarr.url": "http://prowlarr.url",
+            "indexers.prowlarr.api_key": "key",
+        }
+    )
+    failing = {"prowlarr"}
+
+    class FakeIndexer:
+        def __init__(self, url: str, api_key: str, **_: Any) -> None:
+            self.name = "jackett" if "jackett" in url else "prowlarr"
+
+        async def search(self, query: str, use_cache: bool = True) -> list[Torrent]:
+            if self.name in failing:
+                raise IndexerError(f"{self.name} is down")
+            # one shared release, and seeders as some indexers send them
+            shared = Torrent(f"magnet:?xt=urn:btih:{'ab' * 20}", query, 1, 5, 0, "")
+            return [
+                shared,
+                *(
+                    Torrent(f"magnet:?{self.name}{n}", query, 1, n, 0, self.name)
+                    for n in (1, "30", 2)
+                ),
+            ]
+
+        async def aclose(self) -> None:
+            pass
+
+    monkeypatch.setattr("torrra.core.daemon.lazy_import", lambda _: FakeIndexer)
+    daemon = Daemon()
+
+    results = await daemon.search("linux")
+    assert [r["seeders"] for r in results] == ["30", 5, 2, 1]
+    assert {r["source"] for r in results} == {"jackett", ""}
+
+    failing.clear()
+    results = await daemon.search("linux")
+    assert len(results) == 7  # the shared release just once
+    assert [r["seeders"] for r in results[:3]] == ["30", "30", 5]
+
+    failing.update({"jackett", "prowlarr"})
+    with pytest.raises(DaemonError, match="jackett is down"):
+        await daemon.search("linux")
@@ -0,0 +1,124 @@
+import sqlite3
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+
+import pytest
+
+from torrra._types import Torrent
+from torrra.core import db as db_module
+from torrra.core.torrent import TorrentManager
+
+ROWS = 10_000
+
+
+def _magnet(i: int) -> str:
+    return f"magnet:?xt=urn:btih:{i:040x}"
+
+
+def test_connection_is_shared_and_in_wal_mode():
+    with db_module.get_db_connection() as first:
+        mode = first.execute("PRAGMA journal_mode").fetchone()[0]
+    with db_module.get_db_connection() as second:
+        assert second is first
+    assert mode == "wal"
+
+
+def test_failed_block_is_rolled_back():
+    tm = TorrentManager()
+    with pytest.raises(RuntimeError), db_module.get_db_connection() as conn:
+        conn.execute(
+            "INSERT INTO torrents (magnet_uri, title) VALUES (?, ?)",
+            (_magnet(1), "half written"),
+        )
+        raise RuntimeError()
+
+    assert tm.get_torrent(_magnet(1)) is None
+
+
+def test_reconnects_when_the_database_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    with db_module.get_db_connection() as before:
+        pass
+    monkeypatch.setattr(db_module, "DB_FILE", tmp_path / "other.db")
+    with db_module.get_db_connection() as after:
+        assert after is not before
+
+
+OPS = 2_000
+
+
+def _mixed_ops(connect: Callable[[], AbstractContextManager[sqlite3.Connection]]):
+    """Run a mix of point reads and writes against a 10k row table."""
+    for i in range(0, OPS, 2):
+        with connect() as conn:
+            conn.execute(
+                "SELECT * FROM torrents WHERE magnet_uri = ?", (_magnet(i * 3 % ROWS),)
+            ).fetchone()
+        with connect() as conn:
+            conn.execute(
+                "UPDATE torrents SET is_paused = ? WHERE magnet_uri = ?",
+                (i % 4, _magnet(i * 7 % ROWS)),
+            )
+            conn.commit()
+
+
+def _fresh_copy(path: Path) -> None:
+    """Copy the torrents table into a new database left in sqlite's defaults.
+
+    journal_mode=wal sticks to a file, so the old code path has to be measured
+    on a database that never had it set, as every database used to be.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("ATTACH ? AS src", (str(db_module.DB_FILE),))
+    (schema,) = conn.execute(
+        "SELECT sql FROM src.sqlite_master WHERE name = 'torrents'"
+    ).fetchone()
+    conn.execute(schema)
+    conn.execute("INSERT INTO torrents SELECT * FROM src.torrents")
+    conn.commit()
+    conn.execute("DETACH src")
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+    conn.close()
+
+
+def test_benchmark_persistent_connection_ops_per_sec(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    best_ms: Callable[..., float],
+):
+    """Benchmark: ops/sec with the shared connection vs one per call."""
+    tm = TorrentManager()
+    for i in range(ROWS):
+        tm.add_torrent(
+            Torrent(
+                magnet_uri=_magnet(i),
+                title=f"torrent {i}",
+                size=i,
+                seeders=0,
+                leechers=0,
+                source="bench",
+            )
+        )
+    baseline = tmp_path / "baseline.db"
+    _fresh_copy(baseline)
+
+    # what every query used to do: mkdir, connect, run, close
+    @contextmanager
+    def _connect_per_call() -> Iterator[sqlite3.Connection]:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(baseline)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    after = OPS / best_ms(lambda: _mixed_ops(db_module.get_db_connection), 3) * 1000
+    before = OPS / best_ms(lambda: _mixed_ops(_connect_per_call), 3) * 1000
+
+    with capsys.disabled():
+        print(
+            f"\n{ROWS} rows: {before:,.0f} ops/s per-call connection, "
+            f"{after:,.0f} ops/s shared connection ({after / before:.1f}x)"
+        )
@@ -1,7 +1,19 @@
+import os
+import time
+from pathlib import Path
+
 import libtorrent as lt
+import pytest
 
-from torrra._types import TorrentStatus
-from torrra.core.download import DownloadManager
+from torrra._types import Torrent, TorrentState, TorrentStatus
+from torrra.core.config import Config
+from torrra.core.download import (
+    DownloadManager,
+    load_metadata,
+    metadata_store,
+    resume_store,
+)
+from torrra.core.torrent import get_torrent_manager
 
 
 def test_state_text_stalled_and_downloading():
@@ -308,3 +320,246 @@ def test_state_map_abi2():
         lt.torrent_status.states.checking_resume_data,
     }
     assert set(DownloadManager._STATE_MAP.keys()) == expected_states
+
+
+def test_built_status_is_classified_once(monkeypatch: pytest.MonkeyPatch):
+    from unittest.mock import MagicMock
+
+    dm = DownloadManager()
+    handle = MagicMock()
+    handle.status.return_value = _status_mock(handle, 0.5)
+    magnet = "magnet:?xt=urn:btih:classified"
+    dm.torrents = {magnet: handle}
+
+    status = dm.get_torrent_status(magnet)
+    assert status is not None
+    assert status["torrent_state"] is TorrentState.DOWNLOADING
+
+    # labels, short labels and groups are all read off the stored state
+    classify = MagicMock(wraps=DownloadManager.classify_state)
+    monkeypatch.setattr(DownloadManager, "classify_state", classify)
+    assert dm.get_torrent_state_text(status) == "Downloading"
+    assert dm.get_torrent_state_text(status, short=True) == "DOWN"
+    assert dm.get_torrent_state(status).group == "Downloading"
+    assert not classify.called
+
+
+def test_every_sidebar_group_has_a_state():
+    from torrra.widgets.sidebar import DOWNLOADS_GROUP
+
+    groups = {state.group for state in TorrentState} - {None}
+    assert groups == set(DOWNLOADS_GROUP)
+
+
+def _status_mock(handle: object, progress: float) -> object:
+    from unittest.mock import MagicMock
+
+    s = MagicMock()
+    s.handle = handle
+    s.state = lt.torrent_status.states.downloading
+    s.progress = progress
+    s.download_rate = 1024
+    s.upload_rate = 0
+    s.total_wanted = 1000
+    s.total_wanted_done = int(progress * 1000)
+    s.errc = None
+    s.error_file = -1
+    s.flags = 0
+    s.is_seeding = False
+    s.is_finished = False
+    s.has_metadata = False
+    s.num_seeds = s.num_peers = s.list_seeds = s.list_peers = 0
+    return s
+
+
+def test_poll_status_updates_delivers_only_changed_torrents():
+    from unittest.mock import MagicMock
+
+    dm = DownloadManager()
+    dm.session = MagicMock()
+    handles = {f"magnet:?xt=urn:btih:{n}": MagicMock() for n in ("a", "b")}
+    dm.torrents = dict(handles)
+    dm._uri_by_handle = {h: uri for uri, h in handles.items()}
+    uri_a, uri_b = handles
+    for handle in handles.values():
+        handle.status.return_value = _status_mock(handle, 0.1)
+
+    # first poll: nothing reported yet, so both are queried directly once
+    dm.session.pop_alerts.return_value = []
+    assert dm.poll_status_updates().keys() == {uri_a, uri_b}
+    dm.session.post_torrent_updates.assert_called_once()
+
+    for handle in handles.values():
+        handle.status.reset_mock()
+
+    # later polls come purely from the alert, without per-handle round-trips
+    alert = MagicMock(spec=lt.state_update_alert)
+    alert.status = [_status_mock(handles[uri_b], 0.5)]
+    dm.session.pop_alerts.return_value = [alert]
+
+    changed = dm.poll_status_updates()
+    assert changed.keys() == {uri_b}
+    assert changed[uri_b]["progress"] == 50.0
+    assert dm.statuses[uri_a]["progress"] == 10.0
+    assert not any(h.status.called for h in handles.values())
+
+    # an update for a torrent removed in the meantime is dropped
+    dm.remove_torrent(uri_b)
+    assert dm.poll_status_updates() == {}
+    assert uri_b not in dm.statuses
+
+
+def test_missing_files_are_checked_once_then_revalidated_lazily(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    from unittest.mock import MagicMock
+
+    dm = DownloadManager()
+    dm.session = MagicMock()
+    dm.session.pop_alerts.return_value = []
+    handle = MagicMock()
+    status = _status_mock(handle, 1.0)
+    status.is_seeding = True
+    status.has_metadata = True
+    status.save_path = str(tmp_path)
+    handle.status.return_value = status
+
+    files = ["a.bin", "b.bin", "c.bin"]
+    fs = handle.torrent_file.return_value.files.return_value
+    fs.num_files.return_value = len(files)
+    fs.file_path.side_effect = files.__getitem__
+    fs.file_flags.return_value = 0
+    for name in files:
+        (tmp_path / name).touch()
+
+    magnet = "magnet:?xt=urn:btih:seed"
+    dm.torrents = {magnet: handle}
+    dm._uri_by_handle = {handle: magnet}
+
+    stats: list[str] = []
+    real_exists = os.path.exists
+
+    def counting_exists(path: str) -> bool:
+        stats.append(path)
+        return real_exists(path)
+
+    monkeypatch.setattr(os.path, "exists", counting_exists)
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+
+    assert dm.get_torrent_status(magnet)["is_missing_files"] is False
+    assert len(stats) == len(files)
+
+    # every further tick is answered from the index
+    (tmp_path / "b.bin").unlink()
+    for _ in range(5):
+        dm.get_torrent_status(magnet)
+        dm.poll_status_updates()
+    assert len(stats) == len(files)
+
+    # once the recheck interval passes, an idle seed is looked at again
+    clock[0] += DownloadManager.MISSING_FILES_RECHECK
+    changed = dm.poll_status_updates()
+    assert changed[magnet]["is_missing_files"] is True
+
+    # a file error drops the cached answer straight away
+    (tmp_path / "b.bin").touch()
+    alert = MagicMock(spec=lt.file_error_alert)
+    alert.handle = handle
+    dm.session.pop_alerts.return_value = [alert]
+    dm.poll_status_updates()
+    assert dm.get_torrent_status(magnet)["is_missing_files"] is False
+
+
+def test_resume_data_is_saved_and_used_when_re_adding(
+    mock_config: Config, tmp_path: Path
+):
+    magnet = "magnet:?xt=urn:btih:0123456789abcdef0123456789abcdef01234567"
+    first_path, second_path = tmp_path / "first", tmp_path / "second"
+
+    mock_config.set("general.download_path", str(first_path))
+    _register(magnet)
+    dm = DownloadManager()
+    dm.add_torrent(magnet)
+    dm.save_all_resume_data()
+
+    key = "0123456789abcdef0123456789abcdef01234567"
+    assert resume_store.get(key) is not None
+
+    # a restart picks the torrent up from its resume data, files and all,
+    # even though new downloads would now go elsewhere
+    mock_config.set("general.download_path", str(second_path))
+    restarted = DownloadManager()
+    restarted.add_torrent(magnet)
+    assert restarted.torrents[magnet].status().save_path == str(first_path)
+
+    restarted.remove_torrent(magnet)
+    assert resume_store.get(key) is None
+
+
+def test_corrupt_resume_data_falls_back_to_a_fresh_add(mock_config: Config):
+    magnet = "magnet:?xt=urn:btih:0123456789abcdef0123456789abcdef01234567"
+    resume_store.put("0123456789abcdef0123456789abcdef01234567", b"not bencoded")
+
+    dm = DownloadManager()
+    dm.add_torrent(magnet)
+    assert dm.torrents[magnet].is_valid()
+
+
+def _torrent_info(name: bytes = b"arch.iso") -> lt.torrent_info:
+    info = {b"name": name, b"piece length": 16384, b"pieces": b"\0" * 20}
+    return lt.torrent_info(lt.bencode({b"info": {**info, b"length": 1000}}))
+
+
+def test_fetched_metadata_is_stored_and_supplied_on_re_add(mock_config: Config):
+    info = _torrent_info()
+    magnet = lt.make_magnet_uri(info)
+    key = str(info.info_hashes().v1)
+
+    dm = DownloadManager()
+    dm.add_torrent(magnet, torrent_info=info)
+    assert key in metadata_store
+
+    # a restart knows the files without asking the swarm (or dht) again
+    restarted = DownloadManager()
+    restarted.add_torrent(magnet, is_paused=True)
+    status = restarted.torrents[magnet].status()
+    assert status.has_metadata
+    assert status.name == "arch.iso"
+
+
+def test_damaged_metadata_is_not_supplied():
+    info = _torrent_info()
+    key = str(info.info_hashes().v1)
+    # valid metadata, but for some other torrent
+    other = _torrent_info(b"something else")
+    metadata_store.put(key, b"d4:info" + bytes(other.info_section()) + b"e")
+
+    assert load_metadata(info.info_hashes()) is None
+    assert load_metadata(other.info_hashes()) is None  # never stored
+
+
+def _register(magnet: str) -> None:
+    torrent = Torrent(magnet, "name", 0, 0, 0, "test")
+    get_torrent_manager().add_torrent(torrent)
+
+
+def test_previews_leave_no_resume_data_or_metadata_behind(mock_config: Config):
+    info = _torrent_info()
+    magnet = lt.make_magnet_uri(info)
+    key = str(info.info_hashes().v1)
+    dm = DownloadManager()
+    dm.add_torrent(magnet, is_paused=True, torrent_info=info)
+    metadata_store.delete(key)  # as if it came from the swarm
+
+    # file selection is still open; nothing was added to the list
+    dm.check_metadata_updates()
+    dm.save_all_resume_data()
+    assert key not in metadata_store
+    assert resume_store.get(key) is None
+
+    _register(magnet)
+    dm.check_metadata_updates()
+    dm.save_all_resume_data()
+    assert key in metadata_store
+    assert resume_store.get(key) is not None
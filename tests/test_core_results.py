@@ -1,8 +1,11 @@
+import random
+from collections.abc import Callable
 from typing import Any
 
 import pytest
 
 from torrra._types import Torrent
+from torrra.core.results import _SORT_FUNCS as SORT_FUNCS
 from torrra.core.results import (
     Filters,
     ResultView,
@@ -245,6 +248,37 @@ class TestDeduplication:
         assert titles(view.visible()) == ["a", "c"]
         assert view.total == 2
 
+    def test_same_info_hash_in_different_encodings_is_dropped(self):
+        hex_hash = "c9e15763f722f23e98a29decdfae341b98d53056"
+        view = ResultView()
+        view.set_results(
+            [
+                make_torrent("jackett", magnet_uri=f"magnet:?xt=urn:btih:{hex_hash}"),
+                make_torrent(
+                    "prowlarr",
+                    magnet_uri="magnet:?xt=urn:btih:ZHQVOY7XELZD5GFCTXWN7LRUDOMNKMCW",
+                ),
+            ]
+        )
+
+        assert titles(view.visible()) == ["jackett"]
+
+    def test_add_results_merges_and_reports_new_rows(self):
+        view = ResultView()
+        view.set_results([make_torrent("a"), make_torrent("b")])
+
+        added = view.add_results([make_torrent("b"), make_torrent("c")])
+
+        assert added == 1
+        assert titles(view.visible()) == ["a", "b", "c"]
+
+    def test_set_results_forgets_previously_seen_torrents(self):
+        view = ResultView()
+        view.set_results([make_torrent("a")])
+        view.set_results([make_torrent("a")])
+
+        assert view.total == 1
+
     def test_empty_results(self):
         view = ResultView()
         view.set_results([])
@@ -440,3 +474,130 @@ class TestCoerceNumeric:
         # min_seeders=0, while sorting uses -1 so it sinks to the bottom
         assert coerce_numeric(None, 0) == 0
         assert coerce_numeric(None) == -1.0
+
+
+def test_replace_results_swaps_a_batch_in_place():
+    view = ResultView()
+    stale = [make_torrent("a"), make_torrent("b")]
+    other = [make_torrent("x"), make_torrent("y")]
+    view.add_results(other[:1])
+    view.add_results(stale)
+    view.add_results(other[1:])
+
+    # "b" dropped out of the fresh listing, "c" is new, "x" is already listed
+    view.replace_results(
+        stale, [make_torrent("a"), make_torrent("c"), make_torrent("x")]
+    )
+
+    assert [t.title for t in view.visible()] == ["x", "a", "c", "y"]
+    assert view.total == 4
+
+
+def _reference_visible(view: ResultView, results: list[Torrent]) -> list[Torrent]:
+    # the straightforward filter-then-sort the view's memos must agree with
+    rows = [t for t in results if view.filters.matches(t)]
+    sort_func = SORT_FUNCS.get(view.sort_key)
+    if sort_func is None:
+        return rows[::-1] if view.descending else rows
+    return sorted(rows, key=sort_func, reverse=view.descending)
+
+
+def _random_results(n: int, seed: int = 0) -> list[Torrent]:
+    # few distinct values, so ties are common, plus the junk indexers send
+    rng = random.Random(seed)
+    junk = [None, "12", "n/a", 3.5]
+    return [
+        make_torrent(
+            rng.choice(["Arch", "arch", "Ubuntu", "debian", None]),
+            size=rng.choice([*junk, 10, 20, 30]),
+            seeders=rng.choice([*junk, 0, 1, 5, 5]),
+            leechers=rng.choice([*junk, 0, 2]),
+            source=rng.choice(["Nyaa", "nyaa", "1337x"]),
+            magnet_uri=f"magnet:?xt=urn:btih:{i}",
+        )
+        for i in range(n)
+    ]
+
+
+def test_memoized_orderings_match_a_full_resort():
+    results = _random_results(300)
+    view = ResultView()
+    view.set_results(results)
+
+    for key in SortKey:
+        for descending in (False, True):
+            for min_seeders, title, source in [
+                (0, "", ""),
+                (1, "", ""),
+                (0, "ARCH", ""),
+                (5, "", "NYAA"),
+            ]:
+                view.set_sort(key, descending)
+                view.filters.min_seeders = min_seeders
+                view.filters.title_contains = title
+                view.filters.source = source
+                expected = _reference_visible(view, results)
+                assert view.visible() == expected
+                assert view.visible() == expected  # served from the memo
+
+
+def test_memos_are_dropped_when_results_change():
+    view = ResultView()
+    view.set_results([make_torrent("a", seeders=1)])
+    view.set_sort(SortKey.SEEDERS)
+    assert titles(view.visible()) == ["a"]
+
+    view.add_results([make_torrent("b", seeders=2)])
+    assert titles(view.visible()) == ["b", "a"]
+
+    # a caller mutating what it got back can't corrupt the memo
+    view.visible().clear()
+    assert titles(view.visible()) == ["b", "a"]
+
+
+def test_benchmark_keypresses_over_50k_results(
+    capsys: pytest.CaptureFixture[str],
+    best_ms: Callable[..., float],
+):
+    """Benchmark: a run of sort/filter keypresses, re-sorting vs memoized."""
+    results = _random_results(50_000)
+    presses: list[tuple[SortKey, bool, int]] = [
+        (key, descending, min_seeders)
+        for key in (SortKey.SEEDERS, SortKey.TITLE, SortKey.SIZE)
+        for descending in (True, False)
+        for min_seeders in (0, 1)
+    ] * 2  # users flip back and forth between the same few views
+
+    def _press_all(visible: Callable[[ResultView], list[Torrent]]) -> None:
+        view = ResultView()
+        view.set_results(results)
+        for key, descending, min_seeders in presses:
+            view.set_sort(key, descending)
+            view.filters.min_seeders = min_seeders
+            visible(view)
+
+    before_ms = best_ms(
+        lambda: _press_all(lambda v: _reference_visible(v, results)), rounds=3
+    )
+    after_ms = best_ms(lambda: _press_all(ResultView.visible), rounds=3)
+
+    with capsys.disabled():
+        print(
+            f"\n{len(results)} results, {len(presses)} keypresses: "
+            f"re-sort {before_ms:.0f}ms, memoized {after_ms:.0f}ms "
+            f"({before_ms / after_ms:.1f}x faster)"
+        )
+
+
+def test_only_the_unfiltered_relevance_order_appends_in_order():
+    view = ResultView()
+    assert view.appends_in_order
+
+    view.set_sort(SortKey.RELEVANCE, descending=True)
+    assert not view.appends_in_order
+    view.set_sort(SortKey.SEEDERS)
+    assert not view.appends_in_order
+
+    view.set_sort(SortKey.RELEVANCE)
+    view.filters.min_seeders = 1
+    assert not view.appends_in_order
@@ -0,0 +1,68 @@
+from torrra._types import Torrent
+from torrra.core.torrent import TorrentManager
+
+MAGNET = "magnet:?xt=urn:btih:0123456789abcdef0123456789abcdef01234567"
+
+
+def _torrent(magnet: str = MAGNET) -> Torrent:
+    return Torrent(
+        magnet_uri=magnet,
+        title="Arch Linux ISO",
+        size=840_499_200,
+        seeders=5,
+        leechers=1,
+        source="Mock",
+    )
+
+
+def test_writes_go_through_to_the_database():
+    tm = TorrentManager()
+    tm.add_torrent(_torrent(), file_priorities=[4, 0])
+    tm.update_torrent_paused_state(MAGNET, True)
+    tm.update_torrent_metadata(MAGNET, "arch", 1024)
+    tm.update_torrent_is_notified(MAGNET)
+
+    # a fresh manager reads the table, so it only sees what was persisted
+    assert TorrentManager().get_all_torrents() == tm.get_all_torrents()
+    record = TorrentManager().get_torrent(MAGNET)
+    assert record is not None
+    assert record["title"] == "arch"
+    assert record["is_paused"] is True
+    assert record["is_notified"] is True
+    assert record["file_priorities"] == [4, 0]
+
+    tm.remove_torrent(MAGNET)
+    assert TorrentManager().get_torrent(MAGNET) is None
+
+
+def test_version_moves_only_when_a_record_changes():
+    tm = TorrentManager()
+    start = tm.version
+
+    tm.add_torrent(_torrent())
+    assert tm.version == start + 1
+    tm.add_torrent(_torrent())  # already saved
+    tm.update_torrent_paused_state(MAGNET, False)  # already unpaused
+    tm.update_torrent_metadata("magnet:?xt=urn:btih:unknown", "x", 1)
+    assert tm.version == start + 1
+
+    tm.update_torrent_paused_state(MAGNET, True)
+    assert tm.version == start + 2
+    tm.remove_torrent(MAGNET)
+    assert tm.version == start + 3
+
+
+def test_reads_are_copies():
+    tm = TorrentManager()
+    tm.add_torrent(_torrent(), file_priorities=[4, 4])
+
+    record = tm.get_all_torrents()[0]
+    record["title"] = "edited"
+    assert record["file_priorities"] is not None
+    record["file_priorities"].append(0)
+
+    assert tm.get_torrent(MAGNET) == {
+        **record,
+        "title": "Arch Linux ISO",
+        "file_priorities": [4, 4],
+    }
@@ -1,7 +1,16 @@
+import asyncio
+import copy
+import json
+import time
+from collections.abc import AsyncIterator
+
 import pytest
 import respx
-from httpx import Response
+from httpx import AsyncByteStream, Response
 
+from torrra.core.cache import Cache, get_cache
+from torrra.core.config import Config
+from torrra.core.constants import DEFAULT_CACHE_TTL
 from torrra.indexers.base import BaseIndexer
 from torrra.indexers.jackett import JackettIndexer
 from torrra.indexers.prowlarr import ProwlarrIndexer
@@ -71,6 +80,12 @@ def indexer(request: pytest.FixtureRequest) -> BaseIndexer:
     return request.param(url=MOCK_API_URL, api_key=MOCK_API_KEY)
 
 
+@pytest.fixture
+def search_cache(mock_config: Config) -> Cache:
+    # built after mock_config, so it takes its ttls from the defaults
+    return get_cache()
+
+
 @respx.mock
 @pytest.mark.parametrize("query", ["arch linux iso"])
 async def test_search(indexer: BaseIndexer, query: str) -> None:
@@ -94,6 +109,43 @@ async def test_search(indexer: BaseIndexer, query: str) -> None:
     assert r.magnet_uri.startswith("magnet:")
 
 
+class _ChunkedBody(AsyncByteStream):
+    """Serves a body a few bytes at a time, counting what has been read."""
+
+    def __init__(self, body: bytes, size: int) -> None:
+        self.chunks = [body[i : i + size] for i in range(0, len(body), size)]
+        self.sent = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+
+@respx.mock
+async def test_search_stream_yields_before_the_body_is_read(
+    indexer: BaseIndexer,
+) -> None:
+    indexer_name = indexer.__class__.__name__.removesuffix("Indexer").lower()
+    mock_body = copy.deepcopy(MOCK_SEARCH_RESPONSE[indexer_name])
+    results = mock_body["Results"] if isinstance(mock_body, dict) else mock_body
+    # plenty of results, so the array spans many chunks
+    results[:] = results * 50
+    body = _ChunkedBody(json.dumps(mock_body).encode(), size=256)
+    respx.get(indexer.get_search_url()).mock(Response(200, stream=body))
+
+    batches: list[int] = []
+    sent_at_first_batch = 0
+    async for batch in indexer.search_stream("arch linux iso", use_cache=False):
+        if not batches:
+            sent_at_first_batch = body.sent
+        batches.append(len(batch))
+
+    assert sum(batches) == 50
+    assert len(batches) > 1
+    assert sent_at_first_batch < len(body.chunks)
+
+
 @respx.mock
 async def test_healthcheck(indexer: BaseIndexer) -> None:
     url = indexer.get_healthcheck_url()
@@ -128,3 +180,74 @@ async def test_null_fields_are_coerced(indexer: BaseIndexer) -> None:
 
     # the S:L cell the results table builds must not read "None"
     assert f"{r.seeders!s}:{r.leechers!s}" == "0:0"
+
+
+@pytest.mark.parametrize("indexer_cls", [JackettIndexer, ProwlarrIndexer])
+async def test_searches_reuse_one_pooled_connection(
+    indexer_cls: type[BaseIndexer],
+) -> None:
+    """Benchmark: count connections opened across 100 searches.
+
+    Runs against a local keep-alive stand-in server rather than respx, since
+    respx replaces the transport and so never opens a socket to count.
+    """
+    indexer_name = indexer_cls.__name__.removesuffix("Indexer").lower()
+    body = json.dumps(MOCK_SEARCH_RESPONSE[indexer_name]).encode()
+    connections = 0
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        nonlocal connections
+        connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    + b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    indexer = indexer_cls(url=f"http://127.0.0.1:{port}", api_key=MOCK_API_KEY)
+
+    try:
+        for _ in range(100):
+            results = await indexer.search("arch linux iso", use_cache=False)
+            assert results is not None and len(results) == 1
+    finally:
+        await indexer.aclose()
+        server.close()
+        await server.wait_closed()
+
+    assert connections == 1
+
+
+@respx.mock
+async def test_search_serves_fresh_cache_and_refetches_stale(
+    indexer: BaseIndexer, search_cache: Cache
+) -> None:
+    indexer_name = indexer.__class__.__name__.removesuffix("Indexer").lower()
+    route = respx.get(indexer.get_search_url()).mock(
+        Response(200, json=MOCK_SEARCH_RESPONSE[indexer_name])
+    )
+
+    first = await indexer.search("arch")
+    assert await indexer.search("arch") == first
+    assert route.call_count == 1
+
+    # age the entry past the ttl: still cached, but no longer good enough
+    key = indexer.cache_key("arch")
+    search_cache.set(
+        key, search_cache.get(key), tag=time.time() - DEFAULT_CACHE_TTL - 1
+    )
+    assert indexer.cached_results("arch") == (first, True)
+
+    assert await indexer.search("arch") == first
+    assert route.call_count == 2
+    assert indexer.cached_results("arch") == (first, False)
@@ -0,0 +1,58 @@
+import pytest
+import respx
+from httpx import Response
+
+from torrra._types import Indexer
+from torrra.core.config import get_config
+from torrra.utils.healthcheck import IndexerHealthcheck
+
+JACKETT = Indexer(name="jackett", url="http://jackett.url", api_key="key")
+PROWLARR = Indexer(name="prowlarr", url="http://prowlarr.url", api_key="key")
+
+
+@respx.mock
+async def test_healthcheck_keeps_passing_indexers_and_records_failures():
+    respx.get(f"{JACKETT.url}/api/v2.0/indexers/nonexistent_indexer/results").mock(
+        Response(200)
+    )
+    respx.get(f"{PROWLARR.url}/api/v1/health").mock(Response(401))
+
+    healthcheck = IndexerHealthcheck([JACKETT, PROWLARR]).start()
+
+    assert await healthcheck.wait() == [JACKETT]
+    assert healthcheck.done
+    assert list(healthcheck.failures) == ["prowlarr"]
+    assert "api key" in healthcheck.failures["prowlarr"]
+    # resolved once; later waiters get the same answer straight away
+    assert await healthcheck.wait() == [JACKETT]
+
+
+@pytest.mark.usefixtures("mock_config")
+@respx.mock
+async def test_healthcheck_remembers_only_indexers_that_pass():
+    respx.get(f"{JACKETT.url}/api/v2.0/indexers/nonexistent_indexer/results").mock(
+        Response(200)
+    )
+    respx.get(f"{PROWLARR.url}/api/v1/health").mock(Response(500))
+
+    healthcheck = IndexerHealthcheck([JACKETT, PROWLARR], remember=True).start()
+    await healthcheck.wait()
+
+    config = get_config()
+    assert config.get("indexers.jackett.url") == JACKETT.url
+    assert config.get("indexers.prowlarr.url", None) is None
+
+
+@respx.mock
+async def test_healthcheck_skips_indexers_that_recently_passed():
+    route = respx.get(
+        f"{JACKETT.url}/api/v2.0/indexers/nonexistent_indexer/results"
+    ).mock(Response(200))
+
+    assert await IndexerHealthcheck([JACKETT]).start().wait() == [JACKETT]
+    assert await IndexerHealthcheck([JACKETT]).start().wait() == [JACKETT]
+    assert route.call_count == 1
+
+    # a fresh probe when asked to bypass the cache
+    await IndexerHealthcheck([JACKETT], use_cache=False).start().wait()
+    assert route.call_count == 2
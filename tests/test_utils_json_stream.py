@@ -0,0 +1,103 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from torrra.utils import json_stream
+from torrra.utils.json_stream import iter_json_array
+
+DOC = {
+    "Indexers": [{"ID": "a", "Results": 3}],
+    "Results": [
+        {"Title": 'Arch "Linux" ]ISO[', "Size": 840499200, "Peers": None},
+        {"Title": "Fedora, 40", "Size": 2.5e9, "Peers": 17},
+        {"Title": "ubuntu", "Size": -1, "Peers": True},
+    ],
+}
+
+
+async def _chunks(text: str, size: int) -> AsyncIterator[str]:
+    for i in range(0, len(text), size):
+        yield text[i : i + size]
+
+
+async def _collect(text: str, size: int, key: str | None) -> list[list[Any]]:
+    return [batch async for batch in iter_json_array(_chunks(text, size), key)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+async def test_matches_json_loads_for_any_chunking(size: int):
+    text = json.dumps(DOC, indent=2)
+    batches = await _collect(text, size, "Results")
+    assert [item for batch in batches for item in batch] == DOC["Results"]
+
+
+async def test_yields_items_before_the_document_ends():
+    text = json.dumps(DOC["Results"])
+    first_item_end = text.index("}") + 2  # past the following comma
+    batches = await _collect(text, first_item_end, None)
+    assert batches[0] == DOC["Results"][:1]
+
+
+async def test_number_split_at_a_chunk_boundary_is_not_truncated():
+    batches = await _collect("[12345, 6]", 3, None)
+    assert [item for batch in batches for item in batch] == [12345, 6]
+
+
+async def test_empty_array():
+    assert await _collect('{"Results": []}', 4, "Results") == []
+
+
+async def test_missing_key_raises_key_error():
+    with pytest.raises(KeyError):
+        await _collect('{"Indexers": []}', 5, "Results")
+    with pytest.raises(KeyError):
+        await _collect("{}", 5, "Results")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"error": "bad api key"}',  # an object where an array is expected
+        "[1, 2",  # cut off
+        "[1 2]",
+        "",
+    ],
+)
+async def test_malformed_input_raises_value_error(text: str):
+    with pytest.raises(ValueError):
+        await _collect(text, 3, None)
+
+
+async def test_malformed_input_raises_before_the_stream_ends():
+    read: list[str] = []
+
+    async def chunks() -> AsyncIterator[str]:
+        for chunk in ['[{"a": 1}, {"a": tru e}', ", 2"] + ["3"] * 100 + ["]"]:
+            read.append(chunk)
+            yield chunk
+
+    with pytest.raises(ValueError):
+        async for _ in iter_json_array(chunks()):
+            pass
+    assert len(read) == 1
+
+
+async def test_large_items_are_scanned_once_not_redecoded_per_chunk(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    calls = 0
+    raw_decode = json_stream._decoder.raw_decode
+
+    def counting(s: str, idx: int = 0) -> tuple[Any, int]:
+        nonlocal calls
+        calls += 1
+        return raw_decode(s, idx)
+
+    monkeypatch.setattr(json_stream._decoder, "raw_decode", counting)
+    item = {"Title": 'a \\"quoted\\" [name]' * 200, "Tags": [{"x": [1, 2]}] * 50}
+    batches = await _collect(json.dumps([item, item]), 7, None)
+
+    assert [i for batch in batches for i in batch] == [item, item]
+    assert calls < 50  # one decode per item plus a few doubling checks
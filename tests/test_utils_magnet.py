@@ -1,7 +1,19 @@
+from collections.abc import AsyncIterator
+
 import httpx
+import libtorrent as lt
+import pytest
 import respx
 
-from torrra.utils.magnet import resolve_magnet_uri
+from torrra.core.cache import get_cache
+from torrra.utils import magnet as magnet_module
+from torrra.utils.magnet import resolve_magnet_uri, resolve_torrent
+from torrra.utils.magnet_uri import info_hash
+
+
+def make_torrent_bytes() -> bytes:
+    info = {b"name": b"arch.iso", b"piece length": 16384, b"pieces": b"\0" * 20}
+    return lt.bencode({b"info": {**info, b"length": 1000}})
 
 
 async def test_resolve_already_magnet():
@@ -40,3 +52,118 @@ async def test_resolve_unhandled_url_returns_none():
 
     resolved = await resolve_magnet_uri(test_url)
     assert resolved is None
+
+
+def test_info_hash_normalizes_hex_and_base32():
+    # the same v1 hash in lower hex, upper hex and base32
+    hex_hash = "c9e15763f722f23e98a29decdfae341b98d53056"
+    base32_hash = "ZHQVOY7XELZD5GFCTXWN7LRUDOMNKMCW"
+
+    assert info_hash(f"magnet:?xt=urn:btih:{hex_hash}") == hex_hash
+    assert info_hash(f"magnet:?xt=urn:btih:{hex_hash.upper()}&dn=x") == hex_hash
+    assert info_hash(f"magnet:?xt=urn:btih:{base32_hash}") == hex_hash
+
+
+def test_info_hash_is_none_without_a_usable_hash():
+    assert info_hash("http://test.com/dl/1.torrent") is None
+    assert info_hash("magnet:?xt=urn:btih:not-a-hash") is None
+    assert info_hash("magnet:?dn=no+hash") is None
+
+
+@respx.mock
+async def test_resolve_torrent_caches_by_url_and_info_hash():
+    test_url = "http://test.com/dl/1.torrent"
+    route = respx.get(test_url).mock(httpx.Response(200, content=make_torrent_bytes()))
+
+    magnet_uri, info = await resolve_torrent(test_url)
+    assert magnet_uri is not None and info is not None
+
+    # the same url again is answered from the cache
+    again, cached_info = await resolve_torrent(test_url)
+    assert again == magnet_uri
+    assert cached_info.info_hash() == info.info_hash()
+    assert route.call_count == 1
+
+    # and a bare magnet for the same hash still gets the file list
+    bare = f"magnet:?xt=urn:btih:{info_hash(magnet_uri)}"
+    resolved, bare_info = await resolve_torrent(bare)
+    assert resolved == bare
+    assert bare_info.info_hash() == info.info_hash()
+
+
+@respx.mock
+async def test_resolve_torrent_does_not_cache_failures():
+    test_url = "http://test.com/dl/2.torrent"
+    route = respx.get(test_url).mock(
+        side_effect=[
+            httpx.RequestError("test error"),
+            httpx.Response(302, headers={"location": "magnet:?xt=urn:btih:ok"}),
+        ]
+    )
+
+    assert await resolve_torrent(test_url) == (None, None)
+    assert await resolve_torrent(test_url) == ("magnet:?xt=urn:btih:ok", None)
+    assert route.call_count == 2
+
+
+@respx.mock
+async def test_resolve_torrent_leaves_the_cache_alone_without_use_cache():
+    test_url = "http://test.com/dl/3.torrent"
+    route = respx.get(test_url).mock(httpx.Response(200, content=make_torrent_bytes()))
+
+    magnet_uri, info = await resolve_torrent(test_url, use_cache=False)
+    assert magnet_uri is not None and info is not None
+    assert len(get_cache()) == 0
+
+    await resolve_torrent(test_url, use_cache=False)
+    assert route.call_count == 2
+
+
+@respx.mock
+async def test_resolve_follows_relative_redirects_to_a_torrent():
+    respx.get("http://test.com/go").mock(
+        httpx.Response(302, headers={"location": "/dl/1.torrent"})
+    )
+    respx.get("http://test.com/dl/1.torrent").mock(
+        httpx.Response(200, content=make_torrent_bytes())
+    )
+
+    magnet_uri, info = await resolve_torrent("http://test.com/go")
+    assert magnet_uri is not None and info is not None
+
+
+@respx.mock
+async def test_resolve_gives_up_on_redirect_loops():
+    test_url = "http://test.com/loop"
+    route = respx.get(test_url).mock(
+        httpx.Response(302, headers={"location": test_url})
+    )
+
+    assert await resolve_torrent(test_url) == (None, None)
+    assert route.call_count == magnet_module.MAX_REDIRECTS + 1
+
+
+@respx.mock
+async def test_resolve_stops_reading_oversized_or_non_torrent_bodies(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(magnet_module, "MAX_TORRENT_SIZE", 1024)
+    sent: list[int] = []
+
+    async def body(first: bytes) -> AsyncIterator[bytes]:
+        for i in range(100):
+            sent.append(i)
+            yield first if i == 0 else b"x" * 512
+
+    # no content-length to go by, so the stream itself has to be cut short
+    respx.get("http://test.com/big.torrent").mock(
+        httpx.Response(200, content=body(b"d4:info"))
+    )
+    respx.get("http://test.com/page").mock(httpx.Response(200, content=body(b"<html>")))
+
+    assert await resolve_torrent("http://test.com/big.torrent") == (None, None)
+    assert len(sent) < 10
+
+    sent.clear()
+    assert await resolve_torrent("http://test.com/page") == (None, None)
+    assert len(sent) == 1
@@ -0,0 +1,106 @@
+import asyncio
+from contextlib import suppress
+
+import httpx
+import libtorrent as lt
+import respx
+
+from torrra.utils.magnet import cached_torrent
+from torrra.utils.prefetch import TorrentPrefetcher
+
+URLS = [f"http://test.com/dl/{i}.torrent" for i in range(5)]
+
+
+def make_torrent_bytes(name: bytes) -> bytes:
+    info = {b"name": name, b"piece length": 16384, b"pieces": b"\0" * 20}
+    return lt.bencode({b"info": {**info, b"length": 1000}})
+
+
+def mock_downloads(delay: float = 0.0) -> dict[str, int]:
+    counts = {"active": 0, "peak": 0, "calls": 0}
+
+    async def respond(request: httpx.Request) -> httpx.Response:
+        counts["calls"] += 1
+        counts["active"] += 1
+        counts["peak"] = max(counts["peak"], counts["active"])
+        await asyncio.sleep(delay)
+        counts["active"] -= 1
+        return httpx.Response(
+            200, content=make_torrent_bytes(request.url.path.encode())
+        )
+
+    respx.get(url__startswith="http://test.com/dl/").mock(side_effect=respond)
+    return counts
+
+
+async def run_for(prefetcher: TorrentPrefetcher, seconds: float) -> None:
+    task = asyncio.create_task(prefetcher.run())
+    await asyncio.sleep(seconds)
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
+@respx.mock
+async def test_prefetch_resolves_links_with_bounded_concurrency():
+    counts = mock_downloads(delay=0.05)
+    prefetcher = TorrentPrefetcher()
+    prefetcher.want(["magnet:?xt=urn:btih:skipped", *URLS])
+
+    await run_for(prefetcher, 0.5)
+
+    assert all(cached_torrent(url) is not None for url in URLS)
+    assert counts["calls"] == len(URLS)
+    assert counts["peak"] == TorrentPrefetcher.MAX_CONCURRENCY
+
+
+@respx.mock
+async def test_prefetch_waits_while_downloads_are_busy():
+    counts = mock_downloads()
+    prefetcher = TorrentPrefetcher(is_busy=lambda: True)
+    prefetcher.want(URLS)
+
+    await run_for(prefetcher, 0.1)
+    assert counts["calls"] == 0
+
+
+@respx.mock
+async def test_selection_joins_the_prefetch_in_flight():
+    counts = mock_downloads(delay=0.1)
+    prefetcher = TorrentPrefetcher()
+    prefetcher.want(URLS[:1])
+    task = asyncio.create_task(prefetcher.run())
+    await asyncio.sleep(0.02)  # fetch started
+
+    magnet_uri, info = await prefetcher.resolve(URLS[0])
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+    assert magnet_uri is not None and info is not None
+    assert counts["calls"] == 1
+
+
+async def test_urgent_links_jump_the_queue_and_others_replace_it():
+    prefetcher = TorrentPrefetcher()
+    prefetcher.want(URLS[:2])
+    prefetcher.want(URLS[4:], urgent=True)
+    assert list(prefetcher._queue) == [URLS[4], *URLS[:2]]
+
+    prefetcher.want(URLS[2:3])
+    assert list(prefetcher._queue) == URLS[2:3]
+
+
+@respx.mock
+async def test_nothing_is_prefetched_without_use_cache():
+    counts = mock_downloads()
+    prefetcher = TorrentPrefetcher(use_cache=False)
+    prefetcher.want(URLS)
+
+    await run_for(prefetcher, 0.1)
+    assert counts["calls"] == 0
+
+    # a selection still resolves, straight from the link
+    magnet_uri, _ = await prefetcher.resolve(URLS[0])
+    assert magnet_uri is not None
+    assert cached_torrent(URLS[0]) is None